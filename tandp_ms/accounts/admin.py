@@ -2,6 +2,7 @@ from .models import PlacementDrive
 from django.contrib import admin
 from .models import StaffProfile
 from .models import Student  # import your model
+from .models import Task
 
 @admin.register(StaffProfile)
 class StaffProfileAdmin(admin.ModelAdmin):
@@ -16,3 +17,10 @@ class StudentAdmin(admin.ModelAdmin):
     search_fields = ('full_name', 'roll_number', 'email', 'branch')
 
 admin.site.register(PlacementDrive)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'finished_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('last_error',)
@@ -0,0 +1,226 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, QuerySet, Sum
+from django.db.models.functions import TruncMonth, Trim, Upper
+from django.utils import timezone
+
+from .models import PlacementDrive, Registration, RegistrationDelta, RegistrationSummary, Student
+
+# Registration counts per drive, branch, graduation year and month live in
+# RegistrationSummary and follow registrations as they come and go (the
+# receivers in signals.py record deltas, rollup() applies them), so reports
+# read a few hundred summary rows no matter how many registrations exist.
+# `manage.py refresh_analytics` recomputes everything, e.g. after bulk loads
+# that bypass signals.
+
+DRIVE = RegistrationSummary.DIMENSION_DRIVE
+BRANCH = RegistrationSummary.DIMENSION_BRANCH
+GRADUATION_YEAR = RegistrationSummary.DIMENSION_GRADUATION_YEAR
+MONTH = RegistrationSummary.DIMENSION_MONTH
+DIMENSIONS = (DRIVE, BRANCH, GRADUATION_YEAR, MONTH)
+
+
+def branch_key(branch):
+    return (branch or '').strip().upper()
+
+
+def month_key(moment):
+    return timezone.localtime(moment).strftime('%Y-%m')
+
+
+def _student_keys(student):
+    return [(BRANCH, branch_key(student.branch)), (GRADUATION_YEAR, str(student.graduation_year))]
+
+
+# ========== Incremental Updates ==========
+# The receivers never update a summary row themselves: this month, the big
+# branches and the drive everyone is registering for would be touched by
+# every registration, and their row locks would serialise register(). Each
+# change is appended as RegistrationDelta rows instead (one INSERT), and
+# rollup() folds them into the summaries from the task worker.
+
+def _record(changes, labels=None):
+    """Append ``{(dimension, key): delta}`` as delta rows in one INSERT."""
+    labels = labels or {}
+    RegistrationDelta.objects.bulk_create([
+        RegistrationDelta(dimension=dimension, key=key, delta=delta, label=labels.get((dimension, key), ''))
+        for (dimension, key), delta in changes.items() if delta
+    ])
+
+
+def _registration_keys(registration, branch, graduation_year):
+    return [
+        (DRIVE, str(registration.drive_id)),
+        (BRANCH, branch_key(branch)),
+        (GRADUATION_YEAR, str(graduation_year)),
+        (MONTH, month_key(registration.registered_at)),
+    ]
+
+
+def registration_added(registration):
+    student = registration.student
+    keys = _registration_keys(registration, student.branch, student.graduation_year)
+    _record(dict.fromkeys(keys, 1), labels={keys[0]: str(registration.drive)})
+
+
+def _groups_deleted_with(origin):
+    """``{student id: (branch, graduation_year)}`` for the students whose registrations deleting ``origin`` removes."""
+    if isinstance(origin, Student):
+        return {origin.pk: (origin.branch, origin.graduation_year)}
+    if isinstance(origin, QuerySet):
+        model, ids = origin.model, origin.values('pk')
+    else:
+        model, ids = type(origin), [origin.pk]
+    lookups = {
+        Student: 'pk__in', PlacementDrive: 'registration__drive__in', Registration: 'registration__in', User: 'user__in',
+    }
+    if model not in lookups:
+        return {}
+    students = Student.objects.filter(**{lookups[model]: ids}).values_list('id', 'branch', 'graduation_year')
+    return {pk: (branch, graduation_year) for pk, branch, graduation_year in students.distinct()}
+
+
+def registration_removed(registration, origin):
+    """Count ``registration`` out of the delete started by ``origin`` (a model instance or queryset).
+
+    A cascade reaches here once per registration, so the students' groups
+    are loaded for the whole delete in one query and the changes are kept on
+    ``origin`` until removals_done() writes them together.
+    """
+    removals = getattr(origin, '_analytics_removals', None)
+    if removals is None:
+        removals = origin._analytics_removals = {'groups': _groups_deleted_with(origin), 'changes': Counter()}
+    groups = removals['groups']
+    if registration.student_id not in groups:
+        student = registration.student
+        groups[student.pk] = (student.branch, student.graduation_year)
+    removals['changes'].subtract(_registration_keys(registration, *groups[registration.student_id]))
+
+
+def removals_done(origin):
+    removals = getattr(origin, '_analytics_removals', None)
+    if removals is not None:
+        del origin._analytics_removals
+        _record(removals['changes'])
+
+
+def student_moved(student, old_branch, old_graduation_year):
+    """Move the student's registrations to their new branch/year buckets."""
+    count = Registration.objects.filter(student=student).count()
+    if not count:
+        return
+    old_keys = [(BRANCH, branch_key(old_branch)), (GRADUATION_YEAR, str(old_graduation_year))]
+    changes = Counter()
+    for old, new in zip(old_keys, _student_keys(student)):
+        if old != new:
+            changes[old] -= count
+            changes[new] += count
+    _record(changes)
+
+
+def drive_renamed(drive):
+    for model in (RegistrationSummary, RegistrationDelta):
+        model.objects.filter(dimension=DRIVE, key=str(drive.id)).update(label=str(drive))
+
+
+def drive_removed(drive_id):
+    for model in (RegistrationSummary, RegistrationDelta):
+        model.objects.filter(dimension=DRIVE, key=str(drive_id)).delete()
+
+
+# ========== Rollup ==========
+class _FoldedElsewhere(Exception):
+    pass
+
+
+def _adjust(dimension, key, delta, label=''):
+    updated = RegistrationSummary.objects.filter(dimension=dimension, key=key).update(count=F('count') + delta)
+    if updated or delta <= 0:
+        return
+    try:
+        with transaction.atomic():
+            RegistrationSummary.objects.create(dimension=dimension, key=key, label=label, count=delta)
+    except IntegrityError:
+        # another transaction created the row first
+        RegistrationSummary.objects.filter(dimension=dimension, key=key).update(count=F('count') + delta)
+
+
+def rollup():
+    """Fold the pending delta rows into the summaries, one UPDATE per key; returns how many rows were folded."""
+    last = RegistrationDelta.objects.aggregate(last=Max('id'))['last']
+    if last is None:
+        return 0
+    pending = RegistrationDelta.objects.filter(id__lte=last)
+    try:
+        with transaction.atomic():
+            totals = list(
+                pending.values('dimension', 'key').annotate(total=Sum('delta'), drive_label=Max('label'), rows=Count('id'))
+            )
+            folded = sum(row['rows'] for row in totals)
+            if pending.delete()[0] != folded:
+                # a concurrent rollup deleted some of them first and applies them itself
+                raise _FoldedElsewhere
+            for row in totals:
+                _adjust(row['dimension'], row['key'], row['total'], label=row['drive_label'])
+    except _FoldedElsewhere:
+        return 0
+    return folded
+
+
+# ========== Full Refresh ==========
+def compute_summaries(registrations, summary_model=RegistrationSummary):
+    """Unsaved summary rows aggregated from the ``registrations`` queryset (one GROUP BY per dimension)."""
+    rows = [
+        summary_model(dimension=DRIVE, key=str(row['drive_id']), count=row['n'],
+                      label=f"{row['drive__company_name']} - {row['drive__job_role']}")
+        for row in registrations.values('drive_id', 'drive__company_name', 'drive__job_role').annotate(n=Count('id'))
+    ]
+    branches = registrations.annotate(branch=Upper(Trim('student__branch'))).values('branch').annotate(n=Count('id'))
+    rows += [summary_model(dimension=BRANCH, key=row['branch'], count=row['n']) for row in branches]
+    rows += [
+        summary_model(dimension=GRADUATION_YEAR, key=str(row['student__graduation_year']), count=row['n'])
+        for row in registrations.values('student__graduation_year').annotate(n=Count('id'))
+    ]
+    rows += [
+        summary_model(dimension=MONTH, key=row['month'].strftime('%Y-%m'), count=row['n'])
+        for row in registrations.annotate(month=TruncMonth('registered_at')).values('month').annotate(n=Count('id'))
+    ]
+    return rows
+
+
+def refresh():
+    """Rebuild every summary row from Registration, dropping pending deltas; returns the number of rows written."""
+    rows = compute_summaries(Registration.objects.order_by())
+    with transaction.atomic():
+        RegistrationDelta.objects.all().delete()
+        RegistrationSummary.objects.all().delete()
+        RegistrationSummary.objects.bulk_create(rows)
+    return len(rows)
+
+
+# ========== Reading ==========
+def report():
+    """``{dimension: [{'key', 'label', 'count'}, ...]}`` from the summaries plus the deltas not yet rolled up.
+
+    Both are read in one UNION query, so a concurrent rollup() can't make a
+    change count twice. Drives and branches are busiest first; years and
+    months are chronological.
+    """
+    rows = RegistrationSummary.objects.values_list('dimension', 'key', 'label', 'count').union(
+        RegistrationDelta.objects.values_list('dimension', 'key', 'label', 'delta'), all=True,
+    )
+    totals = {}
+    for dimension, key, label, count in rows:
+        total = totals.setdefault((dimension, key), {'key': key, 'label': '', 'count': 0})
+        total['label'] = total['label'] or label
+        total['count'] += count
+    data = {dimension: [] for dimension in DIMENSIONS}
+    for (dimension, key), total in sorted(totals.items()):
+        if total['count'] > 0:
+            total['label'] = total['label'] or key
+            data[dimension].append(total)
+    for dimension in (DRIVE, BRANCH):
+        data[dimension].sort(key=lambda row: -row['count'])
+    return data
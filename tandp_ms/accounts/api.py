@@ -0,0 +1,200 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from .models import Material, PlacementDrive, Registration
+from .pagination import keyset_paginate
+
+# Read-only JSON API, version 1 (mounted under /api/v1/).
+#
+# Lists are cursor paginated on id (?after=<id>&limit=<n>), accept
+# ?fields=a,b to trim each object, and carry ETag/Last-Modified validators
+# taken from one MAX(updated_at)/COUNT(*) query, so a client polling with
+# If-None-Match or If-Modified-Since gets a 304 before any row is read.
+# The count changes on deletes, which a MAX alone would miss.
+
+API_PAGE_SIZE = 50
+MAX_API_PAGE_SIZE = 100
+
+
+class BadRequest(Exception):
+    pass
+
+
+# ========== Serializers ==========
+def drive_data(drive):
+    return {
+        'id': drive.id,
+        'company_name': drive.company_name,
+        'job_role': drive.job_role,
+        'date': drive.date,
+        'package': drive.package,
+        'description': drive.description,
+        'capacity': drive.capacity,
+        'seats_left': drive.seats_left,
+        'eligible_branches': drive.branch_list,
+        'min_graduation_year': drive.min_graduation_year,
+        'max_graduation_year': drive.max_graduation_year,
+        'updated_at': drive.updated_at,
+    }
+
+
+def material_data(material):
+    return {
+        'id': material.id,
+        'category': material.category,
+        'title': material.title,
+        'file': material.file.url if material.file else None,
+        'uploaded_by': material.uploaded_by.name if material.uploaded_by else None,
+        'uploaded_at': material.uploaded_at,
+        'updated_at': material.updated_at,
+    }
+
+
+def registration_data(registration):
+    return {
+        'id': registration.id,
+        'drive': drive_data(registration.drive),
+        'registered_at': registration.registered_at,
+    }
+
+
+# ========== Helpers ==========
+def api_login_required(view_func):
+    """Like login_required, but answers 401 JSON instead of redirecting to a login page."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': "Authentication required."}, status=401)
+        try:
+            return view_func(request, *args, **kwargs)
+        except BadRequest as error:
+            return JsonResponse({'error': str(error)}, status=400)
+    return wrapper
+
+
+def selected_fields(request, serializer_fields):
+    fields = [field for field in request.GET.get('fields', '').split(',') if field]
+    unknown = set(fields) - set(serializer_fields)
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return fields
+
+
+def _etag(request, *parts):
+    source = '|'.join(str(part) for part in (request.get_full_path(), request.user.pk, *parts))
+    return '"%s"' % hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()
+
+
+def _respond(request, etag, last_modified, build):
+    """304 when the client's validators still match, else ``build()`` as JSON."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = JsonResponse(build())
+    response['ETag'] = etag
+    if timestamp:
+        response['Last-Modified'] = http_date(timestamp)
+    # clients may keep a copy but must revalidate it, which is the cheap part
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_list(request, queryset, build, modified_fields=('updated_at',)):
+    """Validate against one COUNT/MAX query over ``queryset`` before building the page."""
+    stats = queryset.order_by().aggregate(
+        count=Count('id'), **{f'last_{i}': Max(field) for i, field in enumerate(modified_fields)},
+    )
+    stamps = [stats[f'last_{i}'] for i in range(len(modified_fields)) if stats[f'last_{i}']]
+    last_modified = max(stamps) if stamps else None
+    etag = _etag(request, stats['count'], last_modified and last_modified.isoformat())
+    return _respond(request, etag, last_modified, build)
+
+
+def paginated(request, queryset, serializer, serializer_fields):
+    """One cursor page of ``queryset`` ordered by id, serialized, with next/previous links."""
+    for cursor in ('after', 'before'):
+        value = request.GET.get(cursor)
+        if value and not value.isdigit():
+            raise BadRequest(f"'{cursor}' must be an id.")
+    limit = request.GET.get('limit', '')
+    per_page = min(int(limit), MAX_API_PAGE_SIZE) if limit.isdigit() and int(limit) > 0 else API_PAGE_SIZE
+    fields = selected_fields(request, serializer_fields)
+
+    page = keyset_paginate(queryset, request, key='id', per_page=per_page)
+    return {
+        'results': [pick(serializer(obj), fields) for obj in page],
+        'next': f'{request.path}?{page.next_query}' if page.has_next else None,
+        'previous': f'{request.path}?{page.previous_query}' if page.has_previous else None,
+    }
+
+
+def pick(data, fields):
+    return {field: data[field] for field in fields} if fields else data
+
+
+def not_found(message):
+    return JsonResponse({'error': message}, status=404)
+
+
+# ========== Endpoints ==========
+DRIVE_FIELDS = (
+    'id', 'company_name', 'job_role', 'date', 'package', 'description', 'capacity', 'seats_left',
+    'eligible_branches', 'min_graduation_year', 'max_graduation_year', 'updated_at',
+)
+MATERIAL_FIELDS = ('id', 'category', 'title', 'file', 'uploaded_by', 'uploaded_at', 'updated_at')
+REGISTRATION_FIELDS = ('id', 'drive', 'registered_at')
+
+
+@require_GET
+@api_login_required
+def drive_list(request):
+    """All drives, or only upcoming ones with ?upcoming=1."""
+    queryset = PlacementDrive.objects.all()
+    if request.GET.get('upcoming') == '1':
+        queryset = queryset.filter(date__gte=timezone.localdate())
+    return conditional_list(request, queryset, lambda: paginated(request, queryset, drive_data, DRIVE_FIELDS))
+
+
+@require_GET
+@api_login_required
+def drive_detail(request, drive_id):
+    drive = PlacementDrive.objects.filter(id=drive_id).first()
+    if drive is None:
+        return not_found("No such drive.")
+    fields = selected_fields(request, DRIVE_FIELDS)
+    etag = _etag(request, drive.updated_at.isoformat())
+    return _respond(request, etag, drive.updated_at, lambda: pick(drive_data(drive), fields))
+
+
+@require_GET
+@api_login_required
+def my_registrations(request):
+    """The logged-in student's registrations with their drives."""
+    student = request.role.student
+    if student is None:
+        return JsonResponse({'error': "Only students have registrations."}, status=403)
+    queryset = Registration.objects.filter(student=student).select_related('drive')
+    return conditional_list(
+        request, queryset,
+        lambda: paginated(request, queryset, registration_data, REGISTRATION_FIELDS),
+        modified_fields=('registered_at', 'drive__updated_at'),
+    )
+
+
+@require_GET
+@api_login_required
+def material_list(request, kind):
+    """Study materials of one kind: verbal, aptitude or technical."""
+    if kind not in Material.UPLOAD_DIRS:
+        return not_found(f"No material kind {kind!r}.")
+    queryset = Material.objects.filter(category=kind)
+    return conditional_list(
+        request, queryset, lambda: paginated(request, queryset, material_data, MATERIAL_FIELDS),
+    )
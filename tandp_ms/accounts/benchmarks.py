@@ -0,0 +1,541 @@
+import asyncio
+import datetime
+import json
+import random
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Max, Q
+from django.db.models.signals import post_delete, pre_delete
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analytics, counters, fragments, resumes, search, signals, upcoming
+from .models import (
+    BenchmarkRow, ContactMessage, Material, Notification, PlacementDrive, Registration, StaffProfile, Student, Task,
+)
+from .profiling import percentile
+from .registrations import sync_seats_taken
+
+# Benchmark suite: `manage.py seed_benchmark_data` builds a deterministic
+# dataset (every row it creates is recorded as a BenchmarkRow), `manage.py
+# run_benchmarks` drives the main pages with concurrent test clients and
+# appends latency/query results per commit to a JSON-lines file so runs can
+# be compared.
+
+BENCH_PREFIX = 'BENCH'
+BENCH_USER_PREFIX = 'bench_'
+
+STUDENTS = 20000
+DRIVES = 500
+REGISTRATIONS_PER_STUDENT = 25
+MATERIALS_PER_KIND = 1000
+LOGIN_STUDENTS = 200  # students that get a User to log in with
+BENCH_PASSWORD = 'bench-password'
+
+BRANCHES = ('CSE', 'ECE', 'EEE', 'MECH', 'CIVIL', 'AIML')
+GRADUATION_YEARS = (2024, 2025, 2026, 2027)
+COMPANIES = ('Infosys', 'TCS', 'Wipro', 'Accenture', 'Cognizant', 'Capgemini', 'HCL', 'Deloitte', 'Amazon', 'Zoho')
+JOB_ROLES = ('Software Engineer', 'Systems Engineer', 'Analyst', 'Developer', 'Test Engineer', 'Support Engineer')
+
+INSERT_BATCH_SIZE = 5000
+WARMUP_REQUESTS = 5
+
+WSGI = 'wsgi'
+ASGI = 'asgi'
+
+
+# ========== Dataset ==========
+@contextmanager
+def registration_receivers_muted():
+    """Let bulk deletes of registrations run as one DELETE instead of one signal per row."""
+    receivers = [
+        (pre_delete, signals.registration_uncounted),
+        (post_delete, signals.registration_uncounted_saved),
+        (pre_delete, signals.registration_deleting),
+        (post_delete, signals.registration_deleted),
+    ]
+    for signal, receiver in receivers:
+        signal.disconnect(receiver, sender=Registration)
+    try:
+        yield
+    finally:
+        for signal, receiver in receivers:
+            signal.connect(receiver, sender=Registration)
+
+
+def _record(model, ids):
+    BenchmarkRow.objects.bulk_create(
+        [BenchmarkRow(model=model._meta.label, row_id=row_id) for row_id in ids], batch_size=INSERT_BATCH_SIZE,
+    )
+
+
+def recorded(model):
+    """Ids of the ``model`` rows seed() created, as a subquery."""
+    return BenchmarkRow.objects.filter(model=model._meta.label).values('row_id')
+
+
+def has_real_data():
+    """Whether students, drives or materials exist that seed() didn't create (users are left out: admins)."""
+    return any(model.objects.exclude(id__in=recorded(model)).exists() for model in (Student, PlacementDrive, Material))
+
+
+def clear():
+    """Remove every row seed() created, and nothing else; call rebuild_derived_data() afterwards."""
+    with registration_receivers_muted():
+        Registration.objects.filter(
+            Q(student_id__in=recorded(Student)) | Q(drive_id__in=recorded(PlacementDrive)),
+        ).delete()
+        for model in (Student, PlacementDrive, Material, StaffProfile, User):
+            model.objects.filter(id__in=recorded(model)).delete()
+        BenchmarkRow.objects.all().delete()
+
+
+@contextmanager
+def registrations_undone():
+    """Delete the registrations made by the benchmark students inside the block, so reruns start from the seed.
+
+    They go through the receivers, which give the seats back and take them
+    out of the analytics.
+    """
+    last = Registration.objects.aggregate(last=Max('id'))['last'] or 0
+    try:
+        yield
+    finally:
+        Registration.objects.filter(id__gt=last, student_id__in=recorded(Student)).delete()
+
+
+def _staff(username, role, branch=None, superuser=False):
+    user = User.objects.create_user(
+        username=BENCH_USER_PREFIX + username, is_staff=True, is_superuser=superuser,
+    )
+    profile = StaffProfile.objects.create(
+        user=user, name=username.title(), designation='Benchmark', mobile='0000000000',
+        email=f'{username}@example.com', role=role, branch=branch,
+    )
+    _record(User, [user.id])
+    _record(StaffProfile, [profile.id])
+    return profile
+
+
+def _batched(rows, size=INSERT_BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(scale=1.0, seed=0, log=print):
+    """Create the benchmark dataset (``scale`` 1.0 = 20k students, 500 drives, 500k registrations)."""
+    rng = random.Random(seed)
+    n_students = max(int(STUDENTS * scale), 1)
+    n_drives = max(int(DRIVES * scale), 1)
+    n_materials = max(int(MATERIALS_PER_KIND * scale), 1)
+    per_student = min(REGISTRATIONS_PER_STUDENT, n_drives)
+    today = timezone.localdate()
+
+    clear()
+    with transaction.atomic():
+        admin = _staff('admin', 'admin', superuser=True)
+        _staff('coordinator', 'department_coordinator', branch='CSE')
+        trainers = {role: _staff(role, role) for role in ('verbal_trainer', 'aptitude_trainer', 'technical_trainer')}
+        log(f"Staff created (admin login: {admin.user.username}).")
+
+        password = make_password(BENCH_PASSWORD)  # hashed once; every login student shares it
+        users = User.objects.bulk_create([
+            User(username=f'{BENCH_PREFIX}{i:05d}', password=password)
+            for i in range(min(LOGIN_STUDENTS, n_students))
+        ])
+        _record(User, [user.id for user in users])
+        students = (
+            Student(
+                user=users[i] if i < len(users) else None,
+                full_name=f'Student {i}', roll_number=f'{BENCH_PREFIX}{i:05d}', phone='9000000000',
+                branch=branch, department=branch, graduation_year=rng.choice(GRADUATION_YEARS),
+            )
+            for i, branch in ((i, rng.choice(BRANCHES)) for i in range(n_students))
+        )
+        student_ids = []
+        for batch in _batched(students):
+            student_ids += [student.id for student in Student.objects.bulk_create(batch)]
+        _record(Student, student_ids)
+        log(f"{n_students} students created.")
+
+        drives = []
+        for i in range(n_drives):
+            restricted = rng.random() < 0.3
+            drives.append(PlacementDrive(
+                company_name=f'{BENCH_PREFIX} {rng.choice(COMPANIES)} {i}', job_role=rng.choice(JOB_ROLES),
+                date=today + datetime.timedelta(days=rng.randint(-365, 180)), package=f'{rng.randint(3, 30)} LPA',
+                description='Benchmark drive', capacity=rng.choice((None, None, None, 500)),
+                eligible_branches=f",{','.join(sorted(rng.sample(BRANCHES, 2)))}," if restricted else '',
+            ))
+        drive_ids = [drive.id for drive in PlacementDrive.objects.bulk_create(drives)]
+        _record(PlacementDrive, drive_ids)
+        log(f"{n_drives} drives created.")
+
+        registrations = (
+            Registration(student_id=student_id, drive_id=drive_id)
+            for student_id in student_ids
+            for drive_id in rng.sample(drive_ids, per_student)
+        )
+        for batch in _batched(registrations):
+            Registration.objects.bulk_create(batch)
+        log(f"{n_students * per_student} registrations created.")
+
+        for (category, label), trainer in zip(Material.CATEGORY_CHOICES, trainers.values()):
+            materials = Material.objects.bulk_create([
+                Material(category=category, title=f'{BENCH_PREFIX} {label} {i}',
+                         file=f'{Material.UPLOAD_DIRS[category]}bench-{i}.pdf', uploaded_by=trainer)
+                for i in range(n_materials)
+            ])
+            _record(Material, [material.id for material in materials])
+        log(f"{3 * n_materials} materials created.")
+
+    for drive in PlacementDrive.objects.filter(id__in=drive_ids, capacity__isnull=False):
+        sync_seats_taken(drive)
+    rebuild_derived_data()
+    log("Summaries, counters and search index rebuilt.")
+
+
+def rebuild_derived_data():
+    """Bulk inserts and muted deletes skip signals, so rebuild what the receivers maintain."""
+    analytics.refresh()
+    counters.reconcile()
+    search.rebuild_index()
+    fragments.bump(fragments.DRIVES, *fragments.MATERIAL_FRAGMENTS)
+
+
+# ========== Scenarios ==========
+class Scenario:
+    def __init__(self, name, login, url, method='get', data=None, undo=nullcontext):
+        self.name = name
+        self.login = login  # 'student', 'staff' or 'admin'
+        self.url = url  # callable(rng, drive_ids) -> path
+        self.method = method
+        # callable(user) -> form data; scenarios with data are sent logged out, as a fresh visitor each time
+        self.data = data
+        # context manager the scenario runs in, to take back what its requests wrote
+        self.undo = undo
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario('student_dashboard', 'student', lambda rng, drive_ids: reverse('student_dashboard')),
+        Scenario('available_drives', 'student', lambda rng, drive_ids: reverse('available_drives')),
+        Scenario('registered_drives', 'student', lambda rng, drive_ids: reverse('registered_drives')),
+        Scenario('all_materials', 'student', lambda rng, drive_ids: reverse('all_materials')),
+        Scenario('view_students', 'staff', lambda rng, drive_ids: reverse('view_students')),
+        Scenario('admin_dashboard', 'admin', lambda rng, drive_ids: reverse('admin_dashboard')),
+        Scenario(
+            'register_for_drive', 'student',
+            lambda rng, drive_ids: reverse('register_for_drive', args=[rng.choice(drive_ids)]), method='post',
+            undo=registrations_undone,
+        ),
+        # throughput_rps is logins per second for one worker with --concurrency threads
+        Scenario(
+            'student_login', 'student', lambda rng, drive_ids: reverse('student_login'), method='post',
+            data=lambda user: {'username': user.username, 'password': BENCH_PASSWORD},
+        ),
+    )
+}
+
+
+def _login_users():
+    students = list(
+        User.objects.filter(id__in=recorded(User), student__isnull=False).order_by('username'),
+    )
+    if not students:
+        raise LookupError("No benchmark data; run `manage.py seed_benchmark_data` first.")
+    return {
+        'student': students,
+        'staff': [User.objects.get(username=BENCH_USER_PREFIX + 'coordinator')],
+        'admin': [User.objects.get(username=BENCH_USER_PREFIX + 'admin')],
+    }
+
+
+_query_count = ContextVar('benchmark_query_count', default=None)
+_connect_ms = ContextVar('benchmark_connect_ms', default=None)
+
+
+def _count_queries(execute, sql, params, many, context):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def connects_timed():
+    """Add the time spent opening database connections (or taking one from the pool) to ``_connect_ms``."""
+    wrapper_class = type(connections['default'])
+    original = wrapper_class.connect
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            timer = _connect_ms.get()
+            if timer is not None:
+                timer[0] += (time.perf_counter() - start) * 1000
+
+    wrapper_class.connect = connect
+    try:
+        yield
+    finally:
+        wrapper_class.connect = original
+
+
+def _release_connection():
+    # What the server does when a request finishes, which the test clients
+    # skip: close the connection unless CONN_MAX_AGE keeps it, or hand it
+    # back to the pool. Inside a transaction (the test suite) it is kept.
+    if not connection.in_atomic_block:
+        close_old_connections()
+
+
+def connection_mode():
+    """'pool', 'persistent' or 'per-request', from the default database's settings."""
+    settings_dict = connections['default'].settings_dict
+    if settings_dict.get('OPTIONS', {}).get('pool'):
+        return 'pool'
+    return 'persistent' if settings_dict.get('CONN_MAX_AGE') else 'per-request'
+
+
+def _run_requests(scenario, user, count, seed, drive_ids):
+    """Issue ``count`` requests as ``user`` through WSGI; returns [(ms, queries, ok, connect_ms), ...]."""
+    rng = random.Random(seed)
+    client = Client()
+    if scenario.data is None:
+        client.force_login(user)
+    samples = []
+    try:
+        with connection.execute_wrapper(_count_queries):
+            for i in range(WARMUP_REQUESTS + count):
+                url = scenario.url(rng, drive_ids)
+                data = None
+                if scenario.data:
+                    data = scenario.data(user)
+                    client.cookies.clear()
+                counter, connect_ms = [0], [0.0]
+                _query_count.set(counter)
+                _connect_ms.set(connect_ms)
+                start = time.perf_counter()
+                response = getattr(client, scenario.method)(url, data)
+                elapsed = (time.perf_counter() - start) * 1000
+                _release_connection()
+                if i >= WARMUP_REQUESTS:
+                    samples.append((elapsed, counter[0], response.status_code < 400, connect_ms[0]))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+    return samples
+
+
+async def _arun_requests(scenario, user, count, seed, drive_ids):
+    """The same through ASGI, as one of many coroutines on a single event loop."""
+    rng = random.Random(seed)
+    client = AsyncClient()
+    if scenario.data is None:
+        await client.aforce_login(user)
+    samples = []
+    for i in range(WARMUP_REQUESTS + count):
+        url = scenario.url(rng, drive_ids)
+        data = None
+        if scenario.data:
+            data = scenario.data(user)
+            client.cookies.clear()
+        counter, connect_ms = [0], [0.0]
+        _query_count.set(counter)  # each coroutine has its own context
+        _connect_ms.set(connect_ms)
+        start = time.perf_counter()
+        response = await getattr(client, scenario.method)(url, data)
+        elapsed = (time.perf_counter() - start) * 1000
+        await sync_to_async(_release_connection)()
+        if i >= WARMUP_REQUESTS:
+            samples.append((elapsed, counter[0], response.status_code < 400, connect_ms[0]))
+    return samples
+
+
+async def _gather(jobs):
+    return await asyncio.gather(*(_arun_requests(*job) for job in jobs))
+
+
+def run(scenario_names=None, requests=200, concurrency=4, interface=WSGI):
+    """Run each scenario with ``concurrency`` clients sharing ``requests`` requests; returns results per scenario.
+
+    With WSGI every client is a thread, as with threaded sync workers; with
+    ASGI they are coroutines on one event loop, as in a single ASGI worker.
+    Connections are released after each request as a server would, so
+    ``mean_connect_ms`` shows what opening them adds to every request.
+    """
+    users = _login_users()
+    drive_ids = [row['row_id'] for row in recorded(PlacementDrive)]
+    per_client = max(requests // concurrency, 1)
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), connects_timed():
+        for name in scenario_names or SCENARIOS:
+            scenario = SCENARIOS[name]
+            logins = users[scenario.login]
+            jobs = [(scenario, logins[i % len(logins)], per_client, i, drive_ids) for i in range(concurrency)]
+            with scenario.undo():
+                start = time.perf_counter()
+                if interface == ASGI:
+                    # sync_to_async work (the ORM, sync views) comes back to this thread
+                    with connection.execute_wrapper(_count_queries):
+                        batches = async_to_sync(_gather)(jobs)
+                elif concurrency == 1:
+                    batches = [_run_requests(*jobs[0])]
+                else:
+                    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                        batches = list(pool.map(lambda job: _run_requests(*job), jobs))
+                wall = time.perf_counter() - start
+            samples = [sample for batch in batches for sample in batch]
+            results[name] = summarize(samples, wall)
+    return results
+
+
+def summarize(samples, wall_seconds):
+    durations = sorted(ms for ms, _, _, _ in samples)
+    queries = [count for _, count, _, _ in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, _, ok, _ in samples if not ok),
+        'p50_ms': round(percentile(durations, 50), 2),
+        'p95_ms': round(percentile(durations, 95), 2),
+        'p99_ms': round(percentile(durations, 99), 2),
+        'mean_queries': round(sum(queries) / len(queries), 2),
+        'max_queries': max(queries),
+        'mean_connect_ms': round(sum(connect_ms for _, _, _, connect_ms in samples) / len(samples), 2),
+        'throughput_rps': round(len(samples) / wall_seconds, 1) if wall_seconds else 0,
+    }
+
+
+# ========== Query Plans ==========
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)$', re.MULTILINE),  # "SCAN t USING INDEX i" is fine
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+
+
+def hot_queries():
+    """The queries behind the busiest pages, built against the benchmark dataset."""
+    student = Student.objects.filter(id__in=recorded(Student)).order_by('id').first()
+    trainer = StaffProfile.objects.filter(user__username=BENCH_USER_PREFIX + 'verbal_trainer').first()
+    if student is None or trainer is None:
+        raise LookupError("No benchmark data; run `manage.py seed_benchmark_data` first.")
+    now = timezone.now()
+    queries = {
+        'upcoming_feed': upcoming.queryset(timezone.localdate()),
+        'registered_drive_ids': Registration.objects.filter(student=student).values_list('drive_id', flat=True),
+        'drive_listing': PlacementDrive.objects.order_by('-date'),
+        'registered_drives': Registration.objects.filter(student=student).select_related('drive').order_by('drive__date'),
+        'department_students': Student.objects.filter(department=student.department).order_by('roll_number')[:25],
+        'contact_messages': ContactMessage.objects.order_by('-created_at'),
+        'notifications': Notification.objects.filter(student=student).order_by('-created_at')[:5],
+        'due_tasks': Task.objects.filter(status=Task.STATUS_PENDING, run_after__lte=now).order_by('run_after', 'id'),
+        'drive_shortlist': resumes.shortlist(PlacementDrive.objects.order_by('id').first(), ['python', 'sql']),
+    }
+    for category in Material.UPLOAD_DIRS:
+        queries[f'{category}_listing'] = Material.objects.for_listing().filter(category=category)
+    queries['material_feed'] = Material.objects.for_listing()[:100]
+    queries['material_counts'] = Material.objects.category_counts()
+    queries['material_by_uploader'] = Material.objects.by_uploader(trainer)
+    return queries
+
+
+def full_scans(queryset):
+    """Tables ``queryset`` reads with a sequential scan, or None if the backend isn't supported.
+
+    PostgreSQL gets sequential scans disabled first: on small tables it picks
+    them even when an index exists, so one that remains means no index fits.
+    """
+    pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        return None
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+    return pattern.findall(plan)
+
+
+# ========== Result History ==========
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def dataset_size():
+    return {
+        'students': Student.objects.count(),
+        'drives': PlacementDrive.objects.count(),
+        'registrations': Registration.objects.count(),
+    }
+
+
+def save_run(path, results, **meta):
+    entry = {
+        'commit': current_commit(), 'recorded_at': timezone.now().isoformat(),
+        'database': connection.vendor, 'dataset': dataset_size(), **meta, 'results': results,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a') as history:
+        history.write(json.dumps(entry) + '\n')
+    return entry
+
+
+def load_run(path, ref, interface=WSGI):
+    """The latest ``interface`` run whose commit starts with ``ref``; 'previous' means the latest of all."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    entries = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    entries = [entry for entry in entries if entry.get('interface', WSGI) == interface]
+    if ref != 'previous':
+        entries = [entry for entry in entries if entry['commit'].startswith(ref)]
+    return entries[-1] if entries else None
+
+
+def compare(results, baseline, max_regression):
+    """Return ``(lines, regressions)`` comparing p95 latency and query counts against ``baseline``."""
+    lines, regressions = [], []
+    for name, current in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            lines.append(f"{name}: no baseline")
+            continue
+        change = (current['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0
+        lines.append(
+            f"{name}: p95 {before['p95_ms']} -> {current['p95_ms']} ms ({change:+.0f}%), "
+            f"queries {before['max_queries']} -> {current['max_queries']}"
+        )
+        if change > max_regression:
+            regressions.append(f"{name} p95 is {change:.0f}% slower")
+        if current['max_queries'] > before['max_queries']:
+            regressions.append(f"{name} issues more queries")
+    return lines, regressions
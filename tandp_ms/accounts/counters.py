@@ -0,0 +1,78 @@
+from django.core.cache import cache
+
+from . import upcoming
+from .models import ContactMessage, PlacementDrive, Student
+
+# Dashboard aggregates kept in the cache and adjusted by the receivers in
+# signals.py, so admin_dashboard/staff_dashboard never run COUNT(*) on a warm
+# cache. `manage.py reconcile_counters` recomputes everything to correct drift
+# (bulk_create, queryset.update and raw SQL do not fire signals).
+
+TOTAL_STUDENTS = 'total_students'
+TOTAL_DRIVES = 'total_drives'
+UPCOMING_DRIVES = 'upcoming_drives'
+TOTAL_MESSAGES = 'total_messages'
+
+COUNTER_NAMES = (TOTAL_STUDENTS, TOTAL_DRIVES, UPCOMING_DRIVES, TOTAL_MESSAGES)
+
+# The upcoming count is the length of the cached feed in accounts.upcoming,
+# which already follows drive changes and rolls over at midnight.
+STORED_COUNTERS = (TOTAL_STUDENTS, TOTAL_DRIVES, TOTAL_MESSAGES)
+
+
+def cache_key(name):
+    return f'counters:{name}'
+
+
+def _compute(name):
+    if name == TOTAL_STUDENTS:
+        return Student.objects.count()
+    if name == TOTAL_DRIVES:
+        return PlacementDrive.objects.count()
+    if name == UPCOMING_DRIVES:
+        return len(upcoming.drives())
+    if name == TOTAL_MESSAGES:
+        return ContactMessage.objects.count()
+    raise KeyError(name)
+
+
+def _store(name, value):
+    cache.set(cache_key(name), value, None)
+
+
+def get_counters(*names):
+    """Return ``{name: value}`` for the requested counters (all by default).
+
+    Values come from the cache; a missing counter is computed once and stored.
+    """
+    names = names or COUNTER_NAMES
+    keys = {name: cache_key(name) for name in names if name in STORED_COUNTERS}
+    cached = cache.get_many(keys.values())
+    counters = {}
+    for name in names:
+        key = keys.get(name)
+        if key is None:
+            counters[name] = _compute(name)
+        elif key in cached:
+            counters[name] = cached[key]
+        else:
+            counters[name] = _compute(name)
+            _store(name, counters[name])
+    return counters
+
+
+def reconcile():
+    """Recompute every counter from the database and overwrite the cache."""
+    counters = {name: _compute(name) for name in COUNTER_NAMES}
+    for name in STORED_COUNTERS:
+        _store(name, counters[name])
+    return counters
+
+
+def adjust(name, delta):
+    """Add ``delta`` to a cached counter; a cold counter is left for lazy recompute."""
+    try:
+        cache.incr(cache_key(name), delta)
+    except ValueError:
+        pass
+
@@ -0,0 +1,188 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import content_disposition_header, http_date, parse_etags, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Folders every logged-in user may download from; anything else is staff only,
+# except resumes which their owner may fetch too.
+PUBLIC_MEDIA_DIRS = ('verbal_materials/', 'aptitude_tests/', 'technical_materials/')
+RESUME_DIR = 'resumes/'
+# Where accounts.storage spools uploads while hashing them; never served.
+INCOMING_DIR = '.incoming'
+
+MEDIA_CACHE_SECONDS = 60 * 60
+
+
+def clean_path(path):
+    """``path`` with ``.`` and doubled slashes folded away, or None if it is absolute or has a ``..``.
+
+    Checks and serving both use the cleaned path, so a file can't be reached
+    through another folder's prefix.
+    """
+    path = path.replace('\\', '/')
+    if path.startswith('/') or '..' in path.split('/'):
+        return None
+    path = posixpath.normpath(path)
+    return None if path == '.' else path
+
+
+def can_download(request, path):
+    """Whether the user may fetch ``path``, which must have been through clean_path()."""
+    if path.startswith(INCOMING_DIR + '/'):
+        return False
+    user = request.user
+    if user.is_staff or user.is_superuser:
+        return True
+    if path.startswith(PUBLIC_MEDIA_DIRS):
+        return True
+    if path.startswith(RESUME_DIR):
+        student = request.role.student
+        return bool(student and student.resume and student.resume.name == path)
+    return False
+
+
+def download_url(fieldfile, name, inline=False):
+    """URL of a stored file that browsers save as ``name``.
+
+    Files are stored under their content hash (accounts.storage), and one
+    file can belong to rows with different names, so the row supplies it.
+    """
+    params = {'name': name}
+    if inline:
+        params['inline'] = '1'
+    return f'{fieldfile.url}?{urlencode(params)}'
+
+
+def _content_disposition(request, path):
+    name = os.path.basename(request.GET.get('name', '').replace('\\', '/')).strip()
+    if not name:
+        return None
+    # always the stored file's own extension
+    filename = os.path.splitext(name)[0] + os.path.splitext(path)[1]
+    return content_disposition_header(not request.GET.get('inline'), filename)
+
+
+class RangeFile:
+    """Read-only view of ``length`` bytes of ``file`` starting at ``start``."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` for a single satisfiable byte range, or None to send it all.
+
+    Raises ValueError when the range cannot be satisfied (HTTP 416).
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def _offloaded(path, content_type):
+    """Let the front proxy send the file; only the headers leave Python."""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_OFFLOAD == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_OFFLOAD_PREFIX + quote(path)
+    else:
+        response['X-Sendfile'] = safe_join(settings.MEDIA_ROOT, path)
+    return response
+
+
+def media_response(request, path):
+    """Serve ``MEDIA_ROOT/path`` with ETag/Last-Modified validation and single Range support."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found.")
+    try:
+        stat = os.stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("File not found.")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    disposition = _content_disposition(request, path)
+    if settings.MEDIA_OFFLOAD:
+        response = _offloaded(path, content_type)
+        if disposition:
+            response['Content-Disposition'] = disposition
+        return response
+
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = int(stat.st_mtime)
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        not_modified = etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+    else:
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        not_modified = since is not None and last_modified <= since
+    if not_modified:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(full_path, 'rb')
+    if byte_range:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        # The real file object lets the WSGI server use sendfile().
+        response = FileResponse(file, content_type=content_type)
+        response['Content-Length'] = str(size)
+
+    if disposition:
+        response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'private, max-age={MEDIA_CACHE_SECONDS}'
+    return response
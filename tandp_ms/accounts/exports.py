@@ -0,0 +1,77 @@
+import csv
+
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+
+from .models import Registration
+
+EXPORT_CHUNK_SIZE = 2000
+
+STUDENT_EXPORT_FIELDS = ('roll_number', 'full_name', 'phone', 'branch', 'department', 'graduation_year')
+
+# Spreadsheet apps evaluate a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() hands the CSV line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def escape_cell(value):
+    """Quote text that a spreadsheet would run as a formula (e.g. a name typed as ``=HYPERLINK(...)``)."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _stream_csv(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([escape_cell(value) for value in row])
+
+
+def csv_response(filename, header, rows):
+    """A StreamingHttpResponse that sends the CSV row by row as ``rows`` is consumed."""
+    response = StreamingHttpResponse(_stream_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def student_rows(queryset):
+    students = queryset.order_by('roll_number').values_list(*STUDENT_EXPORT_FIELDS)
+    return students.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def registration_rows(drive):
+    registrations = (
+        Registration.objects.filter(drive=drive)
+        .select_related('student', 'drive')
+        .only(
+            'registered_at',
+            *(f'student__{field}' for field in STUDENT_EXPORT_FIELDS),
+            'drive__company_name', 'drive__job_role', 'drive__date',
+        )
+        .order_by('registered_at')
+    )
+    for registration in registrations.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        student = registration.student
+        yield [getattr(student, field) for field in STUDENT_EXPORT_FIELDS] + [
+            registration.drive.company_name,
+            registration.drive.job_role,
+            registration.drive.date.isoformat(),
+            registration.registered_at.isoformat(),
+        ]
+
+
+def export_students(queryset, filename='students.csv'):
+    return csv_response(filename, STUDENT_EXPORT_FIELDS, student_rows(queryset))
+
+
+def export_registrations(drive):
+    header = STUDENT_EXPORT_FIELDS + ('company_name', 'job_role', 'drive_date', 'registered_at')
+    filename = f'{slugify(drive.company_name) or "drive"}-{drive.id}-registrations.csv'
+    return csv_response(filename, header, registration_rows(drive))
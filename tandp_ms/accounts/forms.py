@@ -8,3 +8,21 @@ class StudentForm(forms.ModelForm):
         widgets = {
             'department': forms.TextInput(attrs={'readonly': 'readonly'}),  # department auto-assigned
         }
+
+
+class StudentImportForm(StudentForm):
+    """StudentForm rules for one CSV row; uniqueness is checked per chunk by the importer."""
+
+    class Meta(StudentForm.Meta):
+        fields = ['roll_number', 'full_name', 'phone', 'graduation_year', 'branch']
+
+    def validate_unique(self):
+        pass
+
+
+class StudentCSVUploadForm(forms.Form):
+    csv_file = forms.FileField(label='Students CSV')
+    initial_password = forms.CharField(
+        widget=forms.PasswordInput,
+        help_text='Used for rows without a password column value.',
+    )
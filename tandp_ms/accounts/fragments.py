@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+# Versioned caching for listing pages. Each listing has a version number in
+# the cache; cached() and arendered() put it in the key, so bumping the
+# version (from the model signals in signals.py) makes every old entry
+# unreachable at once.
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+VERBAL_MATERIALS = 'verbal_materials'
+APTITUDE_TESTS = 'aptitude_tests'
+TECHNICAL_MATERIALS = 'technical_materials'
+ALL_MATERIALS = 'all_materials'
+DRIVES = 'drives'
+
+# Material category -> the listing of that category
+CATEGORY_FRAGMENTS = {
+    'verbal': VERBAL_MATERIALS,
+    'aptitude': APTITUDE_TESTS,
+    'technical': TECHNICAL_MATERIALS,
+}
+MATERIAL_FRAGMENTS = (*CATEGORY_FRAGMENTS.values(), ALL_MATERIALS)
+
+
+def _version_key(name):
+    return f'fragments:{name}:version'
+
+
+def version(name):
+    # Versions start from the clock rather than 1 so that a version key which
+    # was evicted can never come back with a number already used before.
+    return cache.get_or_set(_version_key(name), time.time_ns, None)
+
+
+async def aversion(name):
+    return await cache.aget_or_set(_version_key(name), time.time_ns, None)
+
+
+async def arendered(name, template, acontext):
+    """``template`` rendered and cached under the current version of ``name``.
+
+    For async views: ``acontext()`` (which fetches the rows with the async
+    ORM) is only awaited on a miss, and the template never sees a lazy
+    queryset, unlike a {% cache %} block that might expire before it runs.
+    """
+    key = f'fragments:{name}:{await aversion(name)}:html'
+    html = await cache.aget(key)
+    if html is None:
+        html = render_to_string(template, await acontext())
+        await cache.aset(key, html, FRAGMENT_TIMEOUT)
+    return mark_safe(html)
+
+
+def bump(*names):
+    cache.set_many({_version_key(name): time.time_ns() for name in names}, None)
+
+
+def cached(name, compute):
+    """Return ``compute()`` cached under the current version of ``name``."""
+    return cache.get_or_set(f'fragments:{name}:{version(name)}', compute, FRAGMENT_TIMEOUT)
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Django's password hashers with their cost read from settings, so it can be
+# tuned per deployment (DJANGO_PBKDF2_ITERATIONS and friends) without a code
+# change. A hash made with another algorithm or cost is re-made with the
+# preferred hasher (PASSWORD_HASHERS[0], chosen by DJANGO_PASSWORD_HASHER) at
+# the user's next successful login, when Django's check_password() sees
+# must_update(); nobody has to reset a password.
+#
+# They keep Django's algorithm names, so hashes made before these classes
+# were configured still verify.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Needs the argon2-cffi package."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
@@ -0,0 +1,143 @@
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from . import counters
+from .forms import StudentImportForm
+from .models import Student
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_COLUMNS = ('roll_number', 'full_name', 'phone', 'graduation_year', 'branch', 'password')
+# Cap the per-row report so a completely wrong file cannot blow up memory.
+MAX_REPORTED_ERRORS = 1000
+# PBKDF2 releases the GIL, so each user's password is hashed in parallel.
+HASHING_THREADS = 4
+
+
+# ========== Import Report ==========
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []  # (line number, message)
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def truncated(self):
+        return self.failed > len(self.errors)
+
+
+def _read_chunks(fileobj, chunk_size):
+    """Yield lists of ``(line, row)`` from a CSV file without loading it whole."""
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(fileobj)
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    rows = ((reader.line_num, row) for row in reader)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _validate_chunk(chunk, department, seen, report):
+    """Return ``(line, cleaned_data, password)`` for the rows of ``chunk`` that pass validation.
+
+    ``seen`` collects the roll numbers of earlier rows to catch in-file duplicates.
+    """
+    valid = []
+    for line, row in chunk:
+        data = {key: (row.get(key) or '').strip() for key in IMPORT_COLUMNS}
+        data['branch'] = data['branch'] or department
+        form = StudentImportForm(data)
+        if not form.is_valid():
+            message = '; '.join(f"{field}: {' '.join(errors)}" for field, errors in form.errors.items())
+            report.add_error(line, message)
+            continue
+        roll_number = form.cleaned_data['roll_number']
+        if roll_number in seen:
+            report.add_error(line, f"roll_number: {roll_number} appears more than once in the file.")
+            continue
+        if data['password']:
+            try:
+                validate_password(data['password'], User(username=roll_number))
+            except ValidationError as error:
+                report.add_error(line, f"password: {' '.join(error.messages)}")
+                continue
+        seen.add(roll_number)
+        valid.append((line, form.cleaned_data, data['password']))
+
+    # One query each for roll numbers / usernames already taken in this chunk.
+    roll_numbers = [cleaned['roll_number'] for _, cleaned, _ in valid]
+    taken = set(Student.objects.filter(roll_number__in=roll_numbers).values_list('roll_number', flat=True))
+    taken |= set(User.objects.filter(username__in=roll_numbers).values_list('username', flat=True))
+    if not taken:
+        return valid
+    for line, cleaned, _ in valid:
+        if cleaned['roll_number'] in taken:
+            report.add_error(line, f"roll_number: {cleaned['roll_number']} already exists.")
+    return [item for item in valid if item[1]['roll_number'] not in taken]
+
+
+def _hash_passwords(valid, initial_password, executor):
+    # one hash per user, each with its own salt, even where they share the initial password
+    return list(executor.map(make_password, [password or initial_password for _, _, password in valid]))
+
+
+def import_students(fileobj, department, initial_password, chunk_size=IMPORT_CHUNK_SIZE):
+    """Create a ``User`` + ``Student`` for every valid row of a students CSV.
+
+    Columns: roll_number, full_name, phone, graduation_year and optionally
+    branch (defaults to ``department``) and password (defaults to
+    ``initial_password``; a row's own must pass AUTH_PASSWORD_VALIDATORS).
+    Rows are validated with the StudentForm rules and written ``chunk_size``
+    at a time, each chunk in its own transaction, so memory stays bounded by
+    the chunk.
+    """
+    report = ImportReport()
+    seen = set()
+
+    with ThreadPoolExecutor(max_workers=HASHING_THREADS) as executor:
+        for chunk in _read_chunks(fileobj, chunk_size):
+            valid = _validate_chunk(chunk, department, seen, report)
+            if not valid:
+                continue
+
+            passwords = _hash_passwords(valid, initial_password, executor)
+            try:
+                with transaction.atomic():
+                    User.objects.bulk_create([
+                        User(username=cleaned['roll_number'], password=password)
+                        for (_, cleaned, _), password in zip(valid, passwords)
+                    ])
+                    # Only some backends return primary keys from bulk_create, so look the users up again.
+                    user_ids = dict(
+                        User.objects.filter(username__in=[cleaned['roll_number'] for _, cleaned, _ in valid])
+                        .values_list('username', 'pk')
+                    )
+                    Student.objects.bulk_create([
+                        Student(user_id=user_ids[cleaned['roll_number']], department=department, **cleaned)
+                        for _, cleaned, _ in valid
+                    ])
+            except IntegrityError:
+                # Someone else created one of these roll numbers since validation.
+                for line, cleaned, _ in valid:
+                    report.add_error(line, f"roll_number: {cleaned['roll_number']} could not be saved, retry this row.")
+                continue
+            report.created += len(valid)
+
+    # bulk_create bypasses post_save, so bump the dashboard counter directly.
+    counters.adjust(counters.TOTAL_STUDENTS, report.created)
+    return report
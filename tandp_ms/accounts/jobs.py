@@ -0,0 +1,67 @@
+from . import resumes, uploads
+from .matching import eligible_students
+from .models import Notification, PlacementDrive, UploadSession
+from .tasks import enqueue, enqueue_many, task
+
+# Task handlers, registered when the app is ready (see apps.py).
+
+ANNOUNCE_DRIVE = 'announce_drive'
+NOTIFY_STUDENTS = 'notify_students'
+INDEX_RESUME = 'index_resume'
+FINISH_UPLOAD = 'finish_upload'
+
+NOTIFY_BATCH_SIZE = 500
+
+
+@task(ANNOUNCE_DRIVE)
+def announce_drive(drive_id):
+    """Split the drive's audience into batches, each notified by its own task."""
+    drive = PlacementDrive.objects.filter(id=drive_id).first()
+    if drive is None:
+        return
+    students = eligible_students(drive).order_by('id').values_list('id', flat=True)
+    payloads, last_id = [], 0
+    while True:
+        ids = list(students.filter(id__gt=last_id)[:NOTIFY_BATCH_SIZE])
+        if not ids:
+            break
+        payloads.append({'drive_id': drive_id, 'student_ids': ids})
+        last_id = ids[-1]
+    enqueue_many(NOTIFY_STUDENTS, payloads)
+
+
+@task(NOTIFY_STUDENTS)
+def notify_students(drive_id, student_ids):
+    drive = PlacementDrive.objects.filter(id=drive_id).first()
+    if drive is None:
+        return
+    message = f"New placement drive: {drive.company_name} - {drive.job_role} on {drive.date:%d %b %Y}."
+    # Notifications are unique per (student, drive), so a retried batch only fills the gaps.
+    Notification.objects.bulk_create(
+        [Notification(student_id=student_id, drive=drive, message=message) for student_id in student_ids],
+        ignore_conflicts=True,
+    )
+
+
+@task(INDEX_RESUME)
+def index_resume(student_id):
+    resumes.index_resume(student_id)
+
+
+# Not retried: the client is polling, so it is told at once and can upload again.
+@task(FINISH_UPLOAD, max_attempts=1)
+def finish_upload(upload_id):
+    """Store a chunked upload whose last chunk has arrived."""
+    session = (
+        UploadSession.objects.select_related('user')
+        .filter(id=upload_id, state=UploadSession.STATE_STORING).first()
+    )
+    if session is None:
+        return
+    try:
+        created = uploads.finish_session(session)
+    except Exception:
+        uploads.fail_session(session, "The file could not be stored. Please upload it again.")
+        raise
+    if session.purpose == UploadSession.PURPOSE_RESUME:
+        enqueue(INDEX_RESUME, {'student_id': created.id})
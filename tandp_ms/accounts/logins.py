@@ -0,0 +1,73 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Failed logins are counted in the cache per username (roll number) and per
+# client IP, over a fixed window. Once a username reaches its limit the login
+# views refuse further attempts for it without calling authenticate(), so
+# password guessing neither succeeds nor costs a password hash per try.
+#
+# A whole campus can share one address (its NAT, or the front proxy when
+# LOGIN_CLIENT_IP_HEADER isn't set), so the IP count never locks anyone out
+# on its own: past its limit, a username from that address is refused after
+# its first failure instead of its fifth. Students who type their password
+# right still get in, however many others mistype theirs.
+#
+# Only failures are counted, and a successful login clears its username's
+# count. Limits are (failures, window in seconds) in LOGIN_FAILURE_LIMITS;
+# use a cache shared by all workers, or each process counts on its own.
+
+USERNAME = 'username'
+IP = 'ip'
+
+LOCKED_MESSAGE = "Too many failed login attempts. Please wait a few minutes and try again."
+
+
+def client_ip(request):
+    """The client's address: from LOGIN_CLIENT_IP_HEADER when a trusted proxy sets it, else REMOTE_ADDR."""
+    header = settings.LOGIN_CLIENT_IP_HEADER
+    if header and request.META.get(header):
+        # the proxy appends the address it saw, so the last entry is the one it vouches for
+        return request.META[header].split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _keys(request, username):
+    """``{scope: cache key}`` for the counters this attempt is checked against."""
+    keys = {IP: f'logins:ip:{client_ip(request)}'}
+    if username:
+        # hashed, so any input makes a valid cache key
+        digest = hashlib.sha256(username.strip().lower().encode()).hexdigest()
+        keys[USERNAME] = f'logins:user:{digest}'
+    return keys
+
+
+def is_locked(request, username):
+    """Whether the username has used up its failed attempts, fewer from a client over its own limit."""
+    limits = settings.LOGIN_FAILURE_LIMITS
+    keys = _keys(request, username)
+    if USERNAME not in keys:
+        return False
+    failures = cache.get_many(keys.values())
+    username_failures = failures.get(keys[USERNAME], 0)
+    if username_failures >= limits[USERNAME][0]:
+        return True
+    return username_failures > 0 and failures.get(keys[IP], 0) >= limits[IP][0]
+
+
+def failed(request, username):
+    limits = settings.LOGIN_FAILURE_LIMITS
+    for scope, key in _keys(request, username).items():
+        # the window starts at the first failure; incr() keeps its expiry
+        if not cache.add(key, 1, limits[scope][1]):
+            try:
+                cache.incr(key)
+            except ValueError:  # expired between add() and incr()
+                cache.add(key, 1, limits[scope][1])
+
+
+def succeeded(request, username):
+    key = _keys(request, username).get(USERNAME)
+    if key:
+        cache.delete(key)
@@ -0,0 +1,19 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import storage
+
+INCOMING_MAX_AGE = 60 * 60
+
+
+class Command(BaseCommand):
+    help = "Delete stored files no student or material references any more, and stale upload spool files."
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, storage.ContentAddressedStorage):
+            raise CommandError("The default storage is not accounts.storage.ContentAddressedStorage.")
+        files, freed = storage.collect_garbage()
+        spooled = default_storage.clear_incoming(INCOMING_MAX_AGE)
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {files} unreferenced files ({freed / 1024 / 1024:.1f} MB) and {spooled} stale spool files."
+        ))
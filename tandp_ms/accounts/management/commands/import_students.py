@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importers import IMPORT_CHUNK_SIZE, import_students
+
+
+class Command(BaseCommand):
+    help = "Bulk-create students (and their login accounts) from a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--department', required=True, help="Department assigned to every imported student.")
+        parser.add_argument('--password', required=True, help="Initial password for rows without a password column.")
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            csv_file = open(options['csv_path'], newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(exc)
+
+        with csv_file:
+            report = import_students(
+                csv_file,
+                department=options['department'],
+                initial_password=options['password'],
+                chunk_size=options['chunk_size'],
+            )
+
+        for line, message in report.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if report.truncated:
+            self.stderr.write(f"... {report.failed - len(report.errors)} more errors not shown")
+        self.stdout.write(self.style.SUCCESS(f"{report.created} students imported, {report.failed} rows rejected."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accounts import jobs, tasks
+from accounts.models import Student
+
+
+class Command(BaseCommand):
+    help = "Queue resume indexing for every student with a resume (unchanged files are skipped by the worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Re-extract every resume, even unchanged ones.")
+
+    def handle(self, *args, **options):
+        students = Student.objects.exclude(resume='').exclude(resume__isnull=True)
+        if options['force']:
+            students.update(resume_sha256='')
+        payloads = [{'student_id': student_id} for student_id in students.values_list('id', flat=True)]
+        tasks.enqueue_many(jobs.INDEX_RESUME, payloads)
+        self.stdout.write(self.style.SUCCESS(f"Queued {len(payloads)} resumes for indexing."))
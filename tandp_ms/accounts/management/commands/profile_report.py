@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from accounts import profiling
+
+COLUMNS = (
+    ('url_name', 40), ('requests', 9), ('p50_ms', 9), ('p95_ms', 9), ('p99_ms', 9),
+    ('p95_queries', 12), ('p95_db_ms', 10), ('p95_template_ms', 16), ('avg_size', 10),
+)
+
+
+class Command(BaseCommand):
+    help = "Print p50/p95/p99 latency, query and render times per URL name from the recorded request profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help="Report on the last N hours.")
+        parser.add_argument('--purge-days', type=int, help="First delete profiles older than N days.")
+
+    def handle(self, *args, **options):
+        if options['purge_days'] is not None:
+            deleted = profiling.purge(options['purge_days'])
+            self.stdout.write(f"Deleted {deleted} old profiles.")
+
+        lines = profiling.report(hours=options['hours'])
+        if not lines:
+            self.stdout.write("No requests recorded; is DJANGO_PROFILING=True set on the web process?")
+            return
+        self.stdout.write(''.join(name.ljust(width) for name, width in COLUMNS))
+        for line in lines:
+            self.stdout.write(''.join(str(line[name]).ljust(width) for name, width in COLUMNS))
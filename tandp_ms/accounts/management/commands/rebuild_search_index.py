@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from accounts import search
+
+
+class Command(BaseCommand):
+    help = "Refill the SQLite FTS5 search tables from the drive and material tables."
+
+    def handle(self, *args, **options):
+        if not search.uses_fts5():
+            self.stdout.write("Only SQLite keeps a separate search index; nothing to rebuild.")
+            return
+        search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
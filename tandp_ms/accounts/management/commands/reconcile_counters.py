@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from accounts import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached dashboard counters from the database (run periodically, e.g. from cron)."
+
+    def handle(self, *args, **options):
+        for name, value in counters.reconcile().items():
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS("Dashboard counters reconciled."))
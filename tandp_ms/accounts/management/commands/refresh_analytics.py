@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts import analytics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the registration analytics summaries from the Registration table."
+
+    def handle(self, *args, **options):
+        rows = analytics.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Analytics refreshed ({rows} summary rows)."))
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import benchmarks
+
+COLUMNS = (
+    ('scenario', 22), ('requests', 9), ('errors', 7), ('p50_ms', 9), ('p95_ms', 9), ('p99_ms', 9),
+    ('mean_queries', 13), ('max_queries', 12), ('mean_connect_ms', 16), ('throughput_rps', 14),
+)
+
+
+class Command(BaseCommand):
+    help = "Load-test the main student/staff/admin pages against the benchmark dataset and record the results."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', choices=sorted(benchmarks.SCENARIOS),
+            help="Run only this scenario (repeatable); default is all of them.",
+        )
+        parser.add_argument('--requests', type=int, default=200, help="Requests per scenario.")
+        parser.add_argument('--concurrency', type=int, default=4, help="Concurrent clients per scenario.")
+        parser.add_argument(
+            '--interface', choices=(benchmarks.WSGI, benchmarks.ASGI), default=benchmarks.WSGI,
+            help="Serve requests through WSGI (one thread per client) or ASGI (one event loop).",
+        )
+        parser.add_argument(
+            '--output', default=str(settings.BASE_DIR / 'benchmark_results.jsonl'),
+            help="JSON-lines file the run is appended to.",
+        )
+        parser.add_argument(
+            '--check-plans', action='store_true',
+            help="Only EXPLAIN the hot queries and fail if any reads a table sequentially.",
+        )
+        parser.add_argument('--compare', help="Compare with the last run of this commit, or 'previous'.")
+        parser.add_argument(
+            '--max-regression', type=float, default=25.0,
+            help="Fail when a p95 is this many percent slower than the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        if options['check_plans']:
+            return self.check_plans()
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+        baseline = None
+        if options['compare']:
+            baseline = benchmarks.load_run(options['output'], options['compare'], options['interface'])
+            if baseline is None:
+                raise CommandError(f"No saved run matches {options['compare']!r}.")
+
+        try:
+            results = benchmarks.run(
+                options['scenario'], options['requests'], options['concurrency'], options['interface'],
+            )
+        except LookupError as error:
+            raise CommandError(error)
+        entry = benchmarks.save_run(
+            options['output'], results, concurrency=options['concurrency'], interface=options['interface'],
+            session_engine=settings.SESSION_ENGINE.rsplit('.', 1)[-1], password_hasher=settings.PASSWORD_HASHER,
+            connections=benchmarks.connection_mode(),
+        )
+
+        self.stdout.write(''.join(name.ljust(width) for name, width in COLUMNS))
+        for name, line in results.items():
+            self.stdout.write(''.join(str(line.get(column, name)).ljust(width) for column, width in COLUMNS))
+        self.stdout.write(f"Saved as commit {entry['commit']} in {options['output']}.")
+
+        if baseline is not None:
+            lines, regressions = benchmarks.compare(results, baseline, options['max_regression'])
+            self.stdout.write(f"Compared with commit {baseline['commit']}:")
+            for line in lines:
+                self.stdout.write(f"  {line}")
+            if regressions:
+                raise CommandError("Regressions: " + '; '.join(regressions))
+
+    def check_plans(self):
+        try:
+            queries = benchmarks.hot_queries()
+        except LookupError as error:
+            raise CommandError(error)
+        failures = []
+        for name, queryset in queries.items():
+            scans = benchmarks.full_scans(queryset)
+            if scans is None:
+                raise CommandError("Query plans can only be checked on SQLite and PostgreSQL.")
+            self.stdout.write(f"{name}: {'sequential scan of ' + ', '.join(scans) if scans else 'indexed'}")
+            if scans:
+                failures.append(name)
+        if failures:
+            raise CommandError("Sequential scans in: " + ', '.join(failures))
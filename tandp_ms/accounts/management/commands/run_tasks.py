@@ -0,0 +1,65 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts import analytics, tasks
+
+PURGE_INTERVAL = 60 * 60
+ROLLUP_INTERVAL = 30
+
+
+def run_in_thread(task_row):
+    try:
+        return tasks.run(task_row)
+    finally:
+        # each pool thread has its own connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (keep one or more of these running next to the web workers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1, help="Tasks run at the same time by this worker.")
+        parser.add_argument('--poll', type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Exit once no task is due instead of polling.")
+        parser.add_argument('--keep-days', type=int, default=7, help="Days to keep finished tasks before purging.")
+
+    def handle(self, *args, **options):
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        concurrency = max(options['concurrency'], 1)
+        succeeded = failed = 0
+        last_purge = last_rollup = None
+        self.stdout.write(f"Worker {worker} started with concurrency {concurrency}.")
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    tasks.requeue_stale()
+                    if last_rollup is None or time.monotonic() - last_rollup > ROLLUP_INTERVAL:
+                        # fold registration analytics deltas even while the queue is busy
+                        analytics.rollup()
+                        last_rollup = time.monotonic()
+                    claimed = tasks.claim(worker, concurrency)
+                    if claimed:
+                        for task_row, ok in zip(claimed, pool.map(run_in_thread, claimed)):
+                            if ok:
+                                succeeded += 1
+                            else:
+                                failed += 1
+                                self.stderr.write(f"{task_row} failed (attempt {task_row.attempts}).")
+                        continue
+                    if last_purge is None or time.monotonic() - last_purge > PURGE_INTERVAL:
+                        tasks.purge_finished(options['keep_days'])
+                        last_purge = time.monotonic()
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping.")
+
+        self.stdout.write(self.style.SUCCESS(f"{succeeded} tasks succeeded, {failed} failed."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Create the deterministic benchmark dataset (20k students, 500 drives, 500k registrations at --scale 1)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Fraction of the full dataset to create.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same data.")
+        parser.add_argument('--clear', action='store_true', help="Only remove existing benchmark data.")
+        parser.add_argument('--force', action='store_true', help="Run even if the database holds real students.")
+
+    def handle(self, *args, **options):
+        if benchmarks.has_real_data() and not options['force']:
+            raise CommandError("This database has non-benchmark students; use a scratch database or --force.")
+        if options['clear']:
+            benchmarks.clear()
+            benchmarks.rebuild_derived_data()
+            self.stdout.write(self.style.SUCCESS("Benchmark data removed."))
+            return
+        if options['scale'] <= 0:
+            raise CommandError("--scale must be positive.")
+        benchmarks.seed(scale=options['scale'], seed=options['seed'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS("Benchmark data ready."))
@@ -0,0 +1,38 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Registration, Student
+
+
+def normalize_branches(value):
+    """``',CSE,ECE,'`` from form input such as ``'cse, ece'``; blank means every branch."""
+    branches = sorted({branch.strip().upper() for branch in (value or '').split(',') if branch.strip()})
+    return f",{','.join(branches)}," if branches else ''
+
+
+def is_eligible(student, drive, today=None):
+    """Whether ``drive`` is still upcoming and its branch and graduation-year criteria admit ``student``."""
+    today = today or timezone.localdate()
+    year = student.graduation_year
+    branches = drive.branch_list
+    return (
+        drive.date >= today
+        and (not branches or student.branch.strip().upper() in branches)
+        and (drive.min_graduation_year is None or year >= drive.min_graduation_year)
+        and (drive.max_graduation_year is None or year <= drive.max_graduation_year)
+    )
+
+
+def eligible_students(drive):
+    """Students the drive is open to who have not registered yet, e.g. for announcements."""
+    students = Student.objects.exclude(id__in=Registration.objects.filter(drive=drive).values('student_id'))
+    if drive.branch_list:
+        students = students.filter(reduce(or_, (Q(branch__iexact=branch) for branch in drive.branch_list)))
+    if drive.min_graduation_year is not None:
+        students = students.filter(graduation_year__gte=drive.min_graduation_year)
+    if drive.max_graduation_year is not None:
+        students = students.filter(graduation_year__lte=drive.max_graduation_year)
+    return students
@@ -0,0 +1,165 @@
+from inspect import iscoroutine
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.functional import SimpleLazyObject
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .models import StaffProfile, Student
+
+ROLE_CACHE_TIMEOUT = 60 * 5
+
+
+# ========== Request Role ==========
+class RequestRole:
+    """The profile behind ``request.user``: a StaffProfile, a Student, or neither."""
+
+    def __init__(self, staff_profile=None, student=None):
+        self.staff_profile = staff_profile
+        self.student = student
+
+    @property
+    def name(self):
+        if self.staff_profile:
+            return self.staff_profile.role
+        if self.student:
+            return 'student'
+        return None
+
+    @property
+    def is_department_coordinator(self):
+        return self.name == 'department_coordinator'
+
+
+def role_cache_key(user_id):
+    return f'accounts:role:{user_id}'
+
+
+def resolve_role(user):
+    """Look up the profile for ``user``: one query, or none on a cache hit.
+
+    Staff users only need their StaffProfile and everyone else only their
+    Student row, so a single table is consulted. When ACCOUNTS_CACHE_ROLES is
+    on, the result is kept in the cache and dropped whenever the profile or
+    user is saved (see signals.py); only enable it with a cache shared by all
+    workers, otherwise other processes can serve a stale profile.
+    """
+    if not user.is_authenticated:
+        return RequestRole()
+
+    use_cache = getattr(settings, 'ACCOUNTS_CACHE_ROLES', False)
+    if use_cache:
+        role = cache.get(role_cache_key(user.pk))
+        if role is not None:
+            return role
+
+    if user.is_staff or user.is_superuser:
+        role = RequestRole(staff_profile=StaffProfile.objects.filter(user=user).first())
+    else:
+        role = RequestRole(student=Student.objects.filter(user=user).first())
+
+    if use_cache:
+        cache.set(role_cache_key(user.pk), role, ROLE_CACHE_TIMEOUT)
+    return role
+
+
+async def aresolve_role(user):
+    """resolve_role() for async views, using the async ORM and cache APIs."""
+    if not user.is_authenticated:
+        return RequestRole()
+
+    use_cache = getattr(settings, 'ACCOUNTS_CACHE_ROLES', False)
+    if use_cache:
+        role = await cache.aget(role_cache_key(user.pk))
+        if role is not None:
+            return role
+
+    if user.is_staff or user.is_superuser:
+        role = RequestRole(staff_profile=await StaffProfile.objects.filter(user=user).afirst())
+    else:
+        role = RequestRole(student=await Student.objects.filter(user=user).afirst())
+
+    if use_cache:
+        await cache.aset(role_cache_key(user.pk), role, ROLE_CACHE_TIMEOUT)
+    return role
+
+
+def invalidate_role(user_id):
+    if user_id is not None:
+        cache.delete(role_cache_key(user_id))
+
+
+def get_staff_profile(request):
+    """``request.role.staff_profile`` or 404, replacing get_object_or_404(StaffProfile, user=...)."""
+    if request.role.staff_profile is None:
+        raise Http404("No StaffProfile matches the given query.")
+    return request.role.staff_profile
+
+
+def get_student(request):
+    if request.role.student is None:
+        raise Http404("No Student matches the given query.")
+    return request.role.student
+
+
+async def aget_user(request):
+    """``await request.auser()``, also stored as ``request.user`` so templates don't query again."""
+    request.user = await request.auser()
+    return request.user
+
+
+async def aget_student(request):
+    """get_student() for async views; ``request.role`` is replaced by the resolved role."""
+    request.role = await aresolve_role(await aget_user(request))
+    return get_student(request)
+
+
+class RoleMiddleware:
+    """Expose ``request.role``, resolved at most once per request and only if used."""
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.role = SimpleLazyObject(lambda: resolve_role(request.user))
+        return self.get_response(request)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise without forcing the rest of the stack onto a thread under ASGI.
+
+    WhiteNoise is sync-only, so Django would run every request below it
+    through sync_to_async. Looking up a static file is a dict hit
+    in production (files are scanned at startup), so it is done on the event loop.
+
+    No WhiteNoise code is copied: its own __call__ runs as is, and relies only
+    on it returning ``self.get_response(request)`` for other paths, which
+    here is the coroutine of the async stack below and is awaited. Check
+    that still holds when upgrading WhiteNoise past the pinned version.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        response = super().__call__(request)
+        if iscoroutine(response):
+            response = await response
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_technicalmaterial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['department', 'roll_number'], name='student_dept_roll_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['branch', 'roll_number'], name='student_branch_roll_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['graduation_year', 'roll_number'], name='student_year_roll_idx'),
+        ),
+    ]
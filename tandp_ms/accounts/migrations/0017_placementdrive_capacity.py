@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_student_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='placementdrive',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='placementdrive',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# Full-text search structures, see accounts/search.py. PostgreSQL gets GIN
+# expression indexes; SQLite gets FTS5 tables filled from the existing rows.
+# Other backends get nothing.
+
+PG_DRIVE_DOCUMENT = (
+    "to_tsvector('english', coalesce(company_name, '') || ' ' || coalesce(job_role, '') "
+    "|| ' ' || coalesce(description, ''))"
+)
+PG_TITLE_DOCUMENT = "to_tsvector('english', title)"
+MATERIAL_TABLES = (
+    ('verbal', 'accounts_verbalmaterial', 0),
+    ('aptitude', 'accounts_aptitudetest', 1),
+    ('technical', 'accounts_technicalmaterial', 2),
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX placementdrive_search_gin ON accounts_placementdrive USING gin (({PG_DRIVE_DOCUMENT}))"
+        )
+        for kind, table, _ in MATERIAL_TABLES:
+            schema_editor.execute(f"CREATE INDEX {table}_title_search_gin ON {table} USING gin (({PG_TITLE_DOCUMENT}))")
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE accounts_placementdrive_fts USING fts5(company_name, job_role, description)"
+        )
+        schema_editor.execute(
+            "INSERT INTO accounts_placementdrive_fts (rowid, company_name, job_role, description) "
+            "SELECT id, company_name, job_role, description FROM accounts_placementdrive"
+        )
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE accounts_material_fts USING fts5(title, kind UNINDEXED, material_id UNINDEXED)"
+        )
+        for kind, table, number in MATERIAL_TABLES:
+            schema_editor.execute(
+                f"INSERT INTO accounts_material_fts (rowid, title, kind, material_id) "
+                f"SELECT id * {len(MATERIAL_TABLES)} + {number}, title, '{kind}', id FROM {table}"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS placementdrive_search_gin")
+        for kind, table, _ in MATERIAL_TABLES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_title_search_gin")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS accounts_placementdrive_fts")
+        schema_editor.execute("DROP TABLE IF EXISTS accounts_material_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_uploadsession'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_task_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='placementdrive',
+            name='eligible_branches',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='placementdrive',
+            name='max_graduation_year',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='placementdrive',
+            name='min_graduation_year',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='placementdrive',
+            index=models.Index(fields=['date'], name='drive_date_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:45
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth, Trim, Upper
+
+
+def populate_summaries(apps, schema_editor):
+    # the same aggregation as accounts.analytics.compute_summaries, kept here
+    # so this migration doesn't change when that code does
+    Registration = apps.get_model('accounts', 'Registration')
+    RegistrationSummary = apps.get_model('accounts', 'RegistrationSummary')
+    registrations = Registration.objects.order_by()
+    rows = [
+        RegistrationSummary(dimension='drive', key=str(row['drive_id']), count=row['n'],
+                            label=f"{row['drive__company_name']} - {row['drive__job_role']}")
+        for row in registrations.values('drive_id', 'drive__company_name', 'drive__job_role').annotate(n=Count('id'))
+    ]
+    branches = registrations.annotate(branch=Upper(Trim('student__branch'))).values('branch').annotate(n=Count('id'))
+    rows += [RegistrationSummary(dimension='branch', key=row['branch'], count=row['n']) for row in branches]
+    rows += [
+        RegistrationSummary(dimension='graduation_year', key=str(row['student__graduation_year']), count=row['n'])
+        for row in registrations.values('student__graduation_year').annotate(n=Count('id'))
+    ]
+    rows += [
+        RegistrationSummary(dimension='month', key=row['month'].strftime('%Y-%m'), count=row['n'])
+        for row in registrations.annotate(month=TruncMonth('registered_at')).values('month').annotate(n=Count('id'))
+    ]
+    RegistrationSummary.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_placementdrive_eligibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('drive', 'Drive'), ('branch', 'Branch'), ('graduation_year', 'Graduation Year'), ('month', 'Month')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('label', models.CharField(blank=True, max_length=255)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('dimension', 'key')},
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=100)),
+                ('method', models.CharField(max_length=10)),
+                ('status', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('queries', models.PositiveIntegerField()),
+                ('db_ms', models.FloatField()),
+                ('template_ms', models.FloatField()),
+                ('response_size', models.PositiveIntegerField()),
+                ('recorded_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_requestprofile'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_status_run_after_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aptitudetest',
+            index=models.Index(fields=['-uploaded_at'], name='aptitude_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aptitudetest',
+            index=models.Index(fields=['uploaded_by', '-uploaded_at'], name='aptitude_uploader_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at'], name='message_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['run_after', 'id'], name='task_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalmaterial',
+            index=models.Index(fields=['-uploaded_at'], name='technical_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalmaterial',
+            index=models.Index(fields=['uploaded_by', '-uploaded_at'], name='technical_uploader_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verbalmaterial',
+            index=models.Index(fields=['-uploaded_at'], name='verbal_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verbalmaterial',
+            index=models.Index(fields=['uploaded_by', '-uploaded_at'], name='verbal_uploader_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0026_resume_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('references', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('references__lte', 0)), fields=['id'], name='blob_orphan_idx')],
+            },
+        ),
+    ]
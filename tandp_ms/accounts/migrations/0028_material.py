@@ -0,0 +1,108 @@
+import accounts.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Verbal materials, aptitude tests and technical materials move into the one
+# Material table, told apart by category. Rows are copied with one
+# INSERT ... SELECT per table so uploaded_at keeps its original values (the
+# ORM would stamp them with now). Material ids are new, so the full-text
+# search structures of 0019 are rebuilt for the new table.
+
+OLD_TABLES = (
+    ('verbal', 'accounts_verbalmaterial'),
+    ('aptitude', 'accounts_aptitudetest'),
+    ('technical', 'accounts_technicalmaterial'),
+)
+COLUMNS = 'title, file, uploaded_by_id, uploaded_at, updated_at'
+PG_TITLE_DOCUMENT = "to_tsvector('english', title)"
+
+
+def merge_materials(apps, schema_editor):
+    for category, table in OLD_TABLES:
+        schema_editor.execute(
+            f"INSERT INTO accounts_material (category, {COLUMNS}) "
+            f"SELECT %s, {COLUMNS} FROM {table} ORDER BY uploaded_at, id",
+            [category],
+        )
+    index_materials(schema_editor)
+
+
+def split_materials(apps, schema_editor):
+    for category, table in OLD_TABLES:
+        # verbal and technical materials could not outlive their uploader
+        schema_editor.execute(
+            f"INSERT INTO {table} ({COLUMNS}) SELECT {COLUMNS} FROM accounts_material "
+            f"WHERE category = %s AND (uploaded_by_id IS NOT NULL OR %s) ORDER BY id",
+            [category, category == 'aptitude'],
+        )
+    reindex_old_tables(schema_editor)
+
+
+def index_materials(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX material_title_search_gin ON accounts_material USING gin (({PG_TITLE_DOCUMENT}))"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute("DELETE FROM accounts_material_fts")
+        schema_editor.execute(
+            "INSERT INTO accounts_material_fts (rowid, title, kind, material_id) "
+            "SELECT id, title, category, id FROM accounts_material"
+        )
+
+
+def reindex_old_tables(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS material_title_search_gin")
+        for _, table in OLD_TABLES:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_title_search_gin ON {table} USING gin (({PG_TITLE_DOCUMENT}))"
+            )
+    elif vendor == 'sqlite':
+        schema_editor.execute("DELETE FROM accounts_material_fts")
+        for number, (kind, table) in enumerate(OLD_TABLES):
+            schema_editor.execute(
+                f"INSERT INTO accounts_material_fts (rowid, title, kind, material_id) "
+                f"SELECT id * {len(OLD_TABLES)} + {number}, title, '{kind}', id FROM {table}"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0027_stored_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Material',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('verbal', 'Verbal Material'), ('aptitude', 'Aptitude Test'), ('technical', 'Technical Material')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('file', models.FileField(upload_to=accounts.models.material_upload_to)),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('uploaded_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='accounts.staffprofile')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['category', '-uploaded_at'], name='material_category_idx'),
+                    models.Index(fields=['-uploaded_at'], name='material_uploaded_idx'),
+                    models.Index(fields=['uploaded_by', '-uploaded_at'], name='material_uploader_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(merge_materials, split_materials),
+        migrations.DeleteModel(
+            name='AptitudeTest',
+        ),
+        migrations.DeleteModel(
+            name='TechnicalMaterial',
+        ),
+        migrations.DeleteModel(
+            name='VerbalMaterial',
+        ),
+    ]
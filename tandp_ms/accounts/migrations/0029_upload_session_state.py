@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0028_material'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='state',
+            field=models.CharField(choices=[('receiving', 'Receiving chunks'), ('storing', 'Storing the file'), ('done', 'Done'), ('failed', 'Failed')], default='receiving', max_length=20),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0029_upload_session_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('drive', 'Drive'), ('branch', 'Branch'), ('graduation_year', 'Graduation Year'), ('month', 'Month')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('label', models.CharField(blank=True, max_length=255)),
+                ('delta', models.IntegerField()),
+            ],
+        ),
+    ]
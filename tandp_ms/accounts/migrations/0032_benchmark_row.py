@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0031_calendar_link'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BenchmarkRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('row_id', models.BigIntegerField()),
+            ],
+            options={
+                'unique_together': {('model', 'row_id')},
+            },
+        ),
+    ]
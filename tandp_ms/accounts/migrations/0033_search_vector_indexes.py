@@ -0,0 +1,56 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Rebuild the PostgreSQL search indexes from the same SearchVector expressions
+# accounts/search.py queries with (drive_document(), title_document()), so the
+# compiled index expression and the query's always match. Copied here rather
+# than imported: a migration must keep building what it built when written.
+# Other backends are untouched (SQLite keeps its FTS5 tables).
+
+OLD_DRIVE_DOCUMENT = (
+    "to_tsvector('english', coalesce(company_name, '') || ' ' || coalesce(job_role, '') "
+    "|| ' ' || coalesce(description, ''))"
+)
+OLD_TITLE_DOCUMENT = "to_tsvector('english', title)"
+
+
+def indexes():
+    return [
+        ('PlacementDrive', GinIndex(
+            SearchVector('company_name', 'job_role', 'description', config='english'), name='placementdrive_search_gin',
+        )),
+        ('Material', GinIndex(SearchVector('title', config='english'), name='material_title_search_gin')),
+    ]
+
+
+def use_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in indexes():
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index.name}")
+        schema_editor.add_index(apps.get_model('accounts', model_name), index)
+
+
+def use_raw_documents(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index in indexes():
+        schema_editor.remove_index(apps.get_model('accounts', model_name), index)
+    schema_editor.execute(
+        f"CREATE INDEX placementdrive_search_gin ON accounts_placementdrive USING gin (({OLD_DRIVE_DOCUMENT}))"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX material_title_search_gin ON accounts_material USING gin (({OLD_TITLE_DOCUMENT}))"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0032_benchmark_row'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_search_vectors, use_raw_documents),
+    ]
@@ -1,5 +1,45 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .downloads import download_url
+
+
+# ========== Query Layer ==========
+class StaffProfileQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Staff rows for the admin dashboard, with the linked user fetched in the same query."""
+        return self.select_related('user').only(
+            'id', 'name', 'designation', 'email', 'mobile', 'role', 'user__id', 'user__is_superuser',
+        ).order_by('designation')
+
+
+class MaterialManager(models.Manager):
+    """Default manager for study materials: the uploader is always joined in."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('uploaded_by')
+
+
+class MaterialQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Newest-first rows with only the columns the listing pages display."""
+        return self.select_related('uploaded_by').only(
+            'id', 'category', 'title', 'file', 'uploaded_at', 'uploaded_by__id', 'uploaded_by__name',
+        ).order_by('-uploaded_at')
+
+    def by_uploader(self, staff_profile):
+        """Newest-first rows uploaded by ``staff_profile`` for the trainer's own pages."""
+        return self.filter(uploaded_by=staff_profile).select_related(None).only(
+            'id', 'category', 'title', 'file', 'uploaded_at', 'uploaded_by_id',
+        ).order_by('-uploaded_at')
+
+    def category_counts(self):
+        """``{'category': ..., 'total': ...}`` rows, one per category that has materials."""
+        return self.select_related(None).order_by('category').values('category').annotate(total=models.Count('id'))
+
 
 # ========== Staff Profile ==========
 class StaffProfile(models.Model):
@@ -12,12 +52,26 @@ class StaffProfile(models.Model):
     branch = models.CharField(max_length=50, blank=True, null=True)
     department = models.CharField(max_length=50, blank=True, null=True)  # added for coordinators
 
+    objects = StaffProfileQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.role})"
 
 
+# ========== Stored Files ==========
+class StoredFileModel(models.Model):
+    """Saved in a transaction, so the reference its file takes in accounts.storage commits or rolls back with it."""
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
 # ========== Student ==========
-class Student(models.Model):
+class Student(StoredFileModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
     full_name = models.CharField(max_length=100)
     roll_number = models.CharField(max_length=20, unique=True)
@@ -26,10 +80,53 @@ class Student(models.Model):
     graduation_year = models.IntegerField()
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
     department = models.CharField(max_length=50)  # auto-assigned by coordinator
+    resume_sha256 = models.CharField(max_length=64, blank=True, default='')  # of the file last indexed (accounts.resumes)
+
+    class Meta:
+        # Directory pages filter on one of these columns and page by roll_number
+        indexes = [
+            models.Index(fields=['department', 'roll_number'], name='student_dept_roll_idx'),
+            models.Index(fields=['branch', 'roll_number'], name='student_branch_roll_idx'),
+            models.Index(fields=['graduation_year', 'roll_number'], name='student_year_roll_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.roll_number})"
 
+    @property
+    def resume_url(self):
+        """Opens the resume in the browser, saved as "<roll number> Resume"."""
+        return download_url(self.resume, f'{self.roll_number} Resume', inline=True)
+
+    @property
+    def resume_download_url(self):
+        return download_url(self.resume, f'{self.roll_number} Resume')
+
+
+# ========== Resume Index ==========
+class ResumeToken(models.Model):
+    """A normalized word from a student's resume and how often it occurs."""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='resume_tokens')
+    token = models.CharField(max_length=50)
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        # shortlisting probes each registrant's tokens by (student, token)
+        unique_together = ('student', 'token')
+
+    def __str__(self):
+        return f"{self.student_id}: {self.token} x{self.count}"
+
+
+# ========== Calendar Link ==========
+class CalendarLink(models.Model):
+    """The secret in a user's calendar feed link (see accounts.upcoming); replacing it revokes old links."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='calendar_link')
+    key = models.CharField(max_length=32)
+
+    def __str__(self):
+        return f"Calendar link of {self.user_id}"
+
 
 # ========== Contact Message ==========
 class ContactMessage(models.Model):
@@ -39,6 +136,10 @@ class ContactMessage(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # The admin dashboard lists messages newest first
+        indexes = [models.Index(fields=['-created_at'], name='message_created_idx')]
+
     def __str__(self):
         return f"{self.name} - {self.subject}"
 
@@ -50,10 +151,32 @@ class PlacementDrive(models.Model):
     date = models.DateField()
     package = models.CharField(max_length=50)
     description = models.TextField()
+    capacity = models.PositiveIntegerField(blank=True, null=True)  # seat cap, empty = unlimited
+    seats_taken = models.PositiveIntegerField(default=0)  # kept in step with registrations for capped drives
+    # Eligibility criteria, blank = no restriction (see accounts.matching).
+    # Branches are stored upper-cased and comma-delimited on both ends, e.g. ",CSE,ECE,".
+    eligible_branches = models.CharField(max_length=255, blank=True, default='')
+    min_graduation_year = models.PositiveIntegerField(blank=True, null=True)
+    max_graduation_year = models.PositiveIntegerField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # ETag/Last-Modified for the JSON API
+
+    class Meta:
+        # Students only ever see upcoming drives
+        indexes = [models.Index(fields=['date'], name='drive_date_idx')]
 
     def __str__(self):
         return f"{self.company_name} - {self.job_role}"
 
+    @property
+    def branch_list(self):
+        return [branch for branch in self.eligible_branches.split(',') if branch]
+
+    @property
+    def seats_left(self):
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.seats_taken, 0)
+
 
 # ========== Registration ==========
 class Registration(models.Model):
@@ -68,33 +191,237 @@ class Registration(models.Model):
         return f"{self.student.roll_number} registered for {self.drive.company_name}"
 
 
-# ========== Verbal Material ==========
-class VerbalMaterial(models.Model):
+# ========== Study Material ==========
+def material_upload_to(instance, filename):
+    return Material.UPLOAD_DIRS[instance.category] + filename
+
+
+class Material(StoredFileModel):
+    """A verbal, aptitude or technical study material; all three live in this one table."""
+
+    VERBAL = 'verbal'
+    APTITUDE = 'aptitude'
+    TECHNICAL = 'technical'
+    CATEGORY_CHOICES = [
+        (VERBAL, 'Verbal Material'),
+        (APTITUDE, 'Aptitude Test'),
+        (TECHNICAL, 'Technical Material'),
+    ]
+    # the folders of the old per-category tables, so existing files and download rules still apply
+    UPLOAD_DIRS = {
+        VERBAL: 'verbal_materials/',
+        APTITUDE: 'aptitude_tests/',
+        TECHNICAL: 'technical_materials/',
+    }
+
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     title = models.CharField(max_length=200)
-    file = models.FileField(upload_to='verbal_materials/')
-    uploaded_by = models.ForeignKey(StaffProfile, on_delete=models.CASCADE)
+    file = models.FileField(upload_to=material_upload_to)
+    uploaded_by = models.ForeignKey(StaffProfile, on_delete=models.SET_NULL, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = MaterialManager.from_queryset(MaterialQuerySet)()
+
+    class Meta:
+        # Category pages and the per-category counts read the first index, the
+        # combined feed the second, trainers' pages only their own uploads
+        indexes = [
+            models.Index(fields=['category', '-uploaded_at'], name='material_category_idx'),
+            models.Index(fields=['-uploaded_at'], name='material_uploaded_idx'),
+            models.Index(fields=['uploaded_by', '-uploaded_at'], name='material_uploader_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @property
+    def download_url(self):
+        """Downloads the file named after the title (stored files are named by content)."""
+        return download_url(self.file, self.title)
 
-# ========== Aptitude Test ==========
-class AptitudeTest(models.Model):
-    title = models.CharField(max_length=200)
-    file = models.FileField(upload_to='aptitude_tests/')
-    uploaded_at = models.DateTimeField(auto_now_add=True)
-    uploaded_by = models.ForeignKey(StaffProfile, on_delete=models.SET_NULL, null=True)
+
+# ========== Chunked Upload Session ==========
+class UploadSession(models.Model):
+    """A chunked upload; the bytes live in a part file until the task worker stores them."""
+
+    # material uploads are keyed by the category they create
+    PURPOSE_VERBAL = Material.VERBAL
+    PURPOSE_APTITUDE = Material.APTITUDE
+    PURPOSE_TECHNICAL = Material.TECHNICAL
+    PURPOSE_RESUME = 'resume'
+    PURPOSE_CHOICES = [
+        (PURPOSE_VERBAL, 'Verbal Material'),
+        (PURPOSE_APTITUDE, 'Aptitude Test'),
+        (PURPOSE_TECHNICAL, 'Technical Material'),
+        (PURPOSE_RESUME, 'Resume'),
+    ]
+
+    STATE_RECEIVING = 'receiving'
+    STATE_STORING = 'storing'
+    STATE_DONE = 'done'
+    STATE_FAILED = 'failed'
+    STATE_CHOICES = [
+        (STATE_RECEIVING, 'Receiving chunks'),
+        (STATE_STORING, 'Storing the file'),
+        (STATE_DONE, 'Done'),
+        (STATE_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES)
+    title = models.CharField(max_length=200, blank=True)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    received_size = models.PositiveBigIntegerField(default=0)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=STATE_RECEIVING)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.title
+        return f"{self.filename} ({self.received_size}/{self.total_size})"
 
-# (Add this with your other models)
-class TechnicalMaterial(models.Model):
-    title = models.CharField(max_length=200)
-    file = models.FileField(upload_to='technical_materials/')
-    uploaded_by = models.ForeignKey(StaffProfile, on_delete=models.CASCADE)
-    uploaded_at = models.DateTimeField(auto_now_add=True)
+
+# ========== Stored Blob ==========
+class StoredBlob(models.Model):
+    """A file in the content-addressed media storage and how many rows point at it (see accounts.storage)."""
+    name = models.CharField(max_length=255, unique=True)
+    references = models.IntegerField(default=0)
+
+    class Meta:
+        # collect_blobs only ever looks for files nothing references
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(references__lte=0), name='blob_orphan_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.references} references)"
+
+
+# ========== Background Task ==========
+class Task(models.Model):
+    """A queued unit of work, run by `manage.py run_tasks` (see accounts.tasks)."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        # Workers poll for due pending tasks; finished rows pile up until purged, so
+        # the index only covers pending ones
+        indexes = [
+            models.Index(
+                fields=['run_after', 'id'], condition=models.Q(status='pending'), name='task_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+
+
+# ========== Notification ==========
+class Notification(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    drive = models.ForeignKey(PlacementDrive, on_delete=models.CASCADE)
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # one announcement per drive, so a retried batch cannot notify twice
+        unique_together = ('student', 'drive')
+        indexes = [models.Index(fields=['student', '-created_at'], name='notification_student_idx')]
+
+    def __str__(self):
+        return f"{self.student.roll_number}: {self.message}"
+
+
+# ========== Registration Analytics ==========
+class RegistrationSummary(models.Model):
+    """Precomputed registration count for one value of one dimension (see accounts.analytics)."""
+
+    DIMENSION_DRIVE = 'drive'
+    DIMENSION_BRANCH = 'branch'
+    DIMENSION_GRADUATION_YEAR = 'graduation_year'
+    DIMENSION_MONTH = 'month'
+    DIMENSION_CHOICES = [
+        (DIMENSION_DRIVE, 'Drive'),
+        (DIMENSION_BRANCH, 'Branch'),
+        (DIMENSION_GRADUATION_YEAR, 'Graduation Year'),
+        (DIMENSION_MONTH, 'Month'),
+    ]
+
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=100)  # drive id, branch, year or YYYY-MM
+    label = models.CharField(max_length=255, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('dimension', 'key')
+
+    def __str__(self):
+        return f"{self.dimension} {self.key}: {self.count}"
+
+
+class RegistrationDelta(models.Model):
+    """A change to one RegistrationSummary count not yet folded in by accounts.analytics.rollup()."""
+
+    dimension = models.CharField(max_length=20, choices=RegistrationSummary.DIMENSION_CHOICES)
+    key = models.CharField(max_length=100)
+    label = models.CharField(max_length=255, blank=True)
+    delta = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.dimension} {self.key}: {self.delta:+d}"
+
+
+# ========== Request Profiling ==========
+class RequestProfile(models.Model):
+    """Timing of one request, flushed in batches by accounts.profiling.ProfilingMiddleware."""
+
+    url_name = models.CharField(max_length=100)
+    method = models.CharField(max_length=10)
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    queries = models.PositiveIntegerField()
+    db_ms = models.FloatField()
+    template_ms = models.FloatField()
+    response_size = models.PositiveIntegerField()
+    recorded_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.method} {self.url_name} {self.duration_ms:.1f}ms"
+
+
+# ========== Benchmark Dataset ==========
+class BenchmarkRow(models.Model):
+    """A row created by accounts.benchmarks.seed(), so clearing the dataset deletes exactly those rows."""
+
+    model = models.CharField(max_length=100)  # app_label.ModelName
+    row_id = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ('model', 'row_id')
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.model} {self.row_id}"
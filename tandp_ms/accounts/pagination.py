@@ -0,0 +1,71 @@
+from urllib.parse import urlencode
+
+STUDENT_PAGE_SIZE = 50
+
+
+# ========== Keyset Page ==========
+class KeysetPage:
+    """One page of a keyset (cursor) paginated queryset.
+
+    The cursor is the value of the ordering key of the first/last row, so
+    fetching any page is a single indexed range scan instead of an OFFSET.
+    """
+
+    def __init__(self, object_list, query_params, key, has_next, has_previous):
+        self.object_list = object_list
+        self.key = key
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self._query_params = query_params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _query_string(self, **cursor):
+        params = {k: v for k, v in self._query_params.items() if k not in ('after', 'before') and v}
+        params.update(cursor)
+        return urlencode(params)
+
+    @property
+    def next_query(self):
+        if not self.has_next or not self.object_list:
+            return ''
+        return self._query_string(after=getattr(self.object_list[-1], self.key))
+
+    @property
+    def previous_query(self):
+        if not self.has_previous:
+            return ''
+        if not self.object_list:
+            # a cursor past the end (a stale or edited link): start over
+            return self._query_string()
+        return self._query_string(before=getattr(self.object_list[0], self.key))
+
+
+def keyset_paginate(queryset, request, key='roll_number', per_page=STUDENT_PAGE_SIZE):
+    """Return a KeysetPage of ``queryset`` ordered by the unique column ``key``.
+
+    ``?after=<value>`` moves forward and ``?before=<value>`` moves backward;
+    one extra row is fetched to know whether another page exists.
+    """
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    query_params = request.GET.dict()
+
+    if before:
+        rows = list(queryset.filter(**{f'{key}__lt': before}).order_by(f'-{key}')[:per_page + 1])
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page]
+        rows.reverse()
+        # rows before the cursor mean the cursor's own row (or a later one) follows them
+        return KeysetPage(rows, query_params, key, has_next=bool(rows), has_previous=has_previous)
+
+    queryset = queryset.order_by(key)
+    if after:
+        queryset = queryset.filter(**{f'{key}__gt': after})
+    rows = list(queryset[:per_page + 1])
+    has_next = len(rows) > per_page
+    return KeysetPage(rows[:per_page], query_params, key, has_next=has_next, has_previous=bool(after))
@@ -0,0 +1,203 @@
+import datetime
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+from django.utils import timezone
+
+from .models import RequestProfile
+
+# Per-request timings (wall time, query count, DB time, template time,
+# response size) collected by ProfilingMiddleware into a per-process ring
+# buffer and flushed to RequestProfile in one INSERT every
+# PROFILING_FLUSH_INTERVAL seconds, from a background thread so no request
+# waits for it. Template time comes from the ProfiledTemplates backend,
+# which settings.py selects when profiling is on. With ACCOUNTS_PROFILING
+# off the middleware removes itself at startup, so it costs nothing.
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = getattr(settings, 'PROFILING_BUFFER_SIZE', 5000)
+FLUSH_INTERVAL = getattr(settings, 'PROFILING_FLUSH_INTERVAL', 60)
+PERCENTILES = (50, 95, 99)
+UNRESOLVED = '<unresolved>'
+
+_buffer = deque(maxlen=BUFFER_SIZE)
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_flusher = None
+_current = ContextVar('accounts_profiling_sample', default=None)
+
+
+class Sample:
+    __slots__ = ('queries', 'db_ms', 'template_ms')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+
+
+# ========== Template Timing ==========
+class ProfiledTemplate:
+    """A backend template whose render() adds its time to the current request's sample."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            sample.template_ms += (time.perf_counter() - start) * 1000
+
+
+class ProfiledTemplates(DjangoTemplates):
+    """DjangoTemplates handing out ProfiledTemplate; use it as the TEMPLATES backend while profiling."""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name))
+
+
+def _response_size(response):
+    if response.streaming:
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+# ========== Buffer ==========
+def record(row):
+    global _last_flush, _flusher
+    with _lock:
+        _buffer.append(row)
+        if time.monotonic() - _last_flush >= FLUSH_INTERVAL and not (_flusher and _flusher.is_alive()):
+            _last_flush = time.monotonic()
+            _flusher = threading.Thread(target=_flush_in_background, name='profiling-flush', daemon=True)
+            _flusher.start()
+
+
+def _flush_in_background():
+    try:
+        flush()
+    finally:
+        # the thread's own connection
+        connection.close()
+
+
+def flush():
+    """Write buffered samples to RequestProfile; returns how many were written."""
+    with _lock:
+        rows = list(_buffer)
+        _buffer.clear()
+    if not rows:
+        return 0
+    try:
+        RequestProfile.objects.bulk_create(rows)
+    except Exception:
+        # profiling must never break a request
+        logger.exception("Could not flush %d request profiles", len(rows))
+        return 0
+    logger.info("Flushed %d request profiles", len(rows))
+    return len(rows)
+
+
+# ========== Middleware ==========
+class ProfilingMiddleware:
+    """Time every request when ACCOUNTS_PROFILING is on; put it first in MIDDLEWARE."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'ACCOUNTS_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = Sample()
+        token = _current.set(sample)
+
+        def count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sample.queries += 1
+                sample.db_ms += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(count_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        record(RequestProfile(
+            url_name=(match.view_name if match else UNRESOLVED)[:100],
+            method=request.method,
+            status=response.status_code,
+            duration_ms=duration_ms,
+            queries=sample.queries,
+            db_ms=sample.db_ms,
+            template_ms=sample.template_ms,
+            response_size=_response_size(response),
+            recorded_at=timezone.now(),
+        ))
+        return response
+
+
+# ========== Reports ==========
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def report(hours=24):
+    """Per-URL-name latency percentiles over the last ``hours``, slowest p95 first."""
+    since = timezone.now() - datetime.timedelta(hours=hours)
+    samples = {}
+    rows = RequestProfile.objects.filter(recorded_at__gte=since).values_list(
+        'url_name', 'duration_ms', 'queries', 'db_ms', 'template_ms', 'response_size',
+    )
+    for url_name, *values in rows.iterator(chunk_size=5000):
+        samples.setdefault(url_name, []).append(values)
+
+    lines = []
+    for url_name, values in samples.items():
+        durations, queries, db_ms, template_ms, sizes = (sorted(column) for column in zip(*values))
+        line = {'url_name': url_name, 'requests': len(values)}
+        for pct in PERCENTILES:
+            line[f'p{pct}_ms'] = round(percentile(durations, pct), 1)
+        line.update({
+            'p95_queries': percentile(queries, 95),
+            'p95_db_ms': round(percentile(db_ms, 95), 1),
+            'p95_template_ms': round(percentile(template_ms, 95), 1),
+            'avg_size': int(sum(sizes) / len(sizes)),
+        })
+        lines.append(line)
+    lines.sort(key=lambda line: -line['p95_ms'])
+    return lines
+
+
+def purge(days):
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    return RequestProfile.objects.filter(recorded_at__lt=cutoff).delete()[0]
@@ -0,0 +1,87 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, QuerySet, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .matching import is_eligible
+from .models import PlacementDrive, Registration
+
+REGISTERED = 'registered'
+ALREADY_REGISTERED = 'already_registered'
+DRIVE_FULL = 'drive_full'
+NOT_ELIGIBLE = 'not_eligible'
+
+
+class DriveFull(Exception):
+    pass
+
+
+def register(student, drive):
+    """Register ``student`` for ``drive`` and return one of the result constants above.
+
+    Eligibility is checked in memory against the loaded drive, so ``drive``
+    must include its date and criteria columns.
+
+    The insert itself is the duplicate check: the (student, drive) unique
+    constraint rejects a second registration, so there is no exists() query
+    to race against. Other integrity errors (the student or drive deleted
+    meanwhile) are raised; only when the registration is there is it reported
+    as a duplicate. For capped drives a seat is then claimed with a
+    conditional ``UPDATE ... WHERE seats_taken < capacity``, which locks the
+    drive row, and the whole thing rolls back if no seat was left.
+    """
+    if not is_eligible(student, drive):
+        return NOT_ELIGIBLE
+    try:
+        with transaction.atomic():
+            Registration.objects.create(student=student, drive=drive)
+            if drive.capacity is not None:
+                claimed = PlacementDrive.objects.filter(
+                    id=drive.id, seats_taken__lt=F('capacity'),
+                ).update(seats_taken=F('seats_taken') + 1, updated_at=timezone.now())
+                if not claimed:
+                    raise DriveFull
+    except IntegrityError:
+        # once the unique constraint has fired the other registration is committed
+        if Registration.objects.filter(student=student, drive=drive).exists():
+            return ALREADY_REGISTERED
+        raise
+    except DriveFull:
+        return DRIVE_FULL
+    return REGISTERED
+
+
+def sync_seats_taken(drive):
+    """Recount a capped drive's seats, e.g. after a cap is added to a drive with registrations."""
+    PlacementDrive.objects.filter(id=drive.id).update(
+        seats_taken=Registration.objects.filter(drive=drive).count(), updated_at=timezone.now(),
+    )
+
+
+def seat_released(registration, origin):
+    """Note the seat ``registration`` held, given back with the rest of the delete ``origin`` started by seats_released()."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if model is PlacementDrive:
+        return  # the drive goes with it
+    released = getattr(origin, '_released_seats', None)
+    if released is None:
+        released = origin._released_seats = Counter()
+    released[registration.drive_id] += 1
+
+
+def seats_released(origin):
+    """Give back the seats noted for ``origin``'s delete, in one UPDATE whatever the number of drives."""
+    released = getattr(origin, '_released_seats', None)
+    if released is None:
+        return
+    del origin._released_seats
+    # The seat UPDATEs bypass signals and leave the cached drive listings alone:
+    # only upcoming.available_to() shows seats, and it reads them fresh
+    PlacementDrive.objects.filter(id__in=released, capacity__isnull=False, seats_taken__gt=0).update(
+        seats_taken=Greatest(
+            F('seats_taken') - Case(*(When(id=drive_id, then=count) for drive_id, count in released.items())), 0,
+        ),
+        updated_at=timezone.now(),
+    )
@@ -0,0 +1,140 @@
+import hashlib
+import io
+import logging
+import re
+import zipfile
+from collections import Counter
+from pathlib import Path
+from xml.etree import ElementTree
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from . import storage
+from .models import ResumeToken, Student
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional: without it PDF resumes are left unindexed
+    PdfReader = None
+
+# Resume text is extracted once per file by the INDEX_RESUME task (queued
+# when a resume is uploaded or changed) and stored as ResumeToken rows: one
+# per distinct normalized word, with its count. The file's SHA-256 is kept
+# on the student, so re-saving the same file does not extract it again.
+# shortlist() ranks a drive's registrants against a set of skills in one
+# query over the (student, token) unique index.
+
+logger = logging.getLogger(__name__)
+
+MAX_TOKEN_LENGTH = 50
+MAX_KEYWORDS = 20
+# keeps "c++", "c#", "node.js" and "asp.net" whole
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it of on or that the to was were will with'.split()
+)
+DOCX_TEXT = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t'
+
+
+class UnsupportedResume(Exception):
+    pass
+
+
+# ========== Extraction ==========
+def file_digest(fieldfile):
+    stored = storage.content_digest(fieldfile.name)
+    if stored:
+        return stored
+    digest = hashlib.sha256()
+    with fieldfile.open('rb'):
+        for chunk in fieldfile.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_text(fieldfile):
+    """Plain text of a PDF, DOCX or TXT resume."""
+    extension = Path(fieldfile.name).suffix.lower()
+    with fieldfile.open('rb'):
+        data = fieldfile.read()
+    if extension == '.txt':
+        return data.decode('utf-8', errors='replace')
+    if extension == '.docx':
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as document:
+                root = ElementTree.fromstring(document.read('word/document.xml'))
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as error:
+            raise UnsupportedResume(f"Unreadable DOCX: {error}")
+        return ' '.join(node.text or '' for node in root.iter(DOCX_TEXT))
+    if extension == '.pdf':
+        if PdfReader is None:
+            raise UnsupportedResume("pypdf is not installed")
+        try:
+            return '\n'.join(page.extract_text() or '' for page in PdfReader(io.BytesIO(data)).pages)
+        except Exception as error:  # pypdf raises many types for damaged files
+            raise UnsupportedResume(f"Unreadable PDF: {error}")
+    raise UnsupportedResume(f"No text extractor for {extension or 'files without an extension'}")
+
+
+def tokenize(text):
+    """Counter of normalized words in ``text``."""
+    tokens = (token.rstrip('.') for token in TOKEN_RE.findall(text.lower()))
+    return Counter(
+        token for token in tokens if token and token not in STOPWORDS and len(token) <= MAX_TOKEN_LENGTH
+    )
+
+
+def index_resume(student_id):
+    """Rebuild the student's tokens if their resume file changed since it was last indexed."""
+    student = Student.objects.filter(id=student_id).only('id', 'resume', 'resume_sha256').first()
+    if student is None:
+        return
+    if not student.resume:
+        with transaction.atomic():
+            ResumeToken.objects.filter(student=student).delete()
+            Student.objects.filter(id=student.id).update(resume_sha256='')
+        return
+
+    digest = file_digest(student.resume)
+    if digest == student.resume_sha256:
+        return
+    try:
+        counts = tokenize(extract_text(student.resume))
+    except UnsupportedResume as error:
+        # left without a hash, so `manage.py index_resumes` retries it later
+        logger.warning("Resume of student %s not indexed: %s", student.id, error)
+        return
+    with transaction.atomic():
+        ResumeToken.objects.filter(student=student).delete()
+        ResumeToken.objects.bulk_create(
+            [ResumeToken(student=student, token=token, count=count) for token, count in counts.items()],
+            batch_size=1000,
+        )
+        Student.objects.filter(id=student.id).update(resume_sha256=digest)
+
+
+# ========== Shortlisting ==========
+def parse_keywords(text):
+    """Distinct normalized keywords from input such as ``'Python, SQL, C++'``."""
+    return sorted(tokenize(text or ''))[:MAX_KEYWORDS]
+
+
+def shortlist(drive, keywords):
+    """The drive's registrants, most keywords matched first, then most mentions.
+
+    Each row carries ``matched`` (distinct keywords found) and ``mentions``.
+    """
+    registrants = Student.objects.filter(registration__drive=drive)
+    if not keywords:
+        return registrants.annotate(matched=Value(0), mentions=Value(0)).order_by('roll_number')
+    found = Q(resume_tokens__token__in=keywords)
+    return (
+        registrants
+        .annotate(
+            matched=Count('resume_tokens', filter=found),
+            mentions=Coalesce(Sum('resume_tokens__count', filter=found), 0),
+        )
+        .order_by('-matched', '-mentions', 'roll_number')
+    )
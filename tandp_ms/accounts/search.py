@@ -0,0 +1,183 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Q
+
+from .models import Material, PlacementDrive
+
+# Full-text search over drives and material titles.
+#
+# PostgreSQL: GIN expression indexes built from drive_document() and
+# title_document() (migration 0033); the queries use the same SearchVector
+# expressions so the planner can use them, and rank with SearchRank.
+# SQLite: FTS5 tables (created in 0019, keyed by row id) that the
+# receivers in signals.py keep in step with the models; ranked with bm25.
+# `manage.py rebuild_search_index` refills the FTS5 tables from scratch.
+# Other backends fall back to unranked icontains matching.
+
+SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE = 50
+
+DRIVE_FTS_TABLE = 'accounts_placementdrive_fts'
+MATERIAL_FTS_TABLE = 'accounts_material_fts'
+
+SEARCH_CONFIG = 'english'
+
+
+def uses_fts5():
+    return connection.vendor == 'sqlite'
+
+
+def uses_tsvector():
+    return connection.vendor == 'postgresql'
+
+
+def fts5_query(text):
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix."""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return ''
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+# ========== Queries ==========
+def drive_document():
+    # migration 0033 indexes this exact expression; change both together
+    return SearchVector('company_name', 'job_role', 'description', config=SEARCH_CONFIG)
+
+
+def title_document():
+    return SearchVector('title', config=SEARCH_CONFIG)
+
+
+def _ranked(queryset, document, text):
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset.annotate(document=document).filter(document=query)
+        .annotate(rank=SearchRank(document, query)).order_by('-rank', 'id')
+    )
+
+
+def ranked_drives(text):
+    """Drives matching ``text``, most relevant first (PostgreSQL only)."""
+    return _ranked(PlacementDrive.objects.all(), drive_document(), text)
+
+
+def ranked_materials(text):
+    """Materials whose title matches ``text``, most relevant first (PostgreSQL only)."""
+    return _ranked(Material.objects.all(), title_document(), text)
+
+
+def _page_bounds(page):
+    """LIMIT/OFFSET for ``page``; one extra row tells whether a next page exists."""
+    page = min(max(page, 1), MAX_SEARCH_PAGE)
+    return SEARCH_PAGE_SIZE + 1, (page - 1) * SEARCH_PAGE_SIZE
+
+
+def _drive_ids(text, limit, offset):
+    if uses_tsvector():
+        return list(ranked_drives(text).values_list('id', flat=True)[offset:offset + limit])
+    if not uses_fts5():
+        matches = PlacementDrive.objects.filter(
+            Q(company_name__icontains=text) | Q(job_role__icontains=text) | Q(description__icontains=text)
+        )
+        return list(matches.order_by('-date').values_list('id', flat=True)[offset:offset + limit])
+    query = fts5_query(text)
+    if not query:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {DRIVE_FTS_TABLE} WHERE {DRIVE_FTS_TABLE} MATCH %s "
+            f"ORDER BY rank LIMIT %s OFFSET %s",
+            [query, limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _material_ids(text, limit, offset):
+    if uses_tsvector():
+        return list(ranked_materials(text).values_list('id', flat=True)[offset:offset + limit])
+    if not uses_fts5():
+        matches = Material.objects.filter(title__icontains=text)
+        return list(matches.order_by('-uploaded_at').values_list('id', flat=True)[offset:offset + limit])
+    query = fts5_query(text)
+    if not query:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {MATERIAL_FTS_TABLE} WHERE {MATERIAL_FTS_TABLE} MATCH %s "
+            f"ORDER BY rank LIMIT %s OFFSET %s",
+            [query, limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_drives(text, page=1):
+    """Return ``(drives, has_next)`` for one page of drives ranked by relevance to ``text``."""
+    limit, offset = _page_bounds(page)
+    ids = _drive_ids(text, limit, offset)
+    drives = PlacementDrive.objects.in_bulk(ids[:SEARCH_PAGE_SIZE])
+    return [drives[i] for i in ids[:SEARCH_PAGE_SIZE] if i in drives], len(ids) > SEARCH_PAGE_SIZE
+
+
+def search_materials(text, page=1):
+    """Return ``(materials, has_next)`` for one page of materials ranked by relevance to ``text``."""
+    limit, offset = _page_bounds(page)
+    ids = _material_ids(text, limit, offset)
+    materials = Material.objects.for_listing().in_bulk(ids[:SEARCH_PAGE_SIZE])
+    return [materials[i] for i in ids[:SEARCH_PAGE_SIZE] if i in materials], len(ids) > SEARCH_PAGE_SIZE
+
+
+# ========== FTS5 Sync ==========
+def index_drive(drive):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DRIVE_FTS_TABLE} WHERE rowid = %s", [drive.id])
+        cursor.execute(
+            f"INSERT INTO {DRIVE_FTS_TABLE} (rowid, company_name, job_role, description) VALUES (%s, %s, %s, %s)",
+            [drive.id, drive.company_name, drive.job_role, drive.description],
+        )
+
+
+def unindex_drive(drive_id):
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {DRIVE_FTS_TABLE} WHERE rowid = %s", [drive_id])
+
+
+def index_material(material):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {MATERIAL_FTS_TABLE} WHERE rowid = %s", [material.id])
+        cursor.execute(
+            f"INSERT INTO {MATERIAL_FTS_TABLE} (rowid, title, kind, material_id) VALUES (%s, %s, %s, %s)",
+            [material.id, material.title, material.category, material.id],
+        )
+
+
+def unindex_material(material_id):
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {MATERIAL_FTS_TABLE} WHERE rowid = %s", [material_id])
+
+
+def rebuild_index():
+    """Refill the FTS5 tables from the model tables (no-op on PostgreSQL)."""
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DRIVE_FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {DRIVE_FTS_TABLE} (rowid, company_name, job_role, description) "
+            f"SELECT id, company_name, job_role, description FROM {PlacementDrive._meta.db_table}"
+        )
+        cursor.execute(f"DELETE FROM {MATERIAL_FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {MATERIAL_FTS_TABLE} (rowid, title, kind, material_id) "
+            f"SELECT id, title, category, id FROM {Material._meta.db_table}"
+        )
@@ -1,9 +1,188 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import StaffProfile
+from . import analytics, counters, fragments, registrations, search, storage
+from .middleware import invalidate_role
+from .models import (
+    ContactMessage,
+    Material,
+    PlacementDrive,
+    Registration,
+    StaffProfile,
+    Student,
+)
+
+
+# ========== Dashboard Counters ==========
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust(counters.TOTAL_STUDENTS, 1)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    counters.adjust(counters.TOTAL_STUDENTS, -1)
+
+
+@receiver(post_save, sender=ContactMessage)
+def message_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust(counters.TOTAL_MESSAGES, 1)
+
+
+@receiver(post_delete, sender=ContactMessage)
+def message_deleted(sender, instance, **kwargs):
+    counters.adjust(counters.TOTAL_MESSAGES, -1)
+
+
+# Upcoming drives are counted from the feed in accounts.upcoming, which
+# listing_changed() below invalidates.
+@receiver(post_save, sender=PlacementDrive)
+def drive_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.adjust(counters.TOTAL_DRIVES, 1)
+
+
+@receiver(post_delete, sender=PlacementDrive)
+def drive_deleted(sender, instance, **kwargs):
+    counters.adjust(counters.TOTAL_DRIVES, -1)
+
+
+# ========== Drive Seats ==========
+# Like the analytics below, a cascade is collected per row and written once:
+# deleting a student releases all their seats in a single UPDATE.
+@receiver(pre_delete, sender=Registration)
+def registration_deleting(sender, instance, origin=None, **kwargs):
+    registrations.seat_released(instance, origin or instance)
+
+
+@receiver(post_delete, sender=Registration)
+def registration_deleted(sender, instance, origin=None, **kwargs):
+    registrations.seats_released(origin or instance)
+
+
+# ========== Cached Request Roles ==========
+@receiver(post_save, sender=StaffProfile)
+@receiver(post_delete, sender=StaffProfile)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_role(instance.user_id)
+
 
 @receiver(post_save, sender=User)
-def create_staff_profile(sender, instance, created, **kwargs):
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_role(instance.pk)
+
+
+# ========== Cached Listings ==========
+LISTING_FRAGMENTS = {
+    PlacementDrive: (fragments.DRIVES,),
+    # listings show the uploader's name
+    StaffProfile: fragments.MATERIAL_FRAGMENTS,
+}
+
+
+@receiver(post_save, sender=PlacementDrive)
+@receiver(post_delete, sender=PlacementDrive)
+@receiver(post_save, sender=StaffProfile)
+@receiver(post_delete, sender=StaffProfile)
+def listing_changed(sender, **kwargs):
+    fragments.bump(*LISTING_FRAGMENTS[sender])
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+def material_listing_changed(sender, instance, **kwargs):
+    fragments.bump(fragments.CATEGORY_FRAGMENTS[instance.category], fragments.ALL_MATERIALS)
+
+
+# ========== Search Index ==========
+@receiver(post_save, sender=PlacementDrive)
+def drive_indexed(sender, instance, **kwargs):
+    search.index_drive(instance)
+
+
+@receiver(post_delete, sender=PlacementDrive)
+def drive_unindexed(sender, instance, **kwargs):
+    search.unindex_drive(instance.id)
+
+
+@receiver(post_save, sender=Material)
+def material_indexed(sender, instance, **kwargs):
+    search.index_material(instance)
+
+
+@receiver(post_delete, sender=Material)
+def material_unindexed(sender, instance, **kwargs):
+    search.unindex_material(instance.id)
+
+
+# ========== Registration Analytics ==========
+@receiver(post_save, sender=Registration)
+def registration_counted(sender, instance, created, **kwargs):
     if created:
-        StaffProfile.objects.create(user=instance, name=instance.username)
+        analytics.registration_added(instance)
+
+
+# pre_delete, so a cascading student delete can still read the student's branch;
+# every pre_delete of a delete is sent before its first post_delete
+@receiver(pre_delete, sender=Registration)
+def registration_uncounted(sender, instance, origin=None, **kwargs):
+    analytics.registration_removed(instance, origin or instance)
+
+
+@receiver(post_delete, sender=Registration)
+def registration_uncounted_saved(sender, instance, origin=None, **kwargs):
+    analytics.removals_done(origin or instance)
+
+
+@receiver(pre_save, sender=Student)
+def student_regrouped(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and not {'branch', 'graduation_year'} & set(update_fields)):
+        return
+    old = Student.objects.filter(pk=instance.pk).values('branch', 'graduation_year').first()
+    if old and (old['branch'], old['graduation_year']) != (instance.branch, instance.graduation_year):
+        analytics.student_moved(instance, old['branch'], old['graduation_year'])
+
+
+@receiver(post_save, sender=PlacementDrive)
+def drive_relabelled(sender, instance, created, **kwargs):
+    if not created:
+        analytics.drive_renamed(instance)
+
+
+@receiver(post_delete, sender=PlacementDrive)
+def drive_summary_removed(sender, instance, **kwargs):
+    analytics.drive_removed(instance.id)
+
+
+# ========== Stored Files ==========
+# Every row holds one reference to its file (see accounts.storage); these
+# give it back when the row is deleted or its resume replaced.
+@receiver(post_delete, sender=Material)
+def material_file_released(sender, instance, **kwargs):
+    storage.release(instance.file.name)
+
+
+@receiver(post_delete, sender=Student)
+def resume_released(sender, instance, **kwargs):
+    storage.release(instance.resume.name)
+
+
+@receiver(pre_save, sender=Student)
+def resume_replacing(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding or (update_fields is not None and 'resume' not in update_fields):
+        return
+    old = Student.objects.filter(pk=instance.pk).values_list('resume', flat=True).first()
+    new = instance.resume
+    # an uncommitted upload is a new reference even if its content (and so its name) is unchanged
+    if old and (not new or not new._committed or new.name != old):
+        instance._replaced_resume = old
+
+
+@receiver(post_save, sender=Student)
+def resume_replaced(sender, instance, **kwargs):
+    storage.release(instance.__dict__.pop('_replaced_resume', None))
@@ -0,0 +1,128 @@
+/*
+ * Chunked, resumable uploads for forms marked with data-chunked-upload="<purpose>".
+ * The file is sent in UPLOAD_CHUNK_SIZE pieces; an interrupted upload of the
+ * same file resumes from the last chunk the server acknowledged.
+ * Without JavaScript the form falls back to a normal multipart POST.
+ */
+(function () {
+    var RETRIES = 5;
+    var POLL_INTERVAL = 1000;
+
+    function post(url, body, headers) {
+        return fetch(url, {method: 'POST', body: body, headers: headers, credentials: 'same-origin'})
+            .then(function (response) {
+                return response.json().then(function (data) {
+                    if (!response.ok) {
+                        var error = new Error(data.error || response.statusText);
+                        error.status = response.status;
+                        throw error;
+                    }
+                    return data;
+                });
+            });
+    }
+
+    function storageKey(purpose, file) {
+        return 'chunked-upload:' + purpose + ':' + file.name + ':' + file.size + ':' + file.lastModified;
+    }
+
+    function resumeOrStart(form, purpose, file, csrf) {
+        var key = storageKey(purpose, file);
+        var saved = window.localStorage.getItem(key);
+        var start = function () {
+            var data = new FormData();
+            data.append('purpose', purpose);
+            data.append('filename', file.name);
+            data.append('size', file.size);
+            var title = form.querySelector('[name="title"]');
+            if (title) {
+                data.append('title', title.value);
+            }
+            return post(form.dataset.startUrl, data, {'X-CSRFToken': csrf}).then(function (state) {
+                window.localStorage.setItem(key, state.upload_id);
+                return state;
+            });
+        };
+        if (!saved) {
+            return start();
+        }
+        return fetch(form.dataset.chunkUrl.replace('00000000-0000-0000-0000-000000000000', saved), {credentials: 'same-origin'})
+            .then(function (response) { return response.ok ? response.json() : null; })
+            .then(function (state) { return state && state.state !== 'failed' ? state : start(); });
+    }
+
+    // After the last chunk the server stores the file in the background; poll until it is done.
+    function waitUntilStored(url, state) {
+        if (state.state === 'done') {
+            return Promise.resolve(state);
+        }
+        if (state.state === 'failed') {
+            var error = new Error(state.error);
+            error.restart = true;
+            return Promise.reject(error);
+        }
+        return new Promise(function (resolve) { setTimeout(resolve, POLL_INTERVAL); })
+            .then(function () { return fetch(url, {credentials: 'same-origin'}); })
+            .then(function (response) { return response.json(); })
+            .then(function (status) { return waitUntilStored(url, status); });
+    }
+
+    function sendChunks(form, file, state, csrf, progress) {
+        var url = form.dataset.chunkUrl.replace('00000000-0000-0000-0000-000000000000', state.upload_id);
+        var attempt = 0;
+        var next = function (offset) {
+            if (offset >= file.size) {
+                return Promise.resolve(state);
+            }
+            var chunk = file.slice(offset, offset + state.chunk_size);
+            return post(url, chunk, {'X-CSRFToken': csrf, 'X-Upload-Offset': offset, 'Content-Type': 'application/octet-stream'})
+                .then(function (result) {
+                    attempt = 0;
+                    state = result;
+                    progress.textContent = Math.floor(100 * result.offset / file.size) + '%';
+                    return result.state !== 'receiving' ? result : next(result.offset);
+                })
+                .catch(function (error) {
+                    if ((error.status && error.status !== 409) || ++attempt > RETRIES) {
+                        throw error;
+                    }
+                    // Ask the server where it got to, then continue after a backoff.
+                    return new Promise(function (resolve) { setTimeout(resolve, 1000 * attempt); })
+                        .then(function () { return fetch(url, {credentials: 'same-origin'}); })
+                        .then(function (response) { return response.json(); })
+                        .then(function (status) { return next(status.offset); });
+                });
+        };
+        return next(state.offset).then(function (result) { return waitUntilStored(url, result); });
+    }
+
+    document.querySelectorAll('form[data-chunked-upload]').forEach(function (form) {
+        form.addEventListener('submit', function (event) {
+            var input = form.querySelector('input[type="file"]');
+            if (!window.fetch || !input.files.length) {
+                return;
+            }
+            event.preventDefault();
+            var file = input.files[0];
+            var purpose = form.dataset.chunkedUpload;
+            var csrf = form.querySelector('[name="csrfmiddlewaretoken"]').value;
+            var progress = form.querySelector('.upload-progress');
+            form.querySelector('button[type="submit"]').disabled = true;
+
+            resumeOrStart(form, purpose, file, csrf)
+                .then(function (state) { return sendChunks(form, file, state, csrf, progress); })
+                .then(function (result) {
+                    window.localStorage.removeItem(storageKey(purpose, file));
+                    window.location = result.redirect;
+                })
+                .catch(function (error) {
+                    if (error.restart) {
+                        // storing failed, so the next attempt uploads the file again
+                        window.localStorage.removeItem(storageKey(purpose, file));
+                    }
+                    progress.textContent = 'Upload failed: ' + error.message + ' Submit again to resume.';
+                    form.querySelector('button[type="submit"]').disabled = false;
+                });
+        });
+    });
+})();
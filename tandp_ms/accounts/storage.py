@@ -0,0 +1,149 @@
+import hashlib
+import os
+import posixpath
+import re
+import time
+import uuid
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .downloads import INCOMING_DIR
+from .models import StoredBlob
+
+# Uploaded media is stored under the SHA-256 of its content, inside the
+# folder its field uploads to: "aptitude_tests/3f/3fa8…c1.pdf". The folder
+# is kept so media downloads can still be authorised by path
+# (accounts.downloads), and the same file uploaded again — a handout shared
+# by trainers, a resume re-submitted unchanged — is stored once.
+#
+# Each save adds a reference in StoredBlob and delete() drops one, so
+# deleting a row is a single UPDATE and never touches the disk; a file whose
+# count reaches zero stays until `manage.py collect_blobs` removes it. Both
+# happen in the owning row's transaction (models.StoredFileModel and the
+# post_delete receivers), so a save that fails leaves no reference behind.
+
+HASH_CHUNK_SIZE = 64 * 1024
+CONTENT_NAME_RE = re.compile(r'(?:^|/)[0-9a-f]{2}/([0-9a-f]{64})(?:\.[^/]*)?$')
+
+
+def content_digest(name):
+    """SHA-256 of a content-addressed file, read from its name; None for files saved before this storage."""
+    match = CONTENT_NAME_RE.search(name or '')
+    return match.group(1) if match else None
+
+
+def _add_reference(name):
+    if StoredBlob.objects.filter(name=name).update(references=F('references') + 1):
+        return
+    try:
+        with transaction.atomic():
+            StoredBlob.objects.create(name=name, references=1)
+    except IntegrityError:  # the same content was saved concurrently
+        StoredBlob.objects.filter(name=name).update(references=F('references') + 1)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        # _save() names the file after its content, so an existing name is a duplicate, not a clash
+        return name
+
+    def _save(self, name, content):
+        # spooled under MEDIA_ROOT, so the finished file is moved in place with a rename
+        incoming = os.path.join(self.location, INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+        spool = os.path.join(incoming, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        # hashed while it is copied, one chunk at a time
+        fd = os.open(spool, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            hexdigest = digest.hexdigest()
+            folder, extension = posixpath.dirname(name), posixpath.splitext(name)[1].lower()
+            name = posixpath.join(folder, hexdigest[:2], hexdigest + extension)
+            # Count the reference before checking for the file: collect_blobs deletes a file
+            # only together with its unreferenced row, so the file can't vanish after this.
+            _add_reference(name)
+            path = self.path(name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(spool, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        finally:
+            if os.path.exists(spool):
+                os.remove(spool)
+        return name
+
+    def delete(self, name):
+        """Drop one reference to ``name``; the file itself is removed by collect_garbage()."""
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        if not StoredBlob.objects.filter(name=name).update(references=F('references') - 1):
+            # saved before this storage, so this row was its only owner
+            StoredBlob.objects.get_or_create(name=name, defaults={'references': 0})
+
+    def purge(self, name):
+        """Remove the file from disk; returns the bytes freed."""
+        try:
+            size = os.path.getsize(self.path(name))
+        except FileNotFoundError:
+            return 0
+        super().delete(name)
+        return size
+
+    def clear_incoming(self, max_age):
+        """Remove spool files left by interrupted saves, older than ``max_age`` seconds."""
+        incoming = os.path.join(self.location, INCOMING_DIR)
+        cutoff, removed = time.time() - max_age, 0
+        try:
+            entries = list(os.scandir(incoming))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+
+def release(name):
+    """Give up a row's reference to a stored file."""
+    if name:
+        default_storage.delete(name)
+
+
+# ========== Garbage Collection ==========
+GC_BATCH_SIZE = 500
+
+
+def collect_garbage(storage=None):
+    """Delete the files no row references any more; returns ``(files, bytes)`` freed.
+
+    A row is deleted only if it is still unreferenced, in the same
+    transaction as its file, so a concurrent upload of the same content
+    either keeps it alive or finds the file gone and writes it again.
+    """
+    storage = storage or default_storage
+    files = freed = 0
+    last_id = 0
+    while True:
+        orphans = list(
+            StoredBlob.objects.filter(references__lte=0, id__gt=last_id)
+            .order_by('id').values_list('id', 'name')[:GC_BATCH_SIZE]
+        )
+        if not orphans:
+            return files, freed
+        for blob_id, name in orphans:
+            with transaction.atomic():
+                if StoredBlob.objects.filter(id=blob_id, references__lte=0).delete()[0]:
+                    freed += storage.purge(name)
+                    files += 1
+        last_id = orphans[-1][0]
@@ -0,0 +1,136 @@
+import datetime
+import traceback
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+# A database-backed job queue: views enqueue Task rows, `manage.py run_tasks`
+# claims and runs them. Claiming is a conditional UPDATE (plus SKIP LOCKED
+# where the database has it), so any number of workers can poll the same
+# table without running a task twice.
+
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 30  # seconds before the first retry, doubled on each later one
+RETRY_MAX_DELAY = 60 * 60
+# A task still "running" after this long belongs to a worker that died.
+TASK_LOCK_TIMEOUT = getattr(settings, 'TASK_LOCK_TIMEOUT', 15 * 60)
+MAX_ERROR_LENGTH = 4000
+
+TASKS = {}
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+def task(name, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Register the decorated function as the handler for tasks called ``name``.
+
+    Handlers receive the payload as keyword arguments and must be safe to run
+    again, since a failed attempt is retried from the start.
+    """
+    def register(func):
+        TASKS[name] = (func, max_attempts)
+        return func
+    return register
+
+
+def _new_task(name, payload, delay):
+    if name not in TASKS:
+        raise UnknownTask(f"No task named {name!r} is registered.")
+    return Task(
+        name=name,
+        payload=payload or {},
+        max_attempts=TASKS[name][1],
+        run_after=timezone.now() + datetime.timedelta(seconds=delay),
+    )
+
+
+def enqueue(name, payload=None, delay=0):
+    """Queue one run of ``name``; inside a transaction it is only visible once committed."""
+    task_row = _new_task(name, payload, delay)
+    task_row.save()
+    return task_row
+
+
+def enqueue_many(name, payloads, delay=0):
+    """Queue one run of ``name`` per payload with a single INSERT."""
+    return Task.objects.bulk_create([_new_task(name, payload, delay) for payload in payloads])
+
+
+def retry_delay(attempts):
+    """Exponential backoff: 30s, 1m, 2m, ... capped at an hour."""
+    return min(RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), RETRY_MAX_DELAY)
+
+
+# ========== Claiming ==========
+def requeue_stale(now=None):
+    """Give tasks abandoned by a crashed worker back to the queue (or fail them if out of attempts)."""
+    now = now or timezone.now()
+    stale = Task.objects.filter(
+        status=Task.STATUS_RUNNING, locked_at__lt=now - datetime.timedelta(seconds=TASK_LOCK_TIMEOUT),
+    )
+    error = "The worker stopped before the task finished."
+    stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Task.STATUS_PENDING, locked_by='', locked_at=None, last_error=error,
+    )
+    stale.update(status=Task.STATUS_FAILED, finished_at=now, last_error=error)
+
+
+def claim(worker, limit=1):
+    """Mark up to ``limit`` due tasks as running for ``worker`` and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        due = Task.objects.filter(status=Task.STATUS_PENDING, run_after__lte=now).order_by('run_after', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        # The status condition keeps two workers from taking the same row on
+        # databases without SKIP LOCKED.
+        Task.objects.filter(id__in=ids, status=Task.STATUS_PENDING).update(
+            status=Task.STATUS_RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+        )
+    claimed = Task.objects.filter(id__in=ids, status=Task.STATUS_RUNNING, locked_by=worker)
+    return list(claimed.order_by('run_after', 'id'))
+
+
+# ========== Running ==========
+def run(task_row):
+    """Run a claimed task and record the outcome; returns True if it succeeded."""
+    try:
+        if task_row.name not in TASKS:
+            raise UnknownTask(f"No task named {task_row.name!r} is registered.")
+        TASKS[task_row.name][0](**task_row.payload)
+    except Exception as error:
+        _record_failure(task_row, error)
+        return False
+    Task.objects.filter(id=task_row.id).update(
+        status=Task.STATUS_DONE, finished_at=timezone.now(), locked_by='', last_error='',
+    )
+    return True
+
+
+def _record_failure(task_row, error):
+    now = timezone.now()
+    message = ''.join(traceback.format_exception(error))[-MAX_ERROR_LENGTH:]
+    if task_row.attempts < task_row.max_attempts:
+        Task.objects.filter(id=task_row.id).update(
+            status=Task.STATUS_PENDING, locked_by='', locked_at=None, last_error=message,
+            run_after=now + datetime.timedelta(seconds=retry_delay(task_row.attempts)),
+        )
+    else:
+        Task.objects.filter(id=task_row.id).update(
+            status=Task.STATUS_FAILED, locked_by='', finished_at=now, last_error=message,
+        )
+
+
+def purge_finished(days):
+    """Delete tasks that completed more than ``days`` days ago; failed ones are kept for inspection."""
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    return Task.objects.filter(status=Task.STATUS_DONE, finished_at__lt=cutoff).delete()[0]
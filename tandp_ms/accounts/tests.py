@@ -1,3 +1,1598 @@
-from django.test import TestCase
+import csv
+import datetime
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse
+from django.db import IntegrityError, OperationalError, connection
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    analytics, benchmarks, counters, jobs, matching, profiling, resumes, search, storage, tasks, upcoming, uploads,
+)
+from .exports import STUDENT_EXPORT_FIELDS
+from .importers import import_students
+from .middleware import AsyncWhiteNoiseMiddleware
+from .pagination import keyset_paginate
+from .registrations import ALREADY_REGISTERED, DRIVE_FULL, NOT_ELIGIBLE, REGISTERED, register, sync_seats_taken
+from .models import (
+    ContactMessage, Material, Notification, PlacementDrive, Registration, RegistrationDelta, RegistrationSummary,
+    RequestProfile, ResumeToken, StaffProfile, StoredBlob, Student, Task, UploadSession,
+)
+
+# Pages use {% static %}, which the manifest storage can only answer after collectstatic.
+PLAIN_STATIC_FILES = override_settings(STORAGES={
+    **settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+
+
+def setUpModule():
+    PLAIN_STATIC_FILES.enable()
+
+
+def tearDownModule():
+    PLAIN_STATIC_FILES.disable()
+
+
+def make_staff(username, role, **user_kwargs):
+    user = User.objects.create_user(username=username, is_staff=True, **user_kwargs)
+    return StaffProfile.objects.create(
+        user=user, name=username.title(), designation='Trainer', mobile='9999999999',
+        email=f'{username}@example.com', role=role,
+    )
+
+
+# ========== Query Counts ==========
+class ListingQueryCountTests(TestCase):
+    """Listing pages must issue the same number of queries for 1 row or 20 rows."""
+
+    # session + user + the listing itself
+    LISTING_QUERIES = 3
+    # session + user + the combined feed + per-category counts
+    ALL_MATERIALS_QUERIES = 4
+    # session + user + own profile + staff profiles (users joined) + messages
+    ADMIN_DASHBOARD_QUERIES = 5
+
+    def setUp(self):
+        cache.clear()
+        counters.reconcile()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.admin)
+
+    def add_materials(self, count):
+        for i in range(count):
+            uploader = make_staff(f'trainer{StaffProfile.objects.count()}', 'verbal_trainer')
+            for category, folder in Material.UPLOAD_DIRS.items():
+                Material.objects.create(
+                    category=category, title=f'{category} {i}', file=f'{folder}m.pdf', uploaded_by=uploader,
+                )
+
+    def assert_listing_queries(self, url_name, expected):
+        for count in (1, 20):
+            self.add_materials(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(reverse(url_name))
+            self.assertEqual(response.status_code, 200)
+
+    def test_view_verbal_material(self):
+        self.assert_listing_queries('view_verbal_material', self.LISTING_QUERIES)
+
+    def test_view_aptitude_tests(self):
+        self.assert_listing_queries('view_aptitude_tests', self.LISTING_QUERIES)
+
+    def test_view_technical_material(self):
+        self.assert_listing_queries('view_technical_material', self.LISTING_QUERIES)
+
+    def test_all_materials(self):
+        self.assert_listing_queries('all_materials', self.ALL_MATERIALS_QUERIES)
+
+    def test_admin_dashboard(self):
+        StaffProfile.objects.create(user=self.admin, name='Admin', designation='TPO', mobile='1', email='a@b.c', role='tpo')
+        self.assert_listing_queries('admin_dashboard', self.ADMIN_DASHBOARD_QUERIES)
+
+
+# ========== Dashboard Counters ==========
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_counters_follow_saves_and_deletes_without_queries(self):
+        counters.reconcile()
+        today = timezone.localdate()
+        student = Student.objects.create(
+            full_name='A', roll_number='R1', phone='1', branch='CSE', graduation_year=2026, department='CSE',
+        )
+        PlacementDrive.objects.create(
+            company_name='Acme', job_role='SDE', date=today, package='10', description='-',
+        )
+        PlacementDrive.objects.create(
+            company_name='Old', job_role='SDE', date=today - datetime.timedelta(days=3), package='5', description='-',
+        )
+        ContactMessage.objects.create(name='N', email='n@example.com', subject='S', message='M')
+        student.delete()
+
+        # the drive saves invalidated the upcoming feed, which is rebuilt once
+        with self.assertNumQueries(1):
+            counters.get_counters(counters.UPCOMING_DRIVES)
+        with self.assertNumQueries(0):
+            values = counters.get_counters()
+        self.assertEqual(values, {
+            'total_students': 0, 'total_drives': 2, 'upcoming_drives': 1, 'total_messages': 1,
+        })
+
+    def test_cold_counter_is_computed_and_reconcile_fixes_drift(self):
+        PlacementDrive.objects.bulk_create([
+            PlacementDrive(company_name='Bulk', job_role='QA', date=timezone.localdate(), package='3', description='-'),
+        ])
+        self.assertEqual(counters.get_counters(counters.TOTAL_DRIVES), {'total_drives': 1})
+
+        PlacementDrive.objects.bulk_create([
+            PlacementDrive(company_name='Bulk 2', job_role='QA', date=timezone.localdate(), package='3', description='-'),
+        ])
+        self.assertEqual(counters.get_counters(counters.TOTAL_DRIVES), {'total_drives': 1})
+        counters.reconcile()
+        self.assertEqual(counters.get_counters(counters.TOTAL_DRIVES), {'total_drives': 2})
+
+
+# ========== Student Import ==========
+class StudentImportTests(TestCase):
+    def test_import_creates_users_and_reports_bad_rows(self):
+        Student.objects.create(
+            full_name='Existing', roll_number='R0', phone='1', branch='CSE', graduation_year=2026, department='CSE',
+        )
+        csv_file = io.BytesIO(
+            b"roll_number,full_name,phone,graduation_year,password\r\n"
+            b"R0,Taken,1,2026,\r\n"
+            b"R1,One,1,2026,\r\n"
+            b"R2,Two,1,2026,own-secret\r\n"
+            b"R1,Again,1,2026,\r\n"
+            b"R3,Three,1,not-a-year,\r\n"
+            b"R4,Four,1,2026,12345678\r\n"
+            b"R5,Five,1,2026,\r\n"
+        )
+
+        report = import_students(csv_file, department='CSE', initial_password='initial-secret', chunk_size=2)
+
+        self.assertEqual(report.created, 3)
+        self.assertEqual([line for line, _ in report.errors], [2, 5, 6, 7])
+        self.assertIn('password:', report.errors[-1][1])
+        one = Student.objects.select_related('user').get(roll_number='R1')
+        self.assertEqual((one.department, one.branch, one.user.username), ('CSE', 'CSE', 'R1'))
+        self.assertTrue(one.user.check_password('initial-secret'))
+        self.assertTrue(User.objects.get(username='R2').check_password('own-secret'))
+        # the same initial password, salted per user
+        five = User.objects.get(username='R5')
+        self.assertTrue(five.check_password('initial-secret'))
+        self.assertNotEqual(five.password, one.user.password)
+
+    def test_upload_through_the_view(self):
+        coordinator = make_staff('coord', 'department_coordinator')
+        coordinator.branch = 'ECE'
+        coordinator.save()
+        self.client.force_login(coordinator.user)
+        csv_file = SimpleUploadedFile(
+            'students.csv',
+            '\ufeffRoll_Number,Full_Name,Phone,Graduation_Year\r\nR1,Ünal,1,2026\r\nR2,Two,1,2026\r\n'.encode(),
+            content_type='text/csv',
+        )
+
+        response = self.client.post(
+            reverse('import_students'), {'csv_file': csv_file, 'initial_password': 'initial-secret'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['report'].created, 2)
+        one = Student.objects.select_related('user').get(roll_number='R1')
+        self.assertEqual((one.full_name, one.department, one.user.username), ('Ünal', 'ECE', 'R1'))
+        self.assertTrue(one.user.check_password('initial-secret'))
+
+
+# ========== Drive Registration ==========
+class DriveRegistrationTests(TestCase):
+    def setUp(self):
+        self.students = [
+            Student.objects.create(
+                full_name=f'S{i}', roll_number=f'R{i}', phone='1', branch='CSE', graduation_year=2026, department='CSE',
+            )
+            for i in range(3)
+        ]
+
+    def make_drive(self, capacity=None):
+        return PlacementDrive.objects.create(
+            company_name='Acme', job_role='SDE', date=timezone.localdate(), package='10', description='-',
+            capacity=capacity,
+        )
+
+    def test_duplicate_registration_is_reported_not_raised(self):
+        drive = self.make_drive()
+        self.assertEqual(register(self.students[0], drive), REGISTERED)
+        self.assertEqual(register(self.students[0], drive), ALREADY_REGISTERED)
+        self.assertEqual(Registration.objects.filter(drive=drive).count(), 1)
+
+    def test_capacity_is_enforced_and_released_on_delete(self):
+        drive = self.make_drive(capacity=2)
+        results = [register(student, drive) for student in self.students]
+        self.assertEqual(results, [REGISTERED, REGISTERED, DRIVE_FULL])
+        self.assertEqual(Registration.objects.filter(drive=drive).count(), 2)
+
+        self.students[0].delete()
+        drive.refresh_from_db()
+        self.assertEqual(drive.seats_taken, 1)
+        self.assertEqual(register(self.students[2], drive), REGISTERED)
+
+    def test_cascades_release_seats_in_one_update(self):
+        drives = [self.make_drive(capacity=5) for _ in range(3)]
+        for drive in drives:
+            for student in self.students[:2]:
+                register(student, drive)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.students[0].delete()
+        seat_updates = [q['sql'] for q in queries if 'seats_taken' in q['sql'] and q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(seat_updates), 1)
+        self.assertEqual([drive.seats_taken for drive in PlacementDrive.objects.order_by('id')], [1, 1, 1])
+
+        # deleting the drive itself leaves its seats alone
+        with CaptureQueriesContext(connection) as queries:
+            drives[0].delete()
+        self.assertFalse([q for q in queries if 'seats_taken' in q['sql'] and q['sql'].startswith('UPDATE')])
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    """register() from many connections at once; needs real commits, so no wrapping transaction."""
+
+    def setUp(self):
+        self.drive = PlacementDrive.objects.create(
+            company_name='Acme', job_role='SDE', date=timezone.localdate(), package='10', description='-', capacity=3,
+        )
+        self.students = [
+            Student.objects.create(
+                full_name=f'S{i}', roll_number=f'R{i}', phone='1', branch='CSE', graduation_year=2026, department='CSE',
+            )
+            for i in range(6)
+        ]
+
+    def test_seats_and_duplicates_hold_under_concurrency(self):
+        attempts = self.students * 2  # every student tries twice
+        barrier = threading.Barrier(len(attempts))
+
+        def attempt(student):
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        return register(student, self.drive)
+                    except OperationalError:  # SQLite allows one writer at a time
+                        time.sleep(0.01)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+            results = list(pool.map(attempt, attempts))
+
+        self.assertEqual(results.count(REGISTERED), 3)
+        self.assertEqual(results.count(DRIVE_FULL) + results.count(ALREADY_REGISTERED), 9)
+        registered = list(Registration.objects.values_list('student_id', flat=True))
+        self.assertEqual(len(registered), 3)
+        self.assertEqual(len(set(registered)), 3)
+        self.drive.refresh_from_db()
+        self.assertEqual(self.drive.seats_taken, 3)
+
+    def test_other_integrity_errors_are_raised(self):
+        PlacementDrive.objects.filter(id=self.drive.id).update(capacity=None)
+        stale = PlacementDrive.objects.get(id=self.drive.id)
+        PlacementDrive.objects.filter(id=self.drive.id).delete()
+        with self.assertRaises(IntegrityError):
+            register(self.students[0], stale)
+
+
+# ========== Request Roles ==========
+class RequestRoleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.coordinator = make_staff('coord', 'department_coordinator')
+        self.coordinator.branch = 'CSE'
+        self.coordinator.save()
+        self.client.force_login(self.coordinator.user)
+
+    def test_profile_is_resolved_once_per_request(self):
+        # session + user + staff profile + student page + department count
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('department_dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_non_coordinator_is_sent_to_staff_login(self):
+        trainer = make_staff('trainer', 'verbal_trainer')
+        self.client.force_login(trainer.user)
+        response = self.client.get(reverse('department_dashboard'))
+        self.assertRedirects(response, '/staff/login/?next=/department/dashboard/', fetch_redirect_response=False)
+
+    @override_settings(ACCOUNTS_CACHE_ROLES=True)
+    def test_cached_role_is_invalidated_when_profile_changes(self):
+        self.client.get(reverse('department_dashboard'))
+        with self.assertNumQueries(4):
+            self.client.get(reverse('department_dashboard'))
+
+        self.coordinator.role = 'verbal_trainer'
+        self.coordinator.save()
+        response = self.client.get(reverse('department_dashboard'))
+        self.assertEqual(response.status_code, 302)
+
+
+# ========== Cached Listings ==========
+class CachedListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.trainer = make_staff('verbal', 'verbal_trainer')
+        self.client.force_login(self.trainer.user)
+
+    def test_material_listing_is_served_from_cache_until_an_upload(self):
+        Material.objects.create(
+            category=Material.VERBAL, title='Old', file='verbal_materials/o.pdf', uploaded_by=self.trainer,
+        )
+        self.client.get(reverse('view_verbal_material'))
+
+        # session + user only, the table comes from the fragment cache
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('view_verbal_material'))
+        self.assertContains(response, 'Old')
+
+        Material.objects.create(
+            category=Material.VERBAL, title='New', file='verbal_materials/n.pdf', uploaded_by=self.trainer,
+        )
+        self.assertContains(self.client.get(reverse('view_verbal_material')), 'New')
+
+    def test_public_pages_are_cached(self):
+        self.client.logout()
+        self.client.get(reverse('team'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('team'))
+        self.assertContains(response, 'Training &amp; Placement Officer')
+
+
+# ========== Chunked Uploads ==========
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = self.settings(MEDIA_ROOT=self.media, CHUNKED_UPLOAD_DIR=f'{self.media}/parts')
+        override.enable()
+        self.addCleanup(override.disable)
+        self.trainer = make_staff('verbal', 'verbal_trainer')
+        self.client.force_login(self.trainer.user)
+
+    def run_tasks(self):
+        return [tasks.run(task_row) for task_row in tasks.claim('test-worker', limit=100)]
+
+    def send(self, upload_id, offset, data):
+        return self.client.post(
+            reverse('upload_chunk', args=[upload_id]), data,
+            content_type='application/octet-stream', headers={'X-Upload-Offset': str(offset)},
+        )
+
+    def test_chunks_are_assembled_into_the_material_file(self):
+        content = b'%PDF-1.4 ' + b'x' * 100
+        started = self.client.post(reverse('upload_start'), {
+            'purpose': 'verbal', 'filename': 'notes.pdf', 'size': len(content), 'title': 'Notes',
+        }).json()
+        upload_id = started['upload_id']
+
+        self.assertEqual(self.send(upload_id, 0, content[:60]).json()['offset'], 60)
+        # a retried chunk with a stale offset is refused, the client resumes from the server's offset
+        self.assertEqual(self.send(upload_id, 0, content[:60]).status_code, 409)
+        self.assertEqual(self.client.get(reverse('upload_chunk', args=[upload_id])).json()['offset'], 60)
+        last = self.send(upload_id, 60, content[60:])
+
+        # the last chunk only queues the copy into storage
+        self.assertEqual((last.status_code, last.json()['state']), (202, UploadSession.STATE_STORING))
+        self.assertFalse(Material.objects.exists())
+        self.assertEqual(self.send(upload_id, 110, b'x').status_code, 409)
+        self.assertEqual(self.run_tasks(), [True])
+
+        finished = self.client.get(reverse('upload_chunk', args=[upload_id])).json()
+        self.assertEqual(finished['redirect'], reverse('upload_verbal_material'))
+        self.assertTrue(finished['complete'])
+        material = Material.objects.get(category=Material.VERBAL)
+        self.assertEqual((material.title, material.uploaded_by), ('Notes', self.trainer))
+        with material.file.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertFalse(uploads.part_path(UploadSession.objects.get()).exists())
+
+    def test_chunk_is_received_outside_a_transaction(self):
+        upload_id = self.client.post(reverse('upload_start'), {
+            'purpose': 'verbal', 'filename': 'notes.pdf', 'size': 8, 'title': 'Notes',
+        }).json()['upload_id']
+        # TestCase runs each test in a savepoint; any transaction of append_chunk's would add one
+        savepoints = len(connection.savepoint_ids)
+        open_while_reading = []
+
+        class Body(io.BytesIO):
+            def read(self, size=-1):
+                open_while_reading.append(len(connection.savepoint_ids) - savepoints)
+                return super().read(size)
+
+        session = uploads.append_chunk(upload_id, self.trainer.user, 0, 4, Body(b'%PDF'))
+        self.assertEqual((open_while_reading, session.received_size), ([0], 4))
+
+        # another request sending the same chunk got there first: this one is refused, not counted again
+        class RacedBody(io.BytesIO):
+            def read(self, size=-1):
+                UploadSession.objects.filter(id=upload_id).update(received_size=6)
+                return super().read(size)
+
+        with self.assertRaises(uploads.UploadError) as raised:
+            uploads.append_chunk(upload_id, self.trainer.user, 4, 2, RacedBody(b'-1'))
+        self.assertEqual(raised.exception.status, 409)
+        self.assertEqual(UploadSession.objects.get().received_size, 6)
+
+    def test_failed_storing_is_reported_to_the_client(self):
+        upload_id = self.client.post(reverse('upload_start'), {
+            'purpose': 'verbal', 'filename': 'notes.pdf', 'size': 8, 'title': 'Notes',
+        }).json()['upload_id']
+        self.send(upload_id, 0, b'%PDF-1.4')
+        uploads.part_path(UploadSession.objects.get()).unlink()
+
+        self.assertEqual(self.run_tasks(), [False])
+        state = self.client.get(reverse('upload_chunk', args=[upload_id])).json()
+        self.assertEqual(state['state'], UploadSession.STATE_FAILED)
+        self.assertFalse(state['complete'])
+        self.assertNotIn('redirect', state)
+        self.assertTrue(state['error'])
+        self.assertFalse(Material.objects.exists())
+
+    def test_type_and_role_limits(self):
+        def start(**data):
+            return self.client.post(reverse('upload_start'), {'title': 'T', 'size': 10, **data})
+
+        self.assertEqual(start(purpose='verbal', filename='run.exe').status_code, 400)
+        self.assertEqual(start(purpose='aptitude', filename='a.pdf').status_code, 403)
+        upload_id = start(purpose='verbal', filename='fake.pdf').json()['upload_id']
+        self.assertEqual(self.send(upload_id, 0, b'MZ not a pdf').status_code, 413)
+        self.assertEqual(self.send(upload_id, 0, b'MZ notapdf').status_code, 400)
+
+
+# ========== Media Downloads ==========
+class MediaDownloadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = self.settings(MEDIA_ROOT=self.media, MEDIA_OFFLOAD='')
+        override.enable()
+        self.addCleanup(override.disable)
+        for folder, content in (('aptitude_tests', b'0123456789'), ('resumes', b'resume')):
+            (Path(self.media) / folder).mkdir()
+            (Path(self.media) / folder / 'file.pdf').write_bytes(content)
+        self.student = Student.objects.create(
+            user=User.objects.create_user('R1'), full_name='S', roll_number='R1', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+        self.client.force_login(self.student.user)
+
+    def test_range_and_conditional_requests(self):
+        url = '/media/aptitude_tests/file.pdf'
+        full = self.client.get(url)
+        self.assertEqual(b''.join(full.streaming_content), b'0123456789')
+
+        partial = self.client.get(url, headers={'Range': 'bytes=2-5'})
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(partial.streaming_content), b'2345')
+
+        self.assertEqual(self.client.get(url, headers={'Range': 'bytes=20-'}).status_code, 416)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': full['ETag']}).status_code, 304)
+
+    def test_resumes_are_private(self):
+        self.assertEqual(self.client.get('/media/resumes/file.pdf').status_code, 403)
+        self.student.resume = 'resumes/file.pdf'
+        self.student.save()
+        self.assertEqual(self.client.get('/media/resumes/file.pdf').status_code, 200)
+        self.assertEqual(self.client.get('/media/aptitude_tests/../../settings.py').status_code, 404)
+
+    def test_other_folders_cannot_be_reached_through_a_public_one(self):
+        other = Student.objects.create(
+            user=User.objects.create_user('R2'), full_name='T', roll_number='R2', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE', resume='resumes/file.pdf',
+        )
+        self.assertEqual(self.client.get('/media/' + other.resume.name).status_code, 403)
+        for url in ('/media/aptitude_tests/../resumes/file.pdf', '/media/aptitude_tests/..%5Cresumes/file.pdf'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+        # harmless spellings still resolve to the same file
+        response = self.client.get('/media/./aptitude_tests//file.pdf')
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_offload_to_proxy(self):
+        with self.settings(MEDIA_OFFLOAD='x-accel-redirect'):
+            response = self.client.get('/media/aptitude_tests/file.pdf', {'name': 'Puzzles'})
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/aptitude_tests/file.pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Puzzles.pdf"')
+
+    def test_downloads_are_named_after_the_row(self):
+        material = Material(category=Material.APTITUDE, title='Week 1: Puzzles', file='aptitude_tests/file.pdf')
+        response = self.client.get(material.download_url)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Week 1: Puzzles.pdf"')
+        b''.join(response.streaming_content)
+
+        # a name can't change the extension or carry a path
+        response = self.client.get('/media/aptitude_tests/file.pdf', {'name': '../evil.html'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="evil.pdf"')
+        b''.join(response.streaming_content)
+
+        self.student.resume = 'resumes/file.pdf'
+        self.student.save()
+        response = self.client.get(self.student.resume_url)
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="R1 Resume.pdf"')
+        b''.join(response.streaming_content)
+
+
+# ========== Search ==========
+class SearchTests(TestCase):
+    def setUp(self):
+        self.trainer = make_staff('verbal', 'verbal_trainer')
+        self.client.force_login(self.trainer.user)
+        today = timezone.localdate()
+        self.infosys = PlacementDrive.objects.create(
+            company_name='Infosys', job_role='Systems Engineer', date=today, package='4 LPA',
+            description='Python and SQL roles in Mysore',
+        )
+        self.tcs = PlacementDrive.objects.create(
+            company_name='TCS', job_role='Python Developer', date=today, package='5 LPA',
+            description='Backend work with Python, Django and Python tooling',
+        )
+
+    def search(self, q, type='drives'):
+        return self.client.get(reverse('search'), {'q': q, 'type': type}).context['results']
+
+    def test_drives_are_ranked_and_matched_by_prefix(self):
+        self.assertEqual(self.search('python'), [self.tcs, self.infosys])
+        self.assertEqual(self.search('infos'), [self.infosys])
+        self.assertEqual(self.search('"); DROP'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.tcs.company_name = 'Wipro'
+        self.tcs.save()
+        self.assertEqual(self.search('wipro'), [self.tcs])
+        self.assertEqual(self.search('tcs'), [])
+        self.tcs.delete()
+        self.assertEqual(self.search('wipro'), [])
+
+    def test_materials_across_kinds(self):
+        verbal = Material.objects.create(
+            category=Material.VERBAL, title='Reading comprehension', file='v.pdf', uploaded_by=self.trainer,
+        )
+        technical = Material.objects.create(
+            category=Material.TECHNICAL, title='Reading Java code', file='t.pdf', uploaded_by=self.trainer,
+        )
+        results = self.search('reading', type='materials')
+        self.assertCountEqual(
+            [(m.category, m.id) for m in results], [('verbal', verbal.id), ('technical', technical.id)],
+        )
+        verbal.delete()
+        self.assertEqual([m.title for m in self.search('reading', type='materials')], ['Reading Java code'])
+
+    @skipUnless(connection.vendor == 'postgresql', "The tsvector search is only used on PostgreSQL.")
+    def test_postgresql_search_is_ranked_and_uses_the_gin_indexes(self):
+        self.assertEqual(list(search.ranked_drives('python')), [self.tcs, self.infosys])
+        self.assertEqual(list(search.ranked_drives('mysore sql')), [self.infosys])
+        Material.objects.create(
+            category=Material.VERBAL, title='Reading skills', file='v.pdf', uploaded_by=self.trainer,
+        )
+        self.assertEqual([m.title for m in search.ranked_materials('reading')], ['Reading skills'])
+        for queryset in (search.ranked_drives('python'), search.ranked_materials('reading')):
+            self.assertEqual(benchmarks.full_scans(queryset), [], queryset.explain())
+
+
+# ========== Background Tasks ==========
+class TaskQueueTests(TestCase):
+    def run_due(self):
+        return [tasks.run(task_row) for task_row in tasks.claim('test-worker', limit=100)]
+
+    def test_failed_task_is_retried_with_backoff_then_given_up(self):
+        calls = []
+
+        @tasks.task('flaky', max_attempts=2)
+        def flaky():
+            calls.append(1)
+            raise RuntimeError('boom')
+        self.addCleanup(tasks.TASKS.pop, 'flaky')
+
+        task_row = tasks.enqueue('flaky')
+        self.assertEqual(self.run_due(), [False])
+        task_row.refresh_from_db()
+        self.assertEqual((task_row.status, task_row.attempts), (Task.STATUS_PENDING, 1))
+        self.assertGreater(task_row.run_after, timezone.now() + datetime.timedelta(seconds=20))
+        self.assertIn('boom', task_row.last_error)
+        # not due yet
+        self.assertEqual(self.run_due(), [])
+
+        Task.objects.update(run_after=timezone.now())
+        self.assertEqual(self.run_due(), [False])
+        task_row.refresh_from_db()
+        self.assertEqual((task_row.status, len(calls)), (Task.STATUS_FAILED, 2))
+
+    def test_a_claimed_task_is_not_claimed_again(self):
+        tasks.enqueue(jobs.ANNOUNCE_DRIVE, {'drive_id': 0})
+        self.assertEqual(len(tasks.claim('a', limit=10)), 1)
+        self.assertEqual(tasks.claim('b', limit=10), [])
+
+    def test_new_drive_notifies_students_in_batches(self):
+        students = Student.objects.bulk_create([
+            Student(full_name=f'S{i}', roll_number=f'N{i}', phone='1', branch='CSE', graduation_year=2026,
+                    department='CSE')
+            for i in range(5)
+        ])
+        self.client.force_login(make_staff('tpo', 'tpo').user)
+        with mock.patch.object(jobs, 'NOTIFY_BATCH_SIZE', 2):
+            self.client.post(reverse('add_drive'), {
+                'company_name': 'Infosys', 'job_role': 'SE', 'date': '2030-01-01', 'package': '4', 'description': 'd',
+            })
+            # the request only queued the announcement
+            self.assertFalse(Notification.objects.exists())
+            self.assertEqual(self.run_due(), [True])
+        self.assertEqual(Task.objects.filter(name=jobs.NOTIFY_STUDENTS).count(), 3)
+        self.assertEqual(self.run_due(), [True, True, True])
+        self.assertEqual(
+            sorted(Notification.objects.values_list('student_id', flat=True)), [s.id for s in students],
+        )
+
+
+# ========== Drive Eligibility ==========
+class DriveEligibilityTests(TestCase):
+    def setUp(self):
+        self.student = Student.objects.create(
+            user=User.objects.create_user('E1'), full_name='S', roll_number='E1', phone='1', branch='cse',
+            graduation_year=2026, department='CSE',
+        )
+        today = timezone.localdate()
+
+        def drive(name, date=today, **criteria):
+            return PlacementDrive.objects.create(
+                company_name=name, job_role='SDE', date=date, package='1', description='-', **criteria,
+            )
+        self.open = drive('Open')
+        self.cse = drive('CSE only', eligible_branches=matching.normalize_branches('ece, CSE'))
+        self.batch = drive('2026 batch', min_graduation_year=2026, max_graduation_year=2026)
+        self.registered = drive('Registered')
+        Registration.objects.create(student=self.student, drive=self.registered)
+        drive('Mechanical', eligible_branches=matching.normalize_branches('MECH'))
+        drive('Old batch', max_graduation_year=2025)
+        drive('Past', date=today - datetime.timedelta(days=1))
+
+    def test_available_drives_is_one_query(self):
+        self.client.force_login(self.student.user)
+        upcoming.drives()
+        # session + user + student + registered drive ids; the drives come from the upcoming feed
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('available_drives'))
+        self.assertEqual(list(response.context['drives']), [self.open, self.cse, self.batch])
+
+    def test_registration_and_announcements_follow_the_criteria(self):
+        mech = PlacementDrive.objects.get(company_name='Mechanical')
+        self.assertEqual(register(self.student, mech), NOT_ELIGIBLE)
+        self.assertEqual(register(self.student, self.cse), REGISTERED)
+        self.assertEqual(matching.normalize_branches(' cse,,ECE '), ',CSE,ECE,')
+        self.assertFalse(matching.eligible_students(mech).exists())
+        self.assertFalse(matching.eligible_students(self.cse).exists())
+        self.assertEqual(list(matching.eligible_students(self.open)), [self.student])
+
+
+# ========== Registration Analytics ==========
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        self.drives = [
+            PlacementDrive.objects.create(company_name=name, job_role='SDE', date=today, package='1', description='-')
+            for name in ('Acme', 'Globex')
+        ]
+        self.students = [
+            Student.objects.create(
+                full_name=f'S{i}', roll_number=f'A{i}', phone='1', branch=branch, graduation_year=year,
+                department='CSE',
+            )
+            for i, (branch, year) in enumerate([('CSE', 2026), ('cse', 2026), ('ECE', 2027)])
+        ]
+        for student in self.students:
+            register(student, self.drives[0])
+        register(self.students[0], self.drives[1])
+
+    def counts(self, dimension):
+        return {row['key']: row['count'] for row in analytics.report()[dimension]}
+
+    def test_summaries_follow_registration_changes(self):
+        self.assertEqual(self.counts(analytics.DRIVE), {str(self.drives[0].id): 3, str(self.drives[1].id): 1})
+        self.assertEqual(self.counts(analytics.BRANCH), {'CSE': 3, 'ECE': 1})
+        self.assertEqual(self.counts(analytics.GRADUATION_YEAR), {'2026': 3, '2027': 1})
+        self.assertEqual(self.counts(analytics.MONTH), {timezone.localtime().strftime('%Y-%m'): 4})
+
+        self.students[2].branch = 'MECH'
+        self.students[2].save()
+        self.students[0].delete()
+        self.assertEqual(self.counts(analytics.BRANCH), {'CSE': 1, 'MECH': 1})
+        self.assertEqual(self.counts(analytics.DRIVE), {str(self.drives[0].id): 2})
+
+        incremental = analytics.report()
+        analytics.refresh()
+        self.assertEqual(analytics.report(), incremental)
+
+    def test_dashboard_and_api_read_only_the_summaries(self):
+        admin = User.objects.create_user('root', is_staff=True, is_superuser=True)
+        self.client.force_login(admin)
+        # session + user + summary rows
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('analytics_dashboard'))
+        self.assertEqual(response.context['total_registrations'], 4)
+        self.assertContains(response, 'Acme - SDE')
+
+        data = self.client.get(reverse('analytics_data'), {'dimension': 'graduation_year'}).json()
+        self.assertEqual(data, {'graduation_year': [
+            {'key': '2026', 'label': '2026', 'count': 3}, {'key': '2027', 'label': '2027', 'count': 1},
+        ]})
+        self.assertEqual(self.client.get(reverse('analytics_data'), {'dimension': 'x'}).status_code, 400)
+
+    def test_registrations_append_deltas_that_rollup_folds(self):
+        self.assertFalse(RegistrationSummary.objects.exists())
+        before = analytics.report()
+        self.assertEqual(analytics.rollup(), 16)
+        self.assertFalse(RegistrationDelta.objects.exists())
+        self.assertEqual(analytics.rollup(), 0)
+        self.assertEqual(analytics.report(), before)
+        self.assertEqual(RegistrationSummary.objects.get(dimension=analytics.BRANCH, key='CSE').count, 3)
+
+        self.drives[0].company_name = 'Initech'
+        self.drives[0].save()
+        register(self.students[1], self.drives[1])
+        analytics.rollup()
+        self.assertEqual(analytics.report()[analytics.DRIVE], [
+            {'key': str(self.drives[0].id), 'label': 'Initech - SDE', 'count': 3},
+            {'key': str(self.drives[1].id), 'label': 'Globex - SDE', 'count': 2},
+        ])
+
+    def test_cascading_delete_reads_the_students_once(self):
+        for i in range(5):
+            student = Student.objects.create(
+                full_name=f'T{i}', roll_number=f'B{i}', phone='1', branch='ECE', graduation_year=2027,
+            )
+            register(student, self.drives[0])
+        with CaptureQueriesContext(connection) as queries:
+            self.drives[0].delete()
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if q.startswith('SELECT') and 'FROM "accounts_student"' in q]), 1)
+        self.assertEqual(len([q for q in sql if q.startswith('INSERT INTO "accounts_registrationdelta"')]), 1)
+        self.assertEqual(self.counts(analytics.BRANCH), {'CSE': 1})
+        self.assertEqual(self.counts(analytics.GRADUATION_YEAR), {'2026': 1})
+        self.assertEqual(self.counts(analytics.DRIVE), {str(self.drives[1].id): 1})
+
+
+# ========== JSON API ==========
+class JsonApiTests(TestCase):
+    def setUp(self):
+        self.student = Student.objects.create(
+            user=User.objects.create_user('J1'), full_name='S', roll_number='J1', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+        self.client.force_login(self.student.user)
+        self.drives = [
+            PlacementDrive.objects.create(
+                company_name=f'Co{i}', job_role='SDE', date=timezone.localdate(), package='1', description='-',
+            )
+            for i in range(3)
+        ]
+
+    def test_cursor_pagination_and_field_selection(self):
+        url = reverse('api_drive_list')
+        first = self.client.get(url, {'limit': 2, 'fields': 'id,company_name'}).json()
+        self.assertEqual(first['results'], [{'id': d.id, 'company_name': d.company_name} for d in self.drives[:2]])
+        second = self.client.get(first['next']).json()
+        self.assertEqual([row['id'] for row in second['results']], [self.drives[2].id])
+        self.assertIsNone(second['next'])
+        self.assertEqual(self.client.get(url, {'fields': 'password'}).status_code, 400)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+    def test_polling_gets_304_until_the_data_changes(self):
+        url = reverse('api_drive_list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        # session + user + the COUNT/MAX validator query only
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        self.assertEqual(
+            self.client.get(url, headers={'If-Modified-Since': response['Last-Modified']}).status_code, 304,
+        )
+
+        self.drives[0].package = '2'
+        self.drives[0].save()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+        etag = self.client.get(url)['ETag']
+        self.drives[1].delete()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_registrations_and_materials(self):
+        register(self.student, self.drives[1])
+        data = self.client.get(reverse('api_my_registrations')).json()
+        self.assertEqual([row['drive']['id'] for row in data['results']], [self.drives[1].id])
+
+        trainer = make_staff('verbal', 'verbal_trainer')
+        Material.objects.create(
+            category=Material.VERBAL, title='Notes', file='verbal_materials/n.pdf', uploaded_by=trainer,
+        )
+        data = self.client.get(reverse('api_material_list', args=['verbal'])).json()
+        self.assertEqual([(row['title'], row['uploaded_by']) for row in data['results']], [('Notes', 'Verbal')])
+        self.assertEqual(self.client.get(reverse('api_material_list', args=['music'])).status_code, 404)
+
+
+# ========== Request Profiling ==========
+@override_settings(
+    ACCOUNTS_PROFILING=True,
+    TEMPLATES=[{**settings.TEMPLATES[0], 'BACKEND': 'accounts.profiling.ProfiledTemplates'}],
+)
+class ProfilingTests(TestCase):
+    def setUp(self):
+        profiling.flush()
+        counters.reconcile()
+        self.admin = User.objects.create_user('root', is_staff=True, is_superuser=True)
+
+    def test_requests_are_timed_and_reported_per_url_name(self):
+        self.client.force_login(self.admin)
+        for _ in range(3):
+            self.client.get(reverse('admin_dashboard'))
+        self.client.get('/no-such-page/')
+        self.assertEqual(profiling.flush(), 4)
+
+        dashboard = RequestProfile.objects.filter(url_name='admin_dashboard').first()
+        self.assertEqual((dashboard.status, dashboard.queries), (200, 5))
+        self.assertGreater(dashboard.template_ms, 0)
+        self.assertGreater(dashboard.response_size, 0)
+
+        lines = {line['url_name']: line for line in profiling.report()}
+        self.assertEqual(lines['admin_dashboard']['requests'], 3)
+        self.assertEqual(lines[profiling.UNRESOLVED]['requests'], 1)
+        self.assertContains(self.client.get(reverse('performance_report')), 'admin_dashboard')
+
+    def test_buffer_is_flushed_off_the_request_thread(self):
+        flushed_from = []
+        with mock.patch.object(profiling, 'FLUSH_INTERVAL', 0), \
+                mock.patch.object(profiling, 'flush', side_effect=lambda: flushed_from.append(threading.get_ident())):
+            self.client.get(reverse('home'))
+            profiling._flusher.join()
+        self.assertEqual(len(flushed_from), 1)
+        self.assertNotEqual(flushed_from[0], threading.get_ident())
+        self.assertEqual(profiling.flush(), 1)
+
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual([profiling.percentile(values, p) for p in (50, 95, 99)], [50, 95, 99])
+        self.assertEqual(profiling.percentile([7], 99), 7)
+
+    @override_settings(ACCOUNTS_PROFILING=False)
+    def test_disabled_records_nothing(self):
+        self.client.get(reverse('home'))
+        self.assertEqual(profiling.flush(), 0)
+
+
+# ========== Benchmarks ==========
+class BenchmarkTests(TestCase):
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)  # the student_login scenario hashes once per request
+    def test_seed_is_deterministic_and_scenarios_run(self):
+        benchmarks.seed(scale=0.005, seed=3, log=lambda message: None)
+        first = list(Registration.objects.order_by('student__roll_number', 'drive__company_name')
+                     .values_list('student__roll_number', 'drive__company_name'))
+        self.assertEqual(len(first), 100 * 2)
+        self.assertEqual(counters.get_counters(counters.TOTAL_STUDENTS)[counters.TOTAL_STUDENTS], 100)
+
+        benchmarks.seed(scale=0.005, seed=3, log=lambda message: None)
+        self.assertEqual(list(Registration.objects.order_by('student__roll_number', 'drive__company_name')
+                              .values_list('student__roll_number', 'drive__company_name')), first)
+
+        results = benchmarks.run(requests=2, concurrency=1)
+        self.assertEqual(set(results), set(benchmarks.SCENARIOS))
+        self.assertTrue(all(line['requests'] == 2 and not line['errors'] for line in results.values()))
+        self.assertTrue(all('mean_connect_ms' in line for line in results.values()))
+
+    def test_register_scenario_takes_its_registrations_back(self):
+        benchmarks.seed(scale=0.005, log=lambda message: None)
+        PlacementDrive.objects.update(date=timezone.localdate(), eligible_branches='', capacity=500)
+        Registration.objects.filter(student__user__isnull=False).delete()
+        for drive in PlacementDrive.objects.all():
+            sync_seats_taken(drive)
+        analytics.rollup()
+        seeded = (list(Registration.objects.order_by('id').values_list('id', flat=True)),
+                  list(PlacementDrive.objects.order_by('id').values_list('seats_taken', flat=True)),
+                  analytics.report())
+
+        benchmarks.run(['register_for_drive'], requests=4, concurrency=1)
+        self.assertEqual((list(Registration.objects.order_by('id').values_list('id', flat=True)),
+                          list(PlacementDrive.objects.order_by('id').values_list('seats_taken', flat=True)),
+                          analytics.report()), seeded)
+
+    def test_clear_removes_only_seeded_rows(self):
+        benchmarks.seed(scale=0.005, log=lambda message: None)
+        self.assertFalse(benchmarks.has_real_data())
+        # names that the old prefix match (case-insensitive LIKE on SQLite) would have taken
+        student = Student.objects.create(
+            full_name='Real', roll_number='bench-1', phone='1', branch='CSE', graduation_year=2026,
+            user=User.objects.create_user('bench_real'),
+        )
+        drive = PlacementDrive.objects.create(
+            company_name='Bench Tools', job_role='SDE', date=timezone.localdate(), package='1', description='-',
+        )
+        self.assertTrue(benchmarks.has_real_data())
+
+        benchmarks.clear()
+        self.assertEqual(list(Student.objects.all()), [student])
+        self.assertEqual(list(PlacementDrive.objects.all()), [drive])
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['bench_real'])
+        self.assertFalse(Material.objects.exists())
+        self.assertFalse(StaffProfile.objects.exists())
+
+    def test_connection_mode_follows_database_settings(self):
+        settings_dict = connection.settings_dict
+        with mock.patch.dict(settings_dict, {'CONN_MAX_AGE': 0}):
+            self.assertEqual(benchmarks.connection_mode(), 'per-request')
+        with mock.patch.dict(settings_dict, {'CONN_MAX_AGE': 600}):
+            self.assertEqual(benchmarks.connection_mode(), 'persistent')
+        with mock.patch.dict(settings_dict, {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': {'max_size': 4}}}):
+            self.assertEqual(benchmarks.connection_mode(), 'pool')
+
+    def test_hot_queries_use_indexes(self):
+        with self.assertRaisesMessage(LookupError, 'seed_benchmark_data'):
+            benchmarks.hot_queries()
+        benchmarks.seed(scale=0.005, log=lambda message: None)
+        for name, queryset in benchmarks.hot_queries().items():
+            scans = benchmarks.full_scans(queryset)
+            if scans is None:
+                self.skipTest("EXPLAIN parsing is only implemented for SQLite and PostgreSQL.")
+            with self.subTest(name):
+                self.assertEqual(scans, [], queryset.explain())
+
+    def test_compare_flags_slower_pages_and_extra_queries(self):
+        baseline = {'results': {'admin_dashboard': {'p95_ms': 10.0, 'max_queries': 5}}}
+        same = {'admin_dashboard': {'p95_ms': 11.0, 'max_queries': 5}}
+        slower = {'admin_dashboard': {'p95_ms': 20.0, 'max_queries': 6}}
+        self.assertEqual(benchmarks.compare(same, baseline, 25)[1], [])
+        self.assertEqual(len(benchmarks.compare(slower, baseline, 25)[1]), 2)
+
+
+# ========== Async Student Views ==========
+class AsyncStudentViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = Student.objects.create(
+            user=User.objects.create_user('A1'), full_name='Async Student', roll_number='A1', phone='1',
+            branch='CSE', graduation_year=2026, department='CSE',
+        )
+        drive = PlacementDrive.objects.create(
+            company_name='Acme', job_role='SDE', date=timezone.localdate(), package='1', description='-',
+        )
+        Registration.objects.create(student=self.student, drive=drive)
+        trainer = make_staff('verbal', 'verbal_trainer')
+        Material.objects.create(
+            category=Material.VERBAL, title='Reading', file='verbal_materials/r.pdf', uploaded_by=trainer,
+        )
+
+    async def test_student_pages_under_asgi(self):
+        await self.async_client.aforce_login(self.student.user)
+        for name, text in [
+            ('student_dashboard', 'Async Student'), ('registered_drives', 'Acme'),
+            ('view_verbal_material', 'Reading'),
+        ]:
+            with self.subTest(name):
+                response = await self.async_client.get(reverse(name))
+                self.assertContains(response, text)
+
+    async def test_staff_are_sent_home_from_student_dashboard(self):
+        await self.async_client.aforce_login(await User.objects.aget(username='verbal'))
+        response = await self.async_client.get(reverse('student_dashboard'))
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+
+    def test_listing_rows_are_fetched_only_when_the_fragment_changed(self):
+        self.client.force_login(self.student.user)
+        url = reverse('view_verbal_material')
+        self.assertContains(self.client.get(url), 'Reading')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get(url), 'Reading')
+        self.assertFalse([q for q in queries.captured_queries if 'accounts_material' in q['sql']])
+
+        Material.objects.create(
+            category=Material.VERBAL, title='Grammar', file='verbal_materials/g.pdf',
+            uploaded_by=StaffProfile.objects.get(user__username='verbal'),
+        )
+        self.assertContains(self.client.get(url), 'Grammar')
+
+    async def test_available_drives_under_asgi(self):
+        await PlacementDrive.objects.acreate(
+            company_name='Globex', job_role='SDE', date=timezone.localdate(), package='1', description='-', capacity=4,
+        )
+        await self.async_client.aforce_login(self.student.user)
+        response = await self.async_client.get(reverse('available_drives'))
+        self.assertEqual([drive.company_name for drive in response.context['drives']], ['Globex'])
+        self.assertContains(response, '<td>4</td>', html=True)
+
+    async def test_static_files_are_served_on_the_event_loop(self):
+        static_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, static_root)
+        (static_root / 'site.css').write_text('body {}')
+
+        async def get_response(request):
+            return HttpResponse('view')
+
+        with self.settings(STATIC_ROOT=static_root):
+            middleware = AsyncWhiteNoiseMiddleware(get_response)
+        factory = RequestFactory()
+        response = await middleware(factory.get('/static/site.css'))
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'text/css; charset="utf-8"'))
+        self.assertEqual((await middleware(factory.get('/student/dashboard/'))).content, b'view')
+
+
+# ========== Upcoming Drives Feed ==========
+class UpcomingFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+
+        def drive(name, days, **fields):
+            return PlacementDrive.objects.create(
+                company_name=name, job_role='SDE', date=self.today + datetime.timedelta(days=days), package='4 LPA',
+                description='Aptitude, then interviews; bring your resume.', **fields,
+            )
+        self.later = drive('Later', 5)
+        self.today_drive = drive('Today', 0, capacity=10)
+        drive('Past', -1)
+        self.student = Student.objects.create(
+            user=User.objects.create_user('U1'), full_name='S', roll_number='U1', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+
+    def test_feed_is_cached_until_a_drive_changes(self):
+        self.assertEqual(upcoming.drives(), [self.today_drive, self.later])
+        with self.assertNumQueries(0):
+            upcoming.drives()
+
+        self.later.date = self.today - datetime.timedelta(days=2)
+        self.later.save()
+        self.assertEqual(upcoming.drives(), [self.today_drive])
+
+    def test_seats_are_read_fresh_without_rebuilding_the_feed(self):
+        other = Student.objects.create(
+            full_name='O', roll_number='U2', phone='1', branch='CSE', graduation_year=2026, department='CSE',
+        )
+        upcoming.drives()
+        register(other, self.today_drive)
+        with self.assertNumQueries(0):
+            self.assertEqual(upcoming.drives()[0].seats_left, 10)
+
+        self.client.force_login(self.student.user)
+        # session + user + student + registered drive ids + seats of the capped drive
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('available_drives'))
+        self.assertEqual([drive.seats_left for drive in response.context['drives']], [9, None])
+
+    def test_feed_rolls_over_at_midnight(self):
+        upcoming.drives()
+        tomorrow = self.today + datetime.timedelta(days=1)
+        with mock.patch('django.utils.timezone.localdate', return_value=tomorrow):
+            self.assertEqual(upcoming.drives(), [self.later])
+
+    def test_calendar_feed(self):
+        self.client.force_login(self.student.user)
+        link = self.client.get(reverse('student_dashboard')).context['calendar_url']
+        self.client.logout()
+
+        response = self.client.get(link)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn(f'DTSTART;VALUE=DATE:{self.today:%Y%m%d}', body)
+        self.assertIn('SUMMARY:Later - SDE', body)
+        self.assertIn(r'Aptitude\, then interviews\; bring', body.replace('\r\n ', ''))
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+        self.assertEqual(self.client.get(reverse('drive_calendar') + '?token=forged').status_code, 403)
+
+    def test_resetting_the_calendar_link_revokes_the_old_one(self):
+        self.client.force_login(self.student.user)
+        old_link = self.client.get(reverse('student_dashboard')).context['calendar_url']
+        self.assertEqual(self.client.get(reverse('student_dashboard')).context['calendar_url'], old_link)
+        self.client.post(reverse('reset_calendar_link'))
+        new_link = self.client.get(reverse('student_dashboard')).context['calendar_url']
+        self.client.logout()
+
+        self.assertEqual(self.client.get(old_link).status_code, 403)
+        self.assertEqual(self.client.get(new_link).status_code, 200)
+        self.student.user.is_active = False
+        self.student.user.save()
+        self.assertEqual(self.client.get(new_link).status_code, 403)
+
+
+# ========== Resume Shortlisting ==========
+def docx(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as document:
+        document.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+        ))
+    return buffer.getvalue()
+
+
+class ResumeShortlistTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = self.settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.drive = PlacementDrive.objects.create(
+            company_name='Acme', job_role='SDE', date=timezone.localdate(), package='4 LPA', description='D',
+        )
+
+    def student(self, roll, filename, content):
+        student = Student.objects.create(
+            user=User.objects.create_user(roll), full_name=roll, roll_number=roll, phone='1', branch='CSE',
+            graduation_year=2026, department='CSE', resume=SimpleUploadedFile(filename, content),
+        )
+        Registration.objects.create(student=student, drive=self.drive)
+        return student
+
+    def run_tasks(self):
+        return [tasks.run(task_row) for task_row in tasks.claim('test-worker', limit=100)]
+
+    def test_tokenize_keeps_skill_names_whole(self):
+        self.assertEqual(
+            resumes.tokenize('Built APIs in Node.js and C++, then C#.'),
+            {'built': 1, 'apis': 1, 'node.js': 1, 'c++': 1, 'then': 1, 'c#': 1},
+        )
+        self.assertEqual(resumes.parse_keywords('Python, SQL; python'), ['python', 'sql'])
+
+    def test_upload_queues_indexing_and_unchanged_files_are_skipped(self):
+        student = self.student('R1', 'r1.txt', b'')
+        self.client.force_login(student.user)
+        self.client.post(reverse('upload_resume'), {'resume': SimpleUploadedFile('cv.docx', docx('Python and SQL, Python'))})
+        self.run_tasks()
+
+        student.refresh_from_db()
+        self.assertEqual(len(student.resume_sha256), 64)
+        self.assertEqual(dict(student.resume_tokens.values_list('token', 'count')), {'python': 2, 'sql': 1})
+        with mock.patch.object(resumes, 'extract_text') as extract_text:
+            resumes.index_resume(student.id)
+        extract_text.assert_not_called()
+
+    def test_unsupported_files_are_left_unindexed(self):
+        student = self.student('R1', 'r1.odt', b'python')
+        with self.assertLogs('accounts.resumes', 'WARNING'):
+            resumes.index_resume(student.id)
+        student.refresh_from_db()
+        self.assertEqual(student.resume_sha256, '')
+        self.assertFalse(ResumeToken.objects.exists())
+
+    def test_registrants_ranked_by_matched_skills_then_mentions(self):
+        both = self.student('R1', 'r1.txt', b'python sql')
+        keen = self.student('R3', 'r3.txt', b'python python python')
+        once = self.student('R2', 'r2.txt', b'python java')
+        unmatched = self.student('R4', 'r4.txt', b'cobol')
+        for student in (both, keen, once, unmatched):
+            resumes.index_resume(student.id)
+
+        ranked = resumes.shortlist(self.drive, ['python', 'sql'])
+        self.assertEqual(
+            [(s.roll_number, s.matched, s.mentions) for s in ranked],
+            [('R1', 2, 2), ('R3', 1, 3), ('R2', 1, 1), ('R4', 0, 0)],
+        )
+
+        self.client.force_login(make_staff('tpo', 'tpo').user)
+        response = self.client.get(reverse('shortlist_drive', args=[self.drive.id]), {'skills': 'SQL, Python'})
+        self.assertEqual([s.roll_number for s in response.context['candidates']], ['R1', 'R3', 'R2', 'R4'])
+        self.assertEqual(
+            self.client.get(reverse('shortlist_drive', args=[self.drive.id])).context['candidates'][0].roll_number,
+            'R1',
+        )
+
+
+# ========== Content-Addressed Storage ==========
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = self.settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.trainer = make_staff('aptitude', 'aptitude_trainer')
+
+    def upload(self, filename, content):
+        return Material.objects.create(
+            category=Material.APTITUDE, title=filename, file=SimpleUploadedFile(filename, content),
+            uploaded_by=self.trainer,
+        )
+
+    def references(self, name):
+        return StoredBlob.objects.get(name=name).references
+
+    def test_identical_chunked_resume_reupload_keeps_one_reference(self):
+        student = Student.objects.create(
+            user=User.objects.create_user('R1'), full_name='S', roll_number='R1', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+        with self.settings(CHUNKED_UPLOAD_DIR=f'{self.media}/parts'):
+            for _ in range(2):
+                session = uploads.start_session(student.user, UploadSession.PURPOSE_RESUME, 'cv.pdf', 8)
+                uploads.append_chunk(session.id, student.user, 0, 8, io.BytesIO(b'%PDF-1.4'))
+                uploads.finish_session(UploadSession.objects.get(id=session.id))
+        student.refresh_from_db()
+        self.assertEqual(self.references(student.resume.name), 1)
+
+    def test_identical_uploads_share_one_file(self):
+        first, second = self.upload('week1.pdf', b'%PDF same'), self.upload('copy.PDF', b'%PDF same')
+        other = self.upload('week2.pdf', b'%PDF other')
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertTrue(first.file.name.startswith('aptitude_tests/'))
+        self.assertEqual(storage.content_digest(first.file.name), hashlib.sha256(b'%PDF same').hexdigest())
+        self.assertEqual(self.references(first.file.name), 2)
+        stored = [path for path in Path(self.media, 'aptitude_tests').rglob('*') if path.is_file()]
+        self.assertEqual(len(stored), 2)
+
+    def test_deletes_only_release_references_until_collected(self):
+        first, second = self.upload('a.pdf', b'%PDF shared'), self.upload('b.pdf', b'%PDF shared')
+        path = Path(first.file.path)
+        first.delete()
+        self.assertEqual(self.references(second.file.name), 1)
+        self.assertEqual(storage.collect_garbage(), (0, 0))
+
+        second.delete()
+        self.assertTrue(path.exists())
+        self.assertEqual(storage.collect_garbage(), (1, len(b'%PDF shared')))
+        self.assertFalse(path.exists())
+        self.assertFalse(StoredBlob.objects.exists())
+
+    def test_failed_save_leaves_no_reference(self):
+        with self.assertRaises(IntegrityError):
+            Material.objects.create(
+                category=Material.APTITUDE, title=None, file=SimpleUploadedFile('a.pdf', b'%PDF lost'),
+            )
+        name = f"aptitude_tests/{hashlib.sha256(b'%PDF lost').hexdigest()[:2]}/"
+        self.assertFalse(StoredBlob.objects.filter(name__startswith=name, references__gt=0).exists())
+
+    def test_spooled_files_are_not_served(self):
+        (Path(self.media) / storage.INCOMING_DIR).mkdir()
+        (Path(self.media) / storage.INCOMING_DIR / 'part').write_bytes(b'%PDF half')
+        self.client.force_login(self.trainer.user)
+        self.assertEqual(self.client.get(f'/media/{storage.INCOMING_DIR}/part').status_code, 403)
+
+    def test_release_is_a_single_update(self):
+        name = self.upload('a.pdf', b'%PDF').file.name
+        with self.assertNumQueries(1):
+            storage.release(name)
+
+    def test_files_saved_before_the_storage_are_collected_after_delete(self):
+        (Path(self.media) / 'aptitude_tests').mkdir()
+        (Path(self.media) / 'aptitude_tests' / 'old.pdf').write_bytes(b'%PDF old')
+        Material.objects.create(
+            category=Material.APTITUDE, title='Old', file='aptitude_tests/old.pdf', uploaded_by=self.trainer,
+        ).delete()
+        self.assertEqual(storage.collect_garbage(), (1, len(b'%PDF old')))
+        self.assertFalse((Path(self.media) / 'aptitude_tests' / 'old.pdf').exists())
+
+    def test_replacing_a_resume_releases_the_old_file(self):
+        student = Student.objects.create(
+            user=User.objects.create_user('R1'), full_name='S', roll_number='R1', phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+        self.client.force_login(student.user)
+
+        def upload_resume(content):
+            self.client.post(reverse('upload_resume'), {'resume': SimpleUploadedFile('cv.txt', content)})
+            student.refresh_from_db()
+            return student.resume.name
+
+        first = upload_resume(b'first')
+        upload_resume(b'second')
+        upload_resume(b'second')  # unchanged re-upload: same file, still one reference
+        self.assertEqual(self.references(first), 0)
+        self.assertEqual(self.references(student.resume.name), 1)
+        self.assertEqual(storage.collect_garbage(), (1, len(b'first')))
+        with student.resume.open('rb') as resume:
+            self.assertEqual(resume.read(), b'second')
+
+
+# ========== Study Materials ==========
+class MaterialTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = self.settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.trainer = make_staff('global', 'global_trainer')
+
+    def add(self, category, title, uploaded_by=None):
+        return Material.objects.create(
+            category=category, title=title, file=f'{Material.UPLOAD_DIRS[category]}{title}.pdf',
+            uploaded_by=uploaded_by or self.trainer,
+        )
+
+    def test_upload_is_limited_to_the_category_roles(self):
+        self.client.force_login(self.trainer.user)
+        response = self.client.post(reverse('upload_technical_material'), {
+            'title': 'Java', 'file': SimpleUploadedFile('java.pdf', b'%PDF java'),
+        })
+        self.assertRedirects(response, reverse('upload_technical_material'))
+        material = Material.objects.get()
+        self.assertEqual((material.category, material.uploaded_by), (Material.TECHNICAL, self.trainer))
+        self.assertTrue(material.file.name.startswith('technical_materials/'))
+        self.assertEqual(self.client.get(reverse('upload_verbal_material')).status_code, 403)
+
+    def test_only_the_uploader_deletes(self):
+        material = self.add(Material.APTITUDE, 'Puzzles')
+        self.client.force_login(make_staff('other', 'aptitude_trainer').user)
+        self.client.post(reverse('delete_material', args=[material.id]))
+        self.assertTrue(Material.objects.exists())
+
+        self.client.force_login(self.trainer.user)
+        self.client.post(reverse('delete_material', args=[material.id]))
+        self.assertFalse(Material.objects.exists())
+
+    def test_feed_counts_and_trainer_listing(self):
+        self.add(Material.VERBAL, 'Grammar')
+        self.add(Material.TECHNICAL, 'Java')
+        self.add(Material.TECHNICAL, 'SQL', uploaded_by=make_staff('tech', 'technical_trainer'))
+
+        self.client.force_login(self.trainer.user)
+        response = self.client.get(reverse('all_materials'))
+        self.assertEqual([m.title for m in response.context['materials']], ['SQL', 'Java', 'Grammar'])
+        self.assertEqual(
+            [(row['category'], row['total']) for row in response.context['category_counts']],
+            [('technical', 2), ('verbal', 1)],
+        )
+        self.assertEqual([m.title for m in self.client.get(reverse('view_technical_material')).context['materials']],
+                         ['SQL', 'Java'])
+
+        dashboard = self.client.get(reverse('staff_dashboard'))
+        self.assertEqual([m.title for m in dashboard.context['materials']], ['Java', 'Grammar'])
+
+
+# ========== Login Fast Path ==========
+FAST_HASHERS = ['accounts.hashers.PBKDF2PasswordHasher', 'accounts.hashers.ScryptPasswordHasher']
+
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_HASHERS, PASSWORD_PBKDF2_ITERATIONS=1000, PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10,
+    LOGIN_FAILURE_LIMITS={'username': (3, 60), 'ip': (5, 60)},
+)
+class LoginFastPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = self.make_student('R1')
+
+    def make_student(self, roll_number):
+        user = User.objects.create_user(username=roll_number, password='secret-pass')
+        Student.objects.create(
+            user=user, full_name=roll_number, roll_number=roll_number, phone='1', branch='CSE',
+            graduation_year=2026, department='CSE',
+        )
+        return user
+
+    def attempt(self, username, password='secret-pass'):
+        return self.client.post(reverse('student_login'), {'username': username, 'password': password})
+
+    def test_hash_is_upgraded_at_login(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertRedirects(self.attempt('R1'), reverse('student_dashboard'), fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+        with self.settings(PASSWORD_HASHERS=FAST_HASHERS[::-1]):
+            self.attempt('R1')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        self.assertTrue(self.user.check_password('secret-pass'))
+
+    def test_failures_lock_the_roll_number(self):
+        for _ in range(3):
+            self.assertEqual(self.attempt('r1 ', 'wrong').status_code, 200)
+        with mock.patch('accounts.views.authenticate') as authenticate:
+            self.assertEqual(self.attempt('R1').status_code, 429)
+        authenticate.assert_not_called()
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+        self.make_student('R2')
+        self.assertEqual(self.attempt('R2').status_code, 302)
+
+    def test_success_clears_the_roll_number_count(self):
+        for _ in range(2):
+            self.attempt('R1', 'wrong')
+        self.assertEqual(self.attempt('R1').status_code, 302)
+        self.client.logout()
+        for _ in range(2):
+            self.attempt('R1', 'wrong')
+        self.assertEqual(self.attempt('R1').status_code, 302)
+
+    def test_failures_from_one_address_never_lock_out_correct_passwords(self):
+        self.make_student('R2')
+        self.attempt('R2', 'wrong')
+        for number in range(50):  # a campus behind one NAT address mistyping
+            self.assertEqual(self.attempt(f'X{number}', 'wrong').status_code, 200)
+        self.assertEqual(self.attempt('R1').status_code, 302)
+
+        # past the address's limit, a roll number that already failed from it gets no more tries
+        self.assertEqual(self.attempt('R2').status_code, 429)
+        self.assertEqual(
+            self.client.post(reverse('student_login'), {'username': 'R2', 'password': 'secret-pass'},
+                             REMOTE_ADDR='10.0.0.2').status_code,
+            302,
+        )
+
+    @override_settings(LOGIN_CLIENT_IP_HEADER='HTTP_X_REAL_IP')
+    def test_client_address_from_the_trusted_proxy_header(self):
+        self.attempt('R1', 'wrong')
+        for number in range(5):
+            self.client.post(reverse('student_login'), {'username': f'X{number}', 'password': 'wrong'},
+                             HTTP_X_REAL_IP='10.0.0.7')
+        # those failures count against 10.0.0.7, not the proxy address this client shares
+        self.assertEqual(self.attempt('R1').status_code, 302)
+
+    def test_signed_cookie_sessions(self):
+        with self.settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            self.attempt('R1')
+            self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+        self.assertFalse(Session.objects.exists())
+
+
+# ========== Student Directory ==========
+class StudentDirectoryTests(TestCase):
+    def setUp(self):
+        self.client.force_login(make_staff('tpo', 'tpo').user)
+        for i in range(7):
+            Student.objects.create(
+                full_name=f'S{i}', roll_number=f'R{i}', phone='1', branch='CSE' if i % 2 else 'ECE',
+                department='CSE' if i % 2 else 'ECE', graduation_year=2025 + i % 3,
+            )
+        self.factory = RequestFactory()
+
+    def page(self, **params):
+        return keyset_paginate(Student.objects.all(), self.factory.get('/', params), per_page=3)
+
+    def rolls(self, page):
+        return [student.roll_number for student in page]
+
+    def test_paging_forward_and_back(self):
+        first = self.page()
+        self.assertEqual((self.rolls(first), first.has_previous, first.has_next), (['R0', 'R1', 'R2'], False, True))
+        second = self.page(after='R2')
+        self.assertEqual((self.rolls(second), second.previous_query, second.next_query),
+                         (['R3', 'R4', 'R5'], 'before=R3', 'after=R5'))
+        last = self.page(after='R5')
+        self.assertEqual((self.rolls(last), last.has_next), (['R6'], False))
+
+        back = self.page(before='R6')
+        self.assertEqual((self.rolls(back), back.has_previous, back.has_next), (['R3', 'R4', 'R5'], True, True))
+        start = self.page(before='R3')
+        self.assertEqual((self.rolls(start), start.has_previous), (['R0', 'R1', 'R2'], False))
+
+    def test_cursors_past_either_end_give_empty_pages(self):
+        before_start = self.page(before='R0')
+        self.assertEqual((self.rolls(before_start), before_start.has_next, before_start.next_query), ([], False, ''))
+        past_end = self.page(after='R9', branch='CSE')
+        self.assertEqual(self.rolls(past_end), [])
+        self.assertEqual((past_end.next_query, past_end.previous_query), ('', 'branch=CSE'))
+
+        for params in ({'before': 'R0'}, {'after': 'R9'}, {'before': ''}):
+            self.assertEqual(self.client.get(reverse('view_students'), params).status_code, 200)
+
+    def test_filters_are_combined_and_kept_in_page_links(self):
+        response = self.client.get(reverse('view_students'), {'branch': 'CSE', 'graduation_year': '2026'})
+        self.assertEqual([s.roll_number for s in response.context['students']], ['R1'])
+        response = self.client.get(reverse('view_students'), {'department': 'ECE'})
+        self.assertEqual([s.roll_number for s in response.context['students']], ['R0', 'R2', 'R4', 'R6'])
+        self.assertEqual(self.client.get(reverse('view_students'), {'graduation_year': 'abc'}).status_code, 200)
+
+        page = keyset_paginate(Student.objects.filter(branch='ECE'), self.factory.get('/', {'branch': 'ECE'}),
+                               per_page=2)
+        self.assertEqual(page.next_query, 'branch=ECE&after=R2')
+
+    def test_department_dashboard_filters_by_graduation_year(self):
+        coordinator = make_staff('coordinator', 'department_coordinator')
+        StaffProfile.objects.filter(id=coordinator.id).update(branch='CSE')
+        self.client.force_login(coordinator.user)
+        response = self.client.get(reverse('department_dashboard'), {'graduation_year': '2025'})
+        self.assertEqual([s.roll_number for s in response.context['students']], ['R3'])
+
+    def test_query_count_is_the_same_on_every_page(self):
+        for i in range(7, 120):
+            Student.objects.create(full_name=f'S{i}', roll_number=f'R{i:03d}', phone='1', branch='CSE',
+                                   department='CSE', graduation_year=2026)
+        url = reverse('view_students')
+        with self.assertNumQueries(3):  # session + user + the page
+            first = self.client.get(url)
+        with self.assertNumQueries(3):
+            self.client.get(f"{url}?{first.context['students'].next_query}")
+        with self.assertNumQueries(3):
+            self.client.get(url, {'before': 'R6'})
+
+
+# ========== CSV Exports ==========
+class CsvExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(make_staff('tpo', 'tpo').user)
+        self.drive = PlacementDrive.objects.create(
+            company_name='Acme Corp', job_role='SDE', date=timezone.localdate(), package='10', description='-',
+        )
+
+    def add_students(self, count, **fields):
+        for i in range(Student.objects.count(), Student.objects.count() + count):
+            student = Student.objects.create(**{
+                'full_name': f'S{i}', 'roll_number': f'R{i:03d}', 'phone': '1', 'branch': 'CSE',
+                'department': 'CSE', 'graduation_year': 2026, **fields,
+            })
+            register(student, self.drive)
+
+    def rows(self, response):
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_student_export_streams_filtered_rows(self):
+        self.add_students(2)
+        self.add_students(1, graduation_year=2027)
+        response = self.client.get(reverse('export_students'), {'department': 'CSE', 'graduation_year': '2026'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="students.csv"')
+        rows = self.rows(response)
+        self.assertEqual(rows[0], list(STUDENT_EXPORT_FIELDS))
+        self.assertEqual([row[0] for row in rows[1:]], ['R000', 'R001'])
+
+    def test_formula_like_cells_are_quoted(self):
+        self.add_students(1, full_name='=HYPERLINK("http://evil.example","x")', phone='+911234', branch='@SUM(A1)')
+        self.add_students(1, full_name='-2+3', department='CSE', phone='98765')
+        response = self.client.get(reverse('export_drive_registrations', args=[self.drive.id]))
+        self.assertEqual(
+            response['Content-Disposition'], f'attachment; filename="acme-corp-{self.drive.id}-registrations.csv"',
+        )
+        first, second = self.rows(response)[1:]
+        self.assertEqual(first[1:4], ["'=HYPERLINK(\"http://evil.example\",\"x\")", "'+911234", "'@SUM(A1)"])
+        self.assertEqual((second[1], second[2], second[5]), ("'-2+3", '98765', '2026'))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for count in (1, 30):
+            self.add_students(count)
+            # session + user + drive + the registrations
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse('export_drive_registrations', args=[self.drive.id]))
+                rows = self.rows(response)
+            self.assertEqual(len(rows), Registration.objects.count() + 1)
+            # session + user + the students
+            with self.assertNumQueries(3):
+                self.rows(self.client.get(reverse('export_students')))
+
+    def test_exports_are_staff_only(self):
+        student = Student.objects.create(
+            full_name='S', roll_number='X1', phone='1', branch='CSE', graduation_year=2026,
+            user=User.objects.create_user('X1', password='pw'),
+        )
+        self.client.force_login(student.user)
+        for url in (reverse('export_students'), reverse('export_drive_registrations', args=[self.drive.id])):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(response['Location'].startswith('/staff/login/'))
+
+    def test_department_export_link_keeps_the_year_filter(self):
+        coordinator = make_staff('coordinator', 'department_coordinator')
+        StaffProfile.objects.filter(id=coordinator.id).update(branch='CSE')
+        self.client.force_login(coordinator.user)
+        response = self.client.get(reverse('department_dashboard'), {'graduation_year': '2027'})
+        self.assertContains(response, f"{reverse('export_students')}?department=CSE&amp;graduation_year=2027")
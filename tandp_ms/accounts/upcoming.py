@@ -0,0 +1,164 @@
+import datetime
+import secrets
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import fragments, matching
+from .models import CalendarLink, PlacementDrive, Registration
+
+# Upcoming drives (today onwards, soonest first) are served from one cached
+# list instead of the drive table. The list is cached under the drives
+# fragment version and today's local date: saving or deleting a drive bumps
+# the version (signals.py), and after local midnight the date in the key
+# changes, so the first request of the day rebuilds the list without
+# yesterday's drives. Entries expire at the midnight they stop being valid.
+#
+# Seats change with every registration, so the cached seats_taken is stale
+# by design; available_to() reads the current counts for the capped drives
+# it lists in one query rather than invalidating the feed per seat.
+
+CALENDAR_SALT = 'accounts.upcoming.calendar'
+
+
+def _key(version, today):
+    return f'upcoming:{version}:{today.isoformat()}'
+
+
+def _seconds_to_midnight():
+    now = timezone.localtime()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time.min, now.tzinfo)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def queryset(today):
+    return PlacementDrive.objects.filter(date__gte=today).order_by('date', 'id')
+
+
+def drives():
+    """Upcoming drives as a list, soonest first."""
+    today = timezone.localdate()
+    key = _key(fragments.version(fragments.DRIVES), today)
+    feed = cache.get(key)
+    if feed is None:
+        feed = list(queryset(today))
+        cache.set(key, feed, _seconds_to_midnight())
+    return feed
+
+
+async def adrives():
+    today = timezone.localdate()
+    key = _key(await fragments.aversion(fragments.DRIVES), today)
+    feed = await cache.aget(key)
+    if feed is None:
+        feed = [drive async for drive in queryset(today)]
+        await cache.aset(key, feed, _seconds_to_midnight())
+    return feed
+
+
+async def available_to(student):
+    """The feed filtered to drives ``student`` is eligible for and not registered to, soonest first.
+
+    Eligibility is checked in memory (matching.is_eligible), so the only
+    queries are the student's registered drive ids, read from the
+    (student, drive) index, and the seats taken on the capped drives listed.
+    """
+    today = timezone.localdate()
+    feed = await adrives()
+    registered = Registration.objects.filter(student=student).values_list('drive_id', flat=True)
+    registered_ids = {drive_id async for drive_id in registered}
+    available = [
+        drive for drive in feed
+        if drive.id not in registered_ids and matching.is_eligible(student, drive, today)
+    ]
+    capped = [drive.id for drive in available if drive.capacity is not None]
+    if capped:
+        seats = PlacementDrive.objects.filter(id__in=capped).values_list('id', 'seats_taken')
+        seats_taken = {drive_id: taken async for drive_id, taken in seats}
+        for drive in available:
+            drive.seats_taken = seats_taken.get(drive.id, drive.seats_taken)
+    return available
+
+
+# ========== iCalendar ==========
+# Calendar apps have no session, so the feed link carries a signed token of
+# the user's id and their CalendarLink key. Resetting the key (from the
+# student dashboard) makes every link handed out before it stop working.
+
+def _new_key():
+    return secrets.token_urlsafe(16)
+
+
+async def acalendar_token(user):
+    """A token that lets calendar apps fetch ``user``'s feed until their key is reset."""
+    link, _ = await CalendarLink.objects.aget_or_create(user=user, defaults={'key': _new_key()})
+    return signing.dumps([user.pk, link.key], salt=CALENDAR_SALT, compress=True)
+
+
+def reset_calendar_key(user):
+    CalendarLink.objects.update_or_create(user=user, defaults={'key': _new_key()})
+
+
+def calendar_user(token):
+    """The active user whose current calendar link carries ``token``, or None."""
+    try:
+        user_id, key = signing.loads(token, salt=CALENDAR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return User.objects.filter(pk=user_id, is_active=True, calendar_link__key=key).first()
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split a content line into 75-octet pieces as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    pieces, start = [], 0
+    while start < len(encoded):
+        end = min(start + (75 if not pieces else 74), len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # don't split a UTF-8 character
+        pieces.append(encoded[start:end].decode())
+        start = end
+    return '\r\n '.join(pieces)
+
+
+def calendar_drives(role):
+    """What a calendar shows: staff see every upcoming drive, students the ones open to them."""
+    if role.student is None:
+        return drives()
+    today = timezone.localdate()
+    return [drive for drive in drives() if matching.is_eligible(role.student, drive, today)]
+
+
+def calendar(feed, host):
+    """An iCalendar document with one all-day event per drive in ``feed``."""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//T&P Management System//Placement Drives//EN',
+        'CALSCALE:GREGORIAN',
+        'X-WR-CALNAME:Placement Drives',
+    ]
+    for drive in feed:
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:drive-{drive.id}@{host}',
+            f"DTSTAMP:{drive.updated_at.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%SZ}",
+            f'DTSTART;VALUE=DATE:{drive.date:%Y%m%d}',
+            f'DTEND;VALUE=DATE:{drive.date + datetime.timedelta(days=1):%Y%m%d}',
+            f'SUMMARY:{_escape(drive)}',
+            f'DESCRIPTION:{_escape(f"Package: {drive.package}")}\\n\\n{_escape(drive.description)}',
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return ''.join(_fold(line) + '\r\n' for line in lines)
@@ -0,0 +1,200 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .middleware import resolve_role
+from .models import Material, UploadSession
+
+MB = 1024 * 1024
+
+# Each chunk is one short request, so a web worker is only held for one
+# chunk, and no transaction is open while its bytes arrive. Once the last one
+# is in, the session moves to "storing" and the FINISH_UPLOAD task
+# (accounts.jobs) copies the part file into storage; the client polls the
+# session until it is "done" or "failed".
+UPLOAD_CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 5 * MB)
+READ_BLOCK_SIZE = 64 * 1024
+
+DOCUMENT_EXTENSIONS = {'.pdf', '.doc', '.docx', '.ppt', '.pptx', '.xls', '.xlsx', '.txt', '.zip'}
+VIDEO_EXTENSIONS = {'.mp4', '.webm', '.mkv'}
+
+UPLOAD_RULES = {
+    UploadSession.PURPOSE_VERBAL: {'max_size': 500 * MB, 'extensions': DOCUMENT_EXTENSIONS | VIDEO_EXTENSIONS},
+    UploadSession.PURPOSE_APTITUDE: {'max_size': 500 * MB, 'extensions': DOCUMENT_EXTENSIONS | VIDEO_EXTENSIONS},
+    UploadSession.PURPOSE_TECHNICAL: {'max_size': 500 * MB, 'extensions': DOCUMENT_EXTENSIONS | VIDEO_EXTENSIONS},
+    UploadSession.PURPOSE_RESUME: {'max_size': 10 * MB, 'extensions': {'.pdf', '.doc', '.docx'}},
+}
+
+# Leading bytes the first chunk must start with, for types that have one.
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_SIGNATURE = b'PK\x03\x04'
+FILE_SIGNATURES = {
+    '.pdf': b'%PDF',
+    '.doc': OLE_SIGNATURE,
+    '.ppt': OLE_SIGNATURE,
+    '.xls': OLE_SIGNATURE,
+    '.docx': ZIP_SIGNATURE,
+    '.pptx': ZIP_SIGNATURE,
+    '.xlsx': ZIP_SIGNATURE,
+    '.zip': ZIP_SIGNATURE,
+    '.webm': b'\x1a\x45\xdf\xa3',
+    '.mkv': b'\x1a\x45\xdf\xa3',
+}
+
+# Staff roles allowed to start each kind of material upload.
+PURPOSE_ROLES = {
+    UploadSession.PURPOSE_VERBAL: {'verbal_trainer'},
+    UploadSession.PURPOSE_APTITUDE: {'aptitude_trainer'},
+    UploadSession.PURPOSE_TECHNICAL: {'technical_trainer', 'global_trainer'},
+}
+TRAINER_ROLES = set().union(*PURPOSE_ROLES.values())
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def part_path(session):
+    return Path(settings.CHUNKED_UPLOAD_DIR) / f'{session.id}.part'
+
+
+def _extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def _check_signature(session, first_bytes):
+    extension = _extension(session.filename)
+    if extension == '.mp4':
+        if first_bytes[4:8] != b'ftyp':
+            raise UploadError("File content does not match its .mp4 extension.")
+        return
+    signature = FILE_SIGNATURES.get(extension)
+    if signature and not first_bytes.startswith(signature):
+        raise UploadError(f"File content does not match its {extension} extension.")
+
+
+def can_upload(role, purpose):
+    if purpose == UploadSession.PURPOSE_RESUME:
+        return role.student is not None
+    return role.staff_profile is not None and role.staff_profile.role in PURPOSE_ROLES.get(purpose, ())
+
+
+def start_session(user, purpose, filename, total_size, title=''):
+    """Validate the announced file against the purpose's limits and open a session."""
+    rules = UPLOAD_RULES.get(purpose)
+    if rules is None:
+        raise UploadError("Unknown upload type.")
+    filename = os.path.basename(filename or '').strip()
+    if _extension(filename) not in rules['extensions']:
+        raise UploadError(f"Files of type '{_extension(filename) or filename}' are not allowed.")
+    if total_size <= 0:
+        raise UploadError("The file is empty.")
+    if total_size > rules['max_size']:
+        raise UploadError(f"The file is larger than {rules['max_size'] // MB} MB.", status=413)
+    if purpose != UploadSession.PURPOSE_RESUME and not title.strip():
+        raise UploadError("A title is required.")
+
+    Path(settings.CHUNKED_UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+    return UploadSession.objects.create(
+        user=user, purpose=purpose, title=title.strip(), filename=filename, total_size=total_size,
+    )
+
+
+def append_chunk(session_id, user, offset, length, stream, on_complete=None):
+    """Write one chunk read from ``stream`` at ``offset`` and return the updated session.
+
+    The chunk must start exactly where the previous one ended; a client that
+    lost track should ask for the session's offset and resume from there.
+    Bytes are copied to the part file in small blocks, never held whole.
+    ``on_complete(session)`` runs in the transaction that marks the last chunk
+    received, so whatever it queues commits with the new state.
+    """
+    if length <= 0 or length > UPLOAD_CHUNK_SIZE:
+        raise UploadError(f"Chunks must be between 1 byte and {UPLOAD_CHUNK_SIZE} bytes.", status=413)
+
+    session = UploadSession.objects.filter(id=session_id, user=user).first()
+    if session is None:
+        raise UploadError("Upload session not found.", status=404)
+    _check_offset(session, offset)
+    if offset + length > session.total_size:
+        raise UploadError("Chunk goes past the announced file size.", status=413)
+
+    # Written outside any transaction: the body can take a while to arrive.
+    # Bytes left past ``offset`` by an interrupted attempt are overwritten by
+    # the chunks that follow, so the part file is never truncated, and a
+    # retry racing the original writes the same bytes to the same place.
+    path = part_path(session)
+    path.touch()
+    with open(path, 'r+b') as part:
+        part.seek(offset)
+        remaining = length
+        while remaining:
+            block = stream.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                raise UploadError("The chunk ended early, resend it.")
+            if offset == 0 and remaining == length:
+                _check_signature(session, block)
+            part.write(block)
+            remaining -= len(block)
+
+    session.received_size = offset + length
+    if session.received_size == session.total_size:
+        session.state = UploadSession.STATE_STORING
+    session.updated_at = timezone.now()
+    with transaction.atomic():
+        # only if no other request has moved the session on meanwhile
+        advanced = UploadSession.objects.filter(
+            id=session.id, state=UploadSession.STATE_RECEIVING, received_size=offset,
+        ).update(received_size=session.received_size, state=session.state, updated_at=session.updated_at)
+        if not advanced:
+            raise UploadError("Another request moved this upload on, resume from its offset.", status=409)
+        if on_complete and session.state == UploadSession.STATE_STORING:
+            on_complete(session)
+    return session
+
+
+def _check_offset(session, offset):
+    if session.state != UploadSession.STATE_RECEIVING:
+        raise UploadError("This upload has already been received.", status=409)
+    if offset != session.received_size:
+        raise UploadError(f"Expected offset {session.received_size}.", status=409)
+
+
+def finish_session(session):
+    """Move a fully received upload into its FileField; returns the Student or Material saved."""
+    role = resolve_role(session.user)
+    with open(part_path(session), 'rb') as part, transaction.atomic():
+        upload = File(part, name=session.filename)
+        if session.purpose == UploadSession.PURPOSE_RESUME:
+            student = role.student
+            # assigned, not resume.save(): stored by student.save(), after the resume_replacing
+            # receiver has seen an uncommitted file and released the old one, even if identical
+            student.resume = upload
+            student.save(update_fields=['resume'])
+            created = student
+        else:
+            created = Material(category=session.purpose, title=session.title, uploaded_by=role.staff_profile)
+            created.file.save(session.filename, upload, save=True)
+        session.state = UploadSession.STATE_DONE
+        session.save(update_fields=['state', 'updated_at'])
+    part_path(session).unlink(missing_ok=True)
+    return created
+
+
+def fail_session(session, error):
+    """Give up on storing the upload; the client shows ``error`` and starts over."""
+    part_path(session).unlink(missing_ok=True)
+    session.state = UploadSession.STATE_FAILED
+    session.error = error
+    session.save(update_fields=['state', 'error', 'updated_at'])
+
+
+def discard_session(session):
+    part_path(session).unlink(missing_ok=True)
+    session.delete()
@@ -1,7 +1,7 @@
 from django.urls import path
-from . import views
+from . import api, views
+from .models import Material
 from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     # ========== Home & General ==========
@@ -17,6 +17,8 @@ urlpatterns = [
     path('student/resume/upload/', views.upload_resume, name='upload_resume'),
     path('student/drives/', views.available_drives, name='available_drives'),
     path('student/drives/registered/', views.registered_drives, name='registered_drives'),
+    path('drives/calendar.ics', views.drive_calendar, name='drive_calendar'),
+    path('drives/calendar/reset/', views.reset_calendar_link, name='reset_calendar_link'),
     path('student/drives/register/<int:drive_id>/', views.register_for_drive, name='register_for_drive'),
 
     # ========== Staff ==========
@@ -26,13 +28,17 @@ urlpatterns = [
     path('staff/drives/add/', views.add_drive, name='add_drive'),
     path('staff/drives/edit/<int:drive_id>/', views.edit_drive, name='edit_drive'),
     path('staff/drives/delete/<int:drive_id>/', views.delete_drive, name='delete_drive'),
-    path('staff/verbal/upload/', views.upload_verbal_material, name='upload_verbal_material'),
-    path('staff/verbal/delete/<int:material_id>/', views.delete_verbal_material, name='delete_verbal_material'),
-    path('staff/aptitude/upload/', views.upload_aptitude_test, name='upload_aptitude_test'),
-    path('delete_aptitude_test/<int:test_id>/', views.delete_aptitude_test, name='delete_aptitude_test'),
+    path('staff/drives/<int:drive_id>/registrations.csv', views.export_drive_registrations, name='export_drive_registrations'),
+    path('staff/drives/<int:drive_id>/shortlist/', views.shortlist_drive, name='shortlist_drive'),
+    path('staff/verbal/upload/', views.upload_material, {'category': Material.VERBAL}, name='upload_verbal_material'),
+    path('staff/aptitude/upload/', views.upload_material, {'category': Material.APTITUDE}, name='upload_aptitude_test'),
+    path(
+        'staff/technical/upload/', views.upload_material, {'category': Material.TECHNICAL},
+        name='upload_technical_material',
+    ),
+    path('staff/materials/delete/<int:material_id>/', views.delete_material, name='delete_material'),
     path('staff/students/', views.view_students, name='view_students'),
-    path('staff/technical/upload/', views.upload_technical_material, name='upload_technical_material'),
-    path('staff/technical/delete/<int:material_id>/', views.delete_technical_material, name='delete_technical_material'),
+    path('staff/students/export.csv', views.export_students, name='export_students'),
     # ========== Admin ==========
     # ========== Admin ==========
     path('site-admin/login/', views.admin_login_view, name='admin_login'),
@@ -42,18 +48,42 @@ urlpatterns = [
     path('site-admin/staff/delete/<int:staff_id>/', views.delete_staff, name='delete_staff'),
     path('site-admin/staff/make_admin/<int:staff_id>/', views.make_staff_admin, name='make_staff_admin'),
     path('site-admin/messages/delete/<int:message_id>/', views.delete_message, name='delete_message'),
+    path('site-admin/analytics/', views.analytics_dashboard, name='analytics_dashboard'),
+    path('site-admin/analytics/data.json', views.analytics_data, name='analytics_data'),
+    path('site-admin/performance/', views.performance_report, name='performance_report'),
 
     # ========== Department Coordinator ==========
     path('department/dashboard/', views.department_dashboard, name='department_dashboard'),
     path('department/student/add/', views.add_student, name='add_student'),
+    path('department/student/import/', views.import_students, name='import_students'),
     path('department/student/edit/<int:student_id>/', views.edit_student, name='edit_student'),
     path('department/student/delete/<int:student_id>/', views.delete_student, name='delete_student'),
 
-    # ========== Verbal / Aptitude Viewing ==========
-    path('verbal/materials/', views.view_verbal_material, name='view_verbal_material'),
-    path('aptitude/tests/', views.view_aptitude_tests, name='view_aptitude_tests'),
-    path('technical/materials/', views.view_technical_material, name='view_technical_material'),
+    # ========== Search ==========
+    path('search/', views.search_view, name='search'),
+
+    # ========== JSON API v1 ==========
+    path('api/v1/drives/', api.drive_list, name='api_drive_list'),
+    path('api/v1/drives/<int:drive_id>/', api.drive_detail, name='api_drive_detail'),
+    path('api/v1/me/registrations/', api.my_registrations, name='api_my_registrations'),
+    path('api/v1/materials/<str:kind>/', api.material_list, name='api_material_list'),
+
+    # ========== Chunked Uploads ==========
+    path('uploads/start/', views.upload_start, name='upload_start'),
+    path('uploads/<uuid:upload_id>/', views.upload_chunk, name='upload_chunk'),
+
+    # ========== Study Materials ==========
+    path('materials/', views.all_materials, name='all_materials'),
+    path('verbal/materials/', views.view_materials, {'category': Material.VERBAL}, name='view_verbal_material'),
+    path('aptitude/tests/', views.view_materials, {'category': Material.APTITUDE}, name='view_aptitude_tests'),
+    path(
+        'technical/materials/', views.view_materials, {'category': Material.TECHNICAL},
+        name='view_technical_material',
+    ),
 
 ]
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+
+# Uploaded files go through an access check; see accounts.downloads for proxy offload
+urlpatterns += [
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", views.serve_media, name='serve_media'),
+]
\ No newline at end of file
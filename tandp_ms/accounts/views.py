@@ -1,22 +1,80 @@
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.views import redirect_to_login
+from django.views.decorators.cache import cache_page
+from functools import wraps
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, JsonResponse, QueryDict
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods, require_POST
+from django.conf import settings
 from django.contrib import messages
-from django.utils import timezone
 from django.core.exceptions import PermissionDenied
-from .forms import StudentForm
+from . import (
+    analytics, counters, downloads, exports, fragments, jobs, logins, matching, profiling, registrations, search,
+    tasks, resumes, upcoming, uploads,
+)
+from .forms import StudentCSVUploadForm, StudentForm
+from .importers import import_students as run_student_import
+from .middleware import aget_student, aget_user, get_staff_profile, get_student, resolve_role
+from .pagination import keyset_paginate
 from django.contrib.auth.models import User
 from .models import (
     ContactMessage,
+    Notification,
     Student,
     PlacementDrive,
     Registration,
     StaffProfile,
-    VerbalMaterial,
-    AptitudeTest,
-    TechnicalMaterial
+    Material,
+    UploadSession,
 )
 
+
+async def render_material_listing(request, template, fragment, **querysets):
+    """Render a material listing from an async view.
+
+    The rows are rendered by accounts/fragments/<fragment>.html and cached
+    under the fragment's version, so ``querysets`` are only fetched (with the
+    async ORM) when the listing changed.
+    """
+    listing = await fragments.arendered(
+        fragment, f'accounts/fragments/{fragment}.html', lambda: fetch_rows(querysets),
+    )
+    return render(request, template, {'listing': listing})
+
+
+async def fetch_rows(querysets):
+    return {name: [row async for row in queryset] for name, queryset in querysets.items()}
+
+
+def parse_capacity(value):
+    """Seat cap from the drive form; blank or invalid means unlimited."""
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def parse_drive_criteria(data):
+    """Eligibility fields from the drive form; blank fields mean no restriction."""
+    criteria = {'eligible_branches': matching.normalize_branches(data.get('eligible_branches'))}
+    for field in ('min_graduation_year', 'max_graduation_year'):
+        value = (data.get(field) or '').strip()
+        criteria[field] = int(value) if value.isdigit() else None
+    return criteria
+
+
+def filter_students(queryset, params):
+    """Apply the branch/department/graduation_year directory filters from ``params``."""
+    for field in ('branch', 'department'):
+        value = params.get(field, '').strip()
+        if value:
+            queryset = queryset.filter(**{field: value})
+    graduation_year = params.get('graduation_year', '').strip()
+    if graduation_year.isdigit():
+        queryset = queryset.filter(graduation_year=int(graduation_year))
+    return queryset
+
+
 # =======================
 # ===== Decorators ======
 # =======================
@@ -40,22 +98,39 @@ def strict_staff_required(view_func):
     )(view_func)
 
 def department_coordinator_required(view_func):
-    return user_passes_test(
-        lambda u: StaffProfile.objects.filter(user=u, role='department_coordinator').exists(),
-        login_url='/staff/login/'  # <-- Tell it where staff login is
-    )(view_func)
+    # Uses the role resolved once per request by RoleMiddleware
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.role.is_department_coordinator:
+            return view_func(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path(), '/staff/login/')
+    return _wrapped_view
+
 # =======================
 # ===== Login Views =====
 # =======================
 
+def login_locked(request, template, username):
+    """The response refusing a throttled login attempt (see accounts.logins), or None to go ahead."""
+    if not logins.is_locked(request, username):
+        return None
+    messages.error(request, logins.LOCKED_MESSAGE)
+    return render(request, template, status=429)
+
+
 def student_login(request):
     if request.method == 'POST':
         roll_number = request.POST.get('username')
         password = request.POST.get('password')
+        locked = login_locked(request, 'accounts/student_login.html', roll_number)
+        if locked:
+            return locked
         user = authenticate(request, username=roll_number, password=password)
         if user and not user.is_staff and not user.is_superuser:
+            logins.succeeded(request, roll_number)
             login(request, user)
             return redirect('student_dashboard')
+        logins.failed(request, roll_number)
         messages.error(request, "Invalid roll number or password.")
     return render(request, 'accounts/student_login.html')
 
@@ -64,15 +139,19 @@ def staff_login_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
+        locked = login_locked(request, 'accounts/staff_login.html', username)
+        if locked:
+            return locked
         user = authenticate(request, username=username, password=password)
 
         if user and user.is_authenticated and user.is_staff:
-            login(request, user)
-            staff_profile = StaffProfile.objects.filter(user=user).first()
-            if not staff_profile:
-                logout(request)
+            logins.succeeded(request, username)
+            role = resolve_role(user)
+            if not role.staff_profile:
                 messages.error(request, 'Your staff profile is not set up. Contact admin.')
                 return render(request, 'accounts/staff_login.html')
+            login(request, user)
+            request.role = role
 
             # Get the 'next' URL from the query parameters
             next_url = request.GET.get('next')
@@ -80,6 +159,7 @@ def staff_login_view(request):
                 return redirect(next_url)
 
             return redirect('admin_dashboard') if user.is_superuser else redirect('staff_dashboard')
+        logins.failed(request, username)
         messages.error(request, 'Invalid credentials or not a staff member.')
     return render(request, 'accounts/staff_login.html')
 
@@ -88,8 +168,12 @@ def admin_login_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
+        locked = login_locked(request, 'accounts/admin_login.html', username)
+        if locked:
+            return locked
         user = authenticate(request, username=username, password=password)
         if user and user.is_superuser:
+            logins.succeeded(request, username)
             login(request, user)
 
             # Get the 'next' URL from the query parameters
@@ -98,6 +182,7 @@ def admin_login_view(request):
                 return redirect(next_url)
 
             return redirect('admin_dashboard')
+        logins.failed(request, username)
         messages.error(request, 'Invalid admin credentials.')
     return render(request, 'accounts/admin_login.html')
 
@@ -111,26 +196,36 @@ def logout_view(request):
 # ===== Dashboards ======
 # =======================
 
+NOTIFICATIONS_SHOWN = 5
+
+
+# The student read paths are async views: under ASGI they wait on the
+# database without holding a worker thread (see README, "Running under ASGI").
+
 @login_required
-def student_dashboard(request):
-    if request.user.is_staff or request.user.is_superuser:
+async def student_dashboard(request):
+    user = await aget_user(request)
+    if user.is_staff or user.is_superuser:
         return redirect('home')
-    student = get_object_or_404(Student, user=request.user)
-    return render(request, 'accounts/student_dashboard.html', {'student': student})
+    student = await aget_student(request)
+    notifications = Notification.objects.filter(student=student).order_by('-created_at')[:NOTIFICATIONS_SHOWN]
+    calendar_url = f"{reverse('drive_calendar')}?token={await upcoming.acalendar_token(user)}"
+    return render(request, 'accounts/student_dashboard.html', {
+        'student': student,
+        'notifications': [notification async for notification in notifications],
+        'calendar_url': request.build_absolute_uri(calendar_url),
+    })
 
 
 @login_required
 @admin_required
 def admin_dashboard(request):
-    staff_profile = StaffProfile.objects.filter(user=request.user).first()
+    staff_profile = request.role.staff_profile
     context = {
         'staff_profile': staff_profile,
-        'total_students': Student.objects.count(),
-        'total_drives': PlacementDrive.objects.count(),
-        'upcoming_drives': PlacementDrive.objects.filter(date__gte=timezone.now()).count(),
-        'total_messages': ContactMessage.objects.count(),
+        **counters.get_counters(),
         'contact_messages': ContactMessage.objects.all().order_by('-created_at'),
-        'staff_profiles': StaffProfile.objects.all().order_by('designation'),
+        'staff_profiles': StaffProfile.objects.for_listing(),
     }
     return render(request, 'accounts/admin_dashboard.html', context)
 
@@ -138,28 +233,33 @@ def admin_dashboard(request):
 @login_required
 @strict_staff_required
 def staff_dashboard(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
+    staff_profile = get_staff_profile(request)
     context = {
         'staff_profile': staff_profile,
         'role': staff_profile.role,
-        'upcoming_drives': PlacementDrive.objects.filter(date__gte=timezone.now()).count(),
-        'total_drives': PlacementDrive.objects.count(),
+        **counters.get_counters(counters.UPCOMING_DRIVES, counters.TOTAL_DRIVES),
     }
-    if staff_profile.role in ['technical_trainer', 'global_trainer']:
-        context['technical_materials'] = TechnicalMaterial.objects.filter(uploaded_by=staff_profile).order_by('-uploaded_at')
-    if staff_profile.role == 'verbal_trainer':
-        context['verbal_materials'] = VerbalMaterial.objects.filter(uploaded_by=staff_profile).order_by('-uploaded_at')
-    if staff_profile.role == 'aptitude_trainer':
-        context['aptitude_tests'] = AptitudeTest.objects.filter(uploaded_by=staff_profile).order_by('-uploaded_at')
+    if staff_profile.role in uploads.TRAINER_ROLES:
+        context['materials'] = Material.objects.by_uploader(staff_profile)
     return render(request, 'accounts/staff_dashboard.html', context)
 
 
 @login_required
 @department_coordinator_required
 def department_dashboard(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
-    students = Student.objects.filter(department=staff_profile.branch).order_by('roll_number')
-    return render(request, 'accounts/department_dashboard.html', {'staff_profile': staff_profile, 'students': students})
+    staff_profile = get_staff_profile(request)
+    department_students = Student.objects.filter(department=staff_profile.branch)
+    filters = {'graduation_year': request.GET.get('graduation_year', '')}
+    students = keyset_paginate(filter_students(department_students, filters), request)
+    export_query = QueryDict(mutable=True)
+    export_query.update({'department': staff_profile.branch or '', **filters})
+    return render(request, 'accounts/department_dashboard.html', {
+        'staff_profile': staff_profile,
+        'students': students,
+        'total_students': department_students.count(),
+        'filters': request.GET,
+        'export_query': export_query.urlencode(),
+    })
 
 
 # =======================
@@ -169,7 +269,8 @@ def department_dashboard(request):
 @login_required
 @staff_required
 def view_drives(request):
-    drives = PlacementDrive.objects.all().order_by('-date')
+    # Cached as data, not as a template fragment: the rows carry per-user CSRF tokens
+    drives = fragments.cached(fragments.DRIVES, lambda: list(PlacementDrive.objects.all().order_by('-date')))
     return render(request, 'accounts/view_drives.html', {'drives': drives})
 
 
@@ -177,13 +278,16 @@ def view_drives(request):
 @staff_required
 def add_drive(request):
     if request.method == 'POST':
-        PlacementDrive.objects.create(
+        drive = PlacementDrive.objects.create(
             company_name=request.POST['company_name'],
             job_role=request.POST['job_role'],
             date=request.POST['date'],
             package=request.POST['package'],
-            description=request.POST['description']
+            description=request.POST['description'],
+            capacity=parse_capacity(request.POST.get('capacity')),
+            **parse_drive_criteria(request.POST),
         )
+        tasks.enqueue(jobs.ANNOUNCE_DRIVE, {'drive_id': drive.id})
         messages.success(request, "Placement drive added successfully.")
         return redirect('view_drives')
     return render(request, 'accounts/add_drive.html')
@@ -199,7 +303,16 @@ def edit_drive(request, drive_id):
         drive.date = request.POST['date']
         drive.package = request.POST['package']
         drive.description = request.POST['description']
-        drive.save()
+        drive.capacity = parse_capacity(request.POST.get('capacity'))
+        criteria = parse_drive_criteria(request.POST)
+        for field, value in criteria.items():
+            setattr(drive, field, value)
+        # seats_taken is maintained by registrations, never overwrite it from a stale instance
+        drive.save(update_fields=[
+            'company_name', 'job_role', 'date', 'package', 'description', 'capacity', *criteria, 'updated_at',
+        ])
+        if drive.capacity is not None:
+            registrations.sync_seats_taken(drive)
         messages.success(request, "Placement drive updated successfully.")
         return redirect('view_drives')
     return render(request, 'accounts/edit_drive.html', {'drive': drive})
@@ -218,119 +331,192 @@ def delete_drive(request, drive_id):
     return redirect('view_drives')
 
 
+@login_required
+@staff_required
+def export_drive_registrations(request, drive_id):
+    drive = get_object_or_404(PlacementDrive, id=drive_id)
+    return exports.export_registrations(drive)
+
+
+SHORTLIST_SIZE = 100
+
+
+@login_required
+@staff_required
+def shortlist_drive(request, drive_id):
+    drive = get_object_or_404(PlacementDrive, id=drive_id)
+    skills = request.GET.get('skills', '')
+    keywords = resumes.parse_keywords(skills)
+    candidates = resumes.shortlist(drive, keywords)[:SHORTLIST_SIZE]
+    return render(request, 'accounts/shortlist.html', {
+        'drive': drive,
+        'skills': skills,
+        'keywords': keywords,
+        'candidates': candidates,
+    })
+
+
 # =======================
 # ===== Registrations ===
 # =======================
 
 @login_required
-def available_drives(request):
-    student = get_object_or_404(Student, user=request.user)
-    registered_drive_ids = Registration.objects.filter(student=student).values_list('drive_id', flat=True)
-    drives = PlacementDrive.objects.exclude(id__in=registered_drive_ids).order_by('date')
+async def available_drives(request):
+    student = await aget_student(request)
+    drives = await upcoming.available_to(student)
     return render(request, 'accounts/available_drives.html', {'student': student, 'drives': drives})
 
 
 @login_required
 def register_for_drive(request, drive_id):
-    student = get_object_or_404(Student, user=request.user)
-    drive = get_object_or_404(PlacementDrive, id=drive_id)
-    if not Registration.objects.filter(student=student, drive=drive).exists():
-        Registration.objects.create(student=student, drive=drive)
+    student = get_student(request)
+    drive = get_object_or_404(
+        PlacementDrive.objects.only(
+            'id', 'company_name', 'job_role', 'date', 'capacity',
+            'eligible_branches', 'min_graduation_year', 'max_graduation_year',
+        ),
+        id=drive_id,
+    )
+    result = registrations.register(student, drive)
+    if result == registrations.REGISTERED:
         messages.success(request, f"Successfully registered for {drive.company_name}")
+    elif result == registrations.DRIVE_FULL:
+        messages.error(request, f"Sorry, all seats for {drive.company_name} are taken.")
+    elif result == registrations.NOT_ELIGIBLE:
+        messages.error(request, f"You are not eligible for {drive.company_name}.")
     else:
         messages.warning(request, "You have already registered for this drive.")
     return redirect('available_drives')
 
 
-@login_required
-def registered_drives(request):
-    student = get_object_or_404(Student, user=request.user)
-    registrations = Registration.objects.filter(student=student).select_related('drive').order_by('drive__date')
-    return render(request, 'accounts/registered_drives.html', {'student': student, 'registrations': registrations})
-
+def drive_calendar(request):
+    """iCalendar feed of upcoming drives, for the logged-in user or a ?token= from the student dashboard."""
+    user = request.user
+    if not user.is_authenticated:
+        user = upcoming.calendar_user(request.GET.get('token', ''))
+        if user is None:
+            return HttpResponse("A valid calendar link is required.", status=403, content_type='text/plain')
+    role = resolve_role(user)
+    if role.student is None and not user.is_staff:
+        raise PermissionDenied
+    feed = upcoming.calendar_drives(role)
+    response = HttpResponse(upcoming.calendar(feed, request.get_host()), content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="placement-drives.ics"'
+    return response
 
-# =======================
-# ===== Verbal Material ==
-# =======================
 
 @login_required
-@staff_required
-def upload_verbal_material(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
-    if staff_profile.role != 'verbal_trainer':
-        raise PermissionDenied
+@require_POST
+def reset_calendar_link(request):
+    upcoming.reset_calendar_key(request.user)
+    messages.success(request, "Your calendar link was replaced; update it in your calendar app.")
+    return redirect('student_dashboard')
 
-    if request.method == 'POST' and request.FILES.get('file'):
-        VerbalMaterial.objects.create(
-            title=request.POST.get('title'),
-            file=request.FILES['file'],
-            uploaded_by=staff_profile
-        )
-        messages.success(request, "Material uploaded successfully.")
-        return redirect('upload_verbal_material')
 
-    materials = VerbalMaterial.objects.filter(uploaded_by=staff_profile).order_by('-uploaded_at')
-    return render(request, 'accounts/upload_verbal.html', {'materials': materials})
+SEARCH_TYPES = ('drives', 'materials')
 
 
 @login_required
-@staff_required
-def delete_verbal_material(request, material_id):
-    material = get_object_or_404(VerbalMaterial, id=material_id)
-    # Optional Security Check: ensure the user deleting is the one who uploaded
-    # if material.uploaded_by != request.user.staffprofile:
-    #     messages.error(request, "You do not have permission to delete this material.")
-    #     return redirect('staff_dashboard')
-
-    material.file.delete()
-    material.delete()
-    messages.success(request, "Material deleted successfully.")
-    return redirect('staff_dashboard')
+def search_view(request):
+    query = request.GET.get('q', '').strip()
+    search_type = request.GET.get('type')
+    if search_type not in SEARCH_TYPES:
+        search_type = 'drives'
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    results, has_next = [], False
+    if query:
+        if search_type == 'drives':
+            results, has_next = search.search_drives(query, page)
+        else:
+            results, has_next = search.search_materials(query, page)
+    return render(request, 'accounts/search.html', {
+        'query': query,
+        'search_type': search_type,
+        'results': results,
+        'page': page,
+        'has_previous': page > 1,
+        'has_next': has_next and page < search.MAX_SEARCH_PAGE,
+        'is_student': request.role.student is not None,
+    })
+
+
+@login_required
+async def registered_drives(request):
+    student = await aget_student(request)
+    registrations = Registration.objects.filter(student=student).select_related('drive').order_by('drive__date')
+    return render(request, 'accounts/registered_drives.html', {
+        'student': student,
+        'registrations': [registration async for registration in registrations],
+    })
 
 
 # =======================
-# ===== Aptitude Tests ==
+# ===== Study Materials =
 # =======================
 
+# One set of views serves every material category; the URLs pass the
+# category and each category keeps its own page templates.
+MATERIAL_TEMPLATES = {
+    Material.VERBAL: ('accounts/upload_verbal.html', 'accounts/view_verbal_material.html'),
+    Material.APTITUDE: ('accounts/upload_aptitude.html', 'accounts/view_aptitude_tests.html'),
+    Material.TECHNICAL: ('accounts/upload_technical.html', 'accounts/view_technical_material.html'),
+}
+ALL_MATERIALS_SHOWN = 100
+
+
 @login_required
 @staff_required
-def upload_aptitude_test(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
-    if staff_profile.role != 'aptitude_trainer':
+def upload_material(request, category):
+    if not uploads.can_upload(request.role, category):
         raise PermissionDenied
 
     if request.method == 'POST' and request.FILES.get('file'):
-        AptitudeTest.objects.create(
-            title=request.POST['title'],
+        Material.objects.create(
+            category=category,
+            title=request.POST.get('title'),
             file=request.FILES['file'],
-            uploaded_by=staff_profile
+            uploaded_by=request.role.staff_profile,
         )
-        messages.success(request, "Aptitude test uploaded successfully.")
-        return redirect('upload_aptitude_test')
+        messages.success(request, f"{dict(Material.CATEGORY_CHOICES)[category]} uploaded successfully.")
+        return redirect(UPLOAD_DONE_URLS[category])
+    return render(request, MATERIAL_TEMPLATES[category][0])
+
 
-    tests = AptitudeTest.objects.filter(uploaded_by=staff_profile)
-    return render(request, 'accounts/upload_aptitude.html', {'tests': tests})
+@login_required
+@staff_required
+def delete_material(request, material_id):
+    material = get_object_or_404(Material, id=material_id)
+    # only the uploader or an admin may delete
+    if material.uploaded_by != get_staff_profile(request) and not request.user.is_superuser:
+        messages.error(request, "You do not have permission to delete this material.")
+    elif request.method == 'POST':
+        material.delete()
+        messages.success(request, "Material deleted successfully.")
+    else:
+        messages.error(request, "Invalid request method.")
+    return redirect('staff_dashboard')
 
 
 @login_required
-def view_aptitude_tests(request):
-    tests = AptitudeTest.objects.all().order_by('-uploaded_at')
-    return render(request, 'accounts/view_aptitude_tests.html', {'tests': tests})
+async def view_materials(request, category):
+    return await render_material_listing(
+        request, MATERIAL_TEMPLATES[category][1], fragments.CATEGORY_FRAGMENTS[category],
+        materials=Material.objects.for_listing().filter(category=category),
+    )
 
 
 @login_required
-@staff_required
-def delete_aptitude_test(request, test_id):
-    test = get_object_or_404(AptitudeTest, id=test_id)
-    # Optional Security Check: ensure the user deleting is the one who uploaded
-    # if test.uploaded_by != request.user.staffprofile:
-    #     messages.error(request, "You do not have permission to delete this test.")
-    #     return redirect('staff_dashboard')
-
-    test.file.delete()
-    test.delete()
-    messages.success(request, "Aptitude test deleted successfully.")
-    return redirect('staff_dashboard')
+async def all_materials(request):
+    """Every category in one newest-first feed, with the number of materials in each."""
+    return await render_material_listing(
+        request, 'accounts/all_materials.html', fragments.ALL_MATERIALS,
+        materials=Material.objects.for_listing()[:ALL_MATERIALS_SHOWN],
+        category_counts=Material.objects.category_counts(),
+    )
 
 
 # =======================
@@ -340,13 +526,15 @@ def delete_aptitude_test(request, test_id):
 @login_required
 @department_coordinator_required
 def add_student(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
+    staff_profile = get_staff_profile(request)
     if request.method == "POST":
         form = StudentForm(request.POST, request.FILES)
         if form.is_valid():
             student = form.save(commit=False)
             student.department = staff_profile.branch
             student.save()
+            if student.resume:
+                tasks.enqueue(jobs.INDEX_RESUME, {'student_id': student.id})
             messages.success(request, "Student added successfully.")
             return redirect('department_dashboard')
     else:
@@ -354,11 +542,30 @@ def add_student(request):
     return render(request, 'accounts/add_student.html', {'form': form})
 
 
+@login_required
+@department_coordinator_required
+def import_students(request):
+    staff_profile = get_staff_profile(request)
+    report = None
+    if request.method == "POST":
+        form = StudentCSVUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            report = run_student_import(
+                form.cleaned_data['csv_file'],
+                department=staff_profile.branch,
+                initial_password=form.cleaned_data['initial_password'],
+            )
+            messages.success(request, f"{report.created} students imported, {report.failed} rows rejected.")
+    else:
+        form = StudentCSVUploadForm()
+    return render(request, 'accounts/import_students.html', {'form': form, 'report': report})
+
+
 @login_required
 @department_coordinator_required
 def edit_student(request, student_id):
     # === TYPO FIX HERE ===
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
+    staff_profile = get_staff_profile(request)
     student = get_object_or_404(Student, id=student_id)
     if request.method == 'POST':
         form = StudentForm(request.POST, request.FILES, instance=student)
@@ -366,6 +573,8 @@ def edit_student(request, student_id):
             student = form.save(commit=False)
             student.department = staff_profile.branch
             student.save()
+            if 'resume' in form.changed_data:
+                tasks.enqueue(jobs.INDEX_RESUME, {'student_id': student.id})
             messages.success(request, "Student updated successfully.")
             return redirect('department_dashboard')
     else:
@@ -449,10 +658,15 @@ def make_staff_admin(request, staff_id):
 # ===== Other Pages =====
 # =======================
 
+PUBLIC_PAGE_TIMEOUT = 60 * 15
+
+
+@cache_page(PUBLIC_PAGE_TIMEOUT)
 def home(request):
     return render(request, 'accounts/home.html')
 
 
+@cache_page(PUBLIC_PAGE_TIMEOUT)
 def about(request):
     return render(request, 'accounts/about.html')
 
@@ -478,44 +692,87 @@ def delete_message(request, message_id):
     return redirect('admin_dashboard')
 
 
+@login_required
+@admin_required
+def analytics_dashboard(request):
+    report = analytics.report()
+    return render(request, 'accounts/analytics.html', {
+        'drives': report[analytics.DRIVE],
+        'branches': report[analytics.BRANCH],
+        'graduation_years': report[analytics.GRADUATION_YEAR],
+        'months': report[analytics.MONTH],
+        'total_registrations': sum(row['count'] for row in report[analytics.DRIVE]),
+    })
+
+
+@login_required
+@admin_required
+def analytics_data(request):
+    report = analytics.report()
+    dimension = request.GET.get('dimension')
+    if dimension:
+        if dimension not in report:
+            return JsonResponse({'error': f"Unknown dimension {dimension!r}."}, status=400)
+        report = {dimension: report[dimension]}
+    return JsonResponse(report)
+
+
+@login_required
+@admin_required
+def performance_report(request):
+    hours = request.GET.get('hours', '')
+    hours = int(hours) if hours.isdigit() and int(hours) > 0 else 24
+    # this worker's unflushed samples; other workers flush on their own schedule
+    profiling.flush()
+    return render(request, 'accounts/performance.html', {
+        'lines': profiling.report(hours=hours),
+        'hours': hours,
+        'enabled': settings.ACCOUNTS_PROFILING,
+    })
+
+
+TEAM_MEMBERS = [
+    {"sno": 1, "name": "Mr. C. Y. Balu", "designation": "Head – Corporate Relations", "mobile": "9900944775",
+     "email": "balucy@srit.ac.in"},
+    {"sno": 2, "name": "Dr. S Bhargava Reddy", "designation": "Training & Placement Officer",
+     "mobile": "9515811111", "email": "tpo@srit.ac.in"},
+    {"sno": 3, "name": "Dr. D Anil Kumar", "designation": "Alumni Relations Officer & Verbal Trainer",
+     "mobile": "9791265918", "email": "alumni@srit.ac.in"},
+    {"sno": 4, "name": "Dr. G. Hemanth Kumar Yadav",
+     "designation": "Industry Relations Officer & Technical Trainer", "mobile": "9848169943",
+     "email": "iiicell@srit.ac.in"},
+    {"sno": 5, "name": "Mr. S Moin Ahmed", "designation": "Associate TPO & Coordinator – MEC",
+     "mobile": "8328220829", "email": "atpo@srit.ac.in"},
+    {"sno": 6, "name": "Mrs. T A Swathi", "designation": "Coordinator – Civil", "mobile": "8074669931",
+     "email": "swathi.civ@srit.ac.in"},
+    {"sno": 7, "name": "Mr. Y. Sathish Kumar", "designation": "Coordinator – EEE", "mobile": "8309918031",
+     "email": "sathishkumar.eee@srit.ac.in"},
+    {"sno": 8, "name": "Mr. D. Sreekanth Reddy", "designation": "Coordinator – ECE", "mobile": "9963917078",
+     "email": "sreekanthreddy.ece@srit.ac.in"},
+    {"sno": 9, "name": "Mr. K Kondanna",
+     "designation": "Coordinator – CSD & Technical Trainer (Global Certifications)", "mobile": "9985502062",
+     "email": "kondanna.cse@srit.ac.in"},
+    {"sno": 10, "name": "Dr. D. Rajesh Babu", "designation": "Coordinator – CSE & CSM", "mobile": "9966982288",
+     "email": "rajeshbabud.cse@srit.ac.in"},
+    {"sno": 11, "name": "Mr. M Prabhakar", "designation": "Aptitude & Reasoning Trainer", "mobile": "9441553074",
+     "email": "prabhakar.hs@srit.ac.in"},
+    {"sno": 12, "name": "Mr. V Naveen Kumar", "designation": "Clerk – AIRP", "mobile": "9398023404",
+     "email": "clerk.tpcell@srit.ac.in"},
+]
+
+
+@cache_page(PUBLIC_PAGE_TIMEOUT)
 def team_view(request):
-    team_members = [
-        {"sno": 1, "name": "Mr. C. Y. Balu", "designation": "Head – Corporate Relations", "mobile": "9900944775",
-         "email": "balucy@srit.ac.in"},
-        {"sno": 2, "name": "Dr. S Bhargava Reddy", "designation": "Training & Placement Officer",
-         "mobile": "9515811111", "email": "tpo@srit.ac.in"},
-        {"sno": 3, "name": "Dr. D Anil Kumar", "designation": "Alumni Relations Officer & Verbal Trainer",
-         "mobile": "9791265918", "email": "alumni@srit.ac.in"},
-        {"sno": 4, "name": "Dr. G. Hemanth Kumar Yadav",
-         "designation": "Industry Relations Officer & Technical Trainer", "mobile": "9848169943",
-         "email": "iiicell@srit.ac.in"},
-        {"sno": 5, "name": "Mr. S Moin Ahmed", "designation": "Associate TPO & Coordinator – MEC",
-         "mobile": "8328220829", "email": "atpo@srit.ac.in"},
-        {"sno": 6, "name": "Mrs. T A Swathi", "designation": "Coordinator – Civil", "mobile": "8074669931",
-         "email": "swathi.civ@srit.ac.in"},
-        {"sno": 7, "name": "Mr. Y. Sathish Kumar", "designation": "Coordinator – EEE", "mobile": "8309918031",
-         "email": "sathishkumar.eee@srit.ac.in"},
-        {"sno": 8, "name": "Mr. D. Sreekanth Reddy", "designation": "Coordinator – ECE", "mobile": "9963917078",
-         "email": "sreekanthreddy.ece@srit.ac.in"},
-        {"sno": 9, "name": "Mr. K Kondanna",
-         "designation": "Coordinator – CSD & Technical Trainer (Global Certifications)", "mobile": "9985502062",
-         "email": "kondanna.cse@srit.ac.in"},
-        {"sno": 10, "name": "Dr. D. Rajesh Babu", "designation": "Coordinator – CSE & CSM", "mobile": "9966982288",
-         "email": "rajeshbabud.cse@srit.ac.in"},
-        {"sno": 11, "name": "Mr. M Prabhakar", "designation": "Aptitude & Reasoning Trainer", "mobile": "9441553074",
-         "email": "prabhakar.hs@srit.ac.in"},
-        {"sno": 12, "name": "Mr. V Naveen Kumar", "designation": "Clerk – AIRP", "mobile": "9398023404",
-         "email": "clerk.tpcell@srit.ac.in"},
-    ]
-    return render(request, 'accounts/team.html', {'team_members': team_members})
+    return render(request, 'accounts/team.html', {'team_members': TEAM_MEMBERS})
 
 
 @login_required
 def upload_resume(request):
-    student = get_object_or_404(Student, user=request.user)
+    student = get_student(request)
     if request.method == 'POST' and request.FILES.get('resume'):
         student.resume = request.FILES['resume']
-        student.save()
+        student.save(update_fields=['resume'])
+        tasks.enqueue(jobs.INDEX_RESUME, {'student_id': student.id})
         messages.success(request, "Resume uploaded successfully.")
     return render(request, 'accounts/upload_resume.html', {'student': student})
 
@@ -523,54 +780,119 @@ def upload_resume(request):
 @login_required
 @staff_required
 def view_students(request):
-    students = Student.objects.all().order_by('roll_number')
-    return render(request, 'accounts/view_students.html', {'students': students})
+    students = keyset_paginate(filter_students(Student.objects.all(), request.GET), request)
+    return render(request, 'accounts/view_students.html', {
+        'students': students,
+        'filters': request.GET,
+        'export_query': request.GET.urlencode(),
+    })
 
 
 @login_required
-def view_verbal_material(request):
-    materials = VerbalMaterial.objects.all().order_by('-uploaded_at')
-    return render(request, 'accounts/view_verbal_material.html', {'materials': materials})
+@staff_required
+def export_students(request):
+    return exports.export_students(filter_students(Student.objects.all(), request.GET))
 
 
-@login_required
-@staff_required
-def upload_technical_material(request):
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
-    if staff_profile.role not in ['technical_trainer', 'global_trainer']:
-        raise PermissionDenied
+# =======================
+# ===== Chunked Uploads =
+# =======================
+
+UPLOAD_DONE_URLS = {
+    UploadSession.PURPOSE_VERBAL: 'upload_verbal_material',
+    UploadSession.PURPOSE_APTITUDE: 'upload_aptitude_test',
+    UploadSession.PURPOSE_TECHNICAL: 'upload_technical_material',
+    UploadSession.PURPOSE_RESUME: 'upload_resume',
+}
+
+
+def upload_state(session):
+    state = {
+        'upload_id': str(session.id),
+        'offset': session.received_size,
+        'size': session.total_size,
+        'chunk_size': uploads.UPLOAD_CHUNK_SIZE,
+        'state': session.state,
+        'complete': session.state == UploadSession.STATE_DONE,
+    }
+    if session.state == UploadSession.STATE_DONE:
+        state['redirect'] = reverse(UPLOAD_DONE_URLS[session.purpose])
+    elif session.state == UploadSession.STATE_FAILED:
+        state['error'] = session.error
+    return state
 
-    if request.method == 'POST' and request.FILES.get('file'):
-        TechnicalMaterial.objects.create(
-            title=request.POST.get('title'),
-            file=request.FILES['file'],
-            uploaded_by=staff_profile
-        )
-        messages.success(request, "Technical material uploaded successfully.")
-        return redirect('upload_technical_material')  # Redirect to the same page
 
-    materials = TechnicalMaterial.objects.filter(uploaded_by=staff_profile).order_by('-uploaded_at')
-    return render(request, 'accounts/upload_technical.html', {'materials': materials})
+@login_required
+@require_POST
+def upload_start(request):
+    purpose = request.POST.get('purpose')
+    if not uploads.can_upload(request.role, purpose):
+        return JsonResponse({'error': "You cannot upload this type of file."}, status=403)
+    try:
+        session = uploads.start_session(
+            request.user,
+            purpose,
+            filename=request.POST.get('filename'),
+            total_size=int(request.POST.get('size') or 0),
+            title=request.POST.get('title', ''),
+        )
+    except ValueError:
+        return JsonResponse({'error': "Invalid file size."}, status=400)
+    except uploads.UploadError as error:
+        return JsonResponse({'error': str(error)}, status=error.status)
+    return JsonResponse(upload_state(session), status=201)
 
 
 @login_required
-@staff_required
-def delete_technical_material(request, material_id):
-    material = get_object_or_404(TechnicalMaterial, id=material_id)
+@require_http_methods(['GET', 'POST'])
+def upload_chunk(request, upload_id):
+    """GET reports the session's state (to resume, or to wait for it to be stored); POST appends one chunk.
+
+    The chunk is the raw request body, placed at the X-Upload-Offset header.
+    The last one answers 202 while the task worker stores the file.
+    """
+    if request.method == 'GET':
+        session = get_object_or_404(UploadSession, id=upload_id, user=request.user)
+        if session.state == UploadSession.STATE_DONE:
+            messages.success(request, f"{session.filename} uploaded successfully.")
+        return JsonResponse(upload_state(session))
+
+    def store(session):
+        if uploads.can_upload(request.role, session.purpose):
+            tasks.enqueue(jobs.FINISH_UPLOAD, {'upload_id': str(session.id)})
+
+    try:
+        session = uploads.append_chunk(
+            upload_id,
+            request.user,
+            offset=int(request.headers.get('X-Upload-Offset', '')),
+            length=int(request.META.get('CONTENT_LENGTH') or 0),
+            stream=request,
+            on_complete=store,
+        )
+    except ValueError:
+        return JsonResponse({'error': "Missing or invalid X-Upload-Offset header."}, status=400)
+    except uploads.UploadError as error:
+        return JsonResponse({'error': str(error)}, status=error.status)
 
-    # Security check: only allow uploader or admin to delete
-    staff_profile = get_object_or_404(StaffProfile, user=request.user)
-    if material.uploaded_by != staff_profile and not request.user.is_superuser:
-        messages.error(request, "You do not have permission to delete this material.")
-    else:
-        material.file.delete()  # Delete the file from storage
-        material.delete()  # Delete the record from DB
-        messages.success(request, "Material deleted successfully.")
+    if session.state == UploadSession.STATE_RECEIVING:
+        return JsonResponse(upload_state(session))
+    if not uploads.can_upload(request.role, session.purpose):
+        uploads.discard_session(session)
+        return JsonResponse({'error': "You cannot upload this type of file."}, status=403)
+    return JsonResponse(upload_state(session), status=202)
 
-    # Redirect back to the staff dashboard
-    return redirect('staff_dashboard')
+
+# =======================
+# ===== Media Files =====
+# =======================
 
 @login_required
-def view_technical_material(request):
-    materials = TechnicalMaterial.objects.all().order_by('-uploaded_at')
-    return render(request, 'accounts/view_technical_material.html', {'materials': materials})
\ No newline at end of file
+@require_http_methods(['GET', 'HEAD'])
+def serve_media(request, path):
+    path = downloads.clean_path(path)
+    if path is None:
+        raise Http404("File not found.")
+    if not downloads.can_download(request, path):
+        raise PermissionDenied
+    return downloads.media_response(request, path)
@@ -23,12 +23,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so it times everything below; removes itself unless ACCOUNTS_PROFILING is on
+    'accounts.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'accounts.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise that doesn't force the stack below it onto a thread
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -52,13 +55,92 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'tandp_ms.wsgi.application'
 
+# Connections are kept open between requests (DJANGO_CONN_MAX_AGE seconds)
+# and checked before reuse, so a worker drops one the database has closed
+# (e.g. after a PostgreSQL restart) instead of failing a request with it.
 DATABASES = {
     'default': dj_database_url.config(
         default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
-        conn_max_age=600
+        conn_max_age=int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
     )
 }
 
+# On PostgreSQL, DJANGO_DB_POOL=True gives each worker process a psycopg pool
+# instead: threads and ASGI requests borrow a connection for one request and
+# return it, rather than each thread holding its own, and the pool checks a
+# connection before lending it. Keep workers x DJANGO_DB_POOL_MAX_SIZE below
+# the server's max_connections (or put pgbouncer in front).
+DB_POOL = os.environ.get('DJANGO_DB_POOL', 'False') == 'True'
+if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # the pool keeps connections; Django refuses both
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.environ.get('DJANGO_DB_POOL_TIMEOUT', 10)),  # seconds to wait for a free connection
+    }
+
+# Local memory by default; point these at Redis/memcached in production so
+# every worker shares the same cached counters.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', ''),
+    }
+}
+
+# Keep each user's resolved StaffProfile/Student in the cache between requests.
+# Only enable with a cache shared by all workers (Redis/memcached).
+ACCOUNTS_CACHE_ROLES = os.environ.get('DJANGO_CACHE_ROLES', 'False') == 'True'
+
+# Per-request timings for the site-admin performance page and
+# `manage.py profile_report`; samples are buffered in each process and
+# written out every PROFILING_FLUSH_INTERVAL seconds.
+ACCOUNTS_PROFILING = os.environ.get('DJANGO_PROFILING', 'False') == 'True'
+PROFILING_FLUSH_INTERVAL = 60
+if ACCOUNTS_PROFILING:
+    # the Django template backend, with each render timed for the profile
+    TEMPLATES[0]['BACKEND'] = 'accounts.profiling.ProfiledTemplates'
+
+# Sessions: 'db' (default), 'cached_db' or 'cache' (cached ones only with a
+# cache shared by all workers, or a logout on one worker is not seen by the
+# others), or 'signed_cookies', which needs no server-side storage at all but
+# cannot revoke a session before it expires except by changing the password.
+SESSION_ENGINE = 'django.contrib.sessions.backends.' + os.environ.get('DJANGO_SESSION_ENGINE', 'db')
+
+# The first hasher hashes new passwords; hashes made by any other one, or
+# with another cost, are upgraded at the user's next login (accounts.hashers).
+# DJANGO_PASSWORD_HASHER is 'pbkdf2', 'scrypt' or 'argon2' (needs argon2-cffi).
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'accounts.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ScryptPasswordHasher',
+    'argon2': 'accounts.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('DJANGO_PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('DJANGO_PBKDF2_ITERATIONS', 1_000_000))
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.environ.get('DJANGO_SCRYPT_WORK_FACTOR', 2 ** 14))
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('DJANGO_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get('DJANGO_ARGON2_MEMORY_COST', 102400))  # KiB
+
+# Failed logins allowed per roll number/username, as (failures, window in
+# seconds), before accounts.logins refuses attempts. Past the per-IP count,
+# usernames from that address get one failure instead (see accounts.logins).
+LOGIN_FAILURE_LIMITS = {
+    'username': (int(os.environ.get('DJANGO_LOGIN_USERNAME_FAILURES', 5)), 15 * 60),
+    'ip': (int(os.environ.get('DJANGO_LOGIN_IP_FAILURES', 100)), 15 * 60),
+}
+# Behind nginx every request comes from the proxy: set this to the META key
+# of the header it fills with the client address, e.g. 'HTTP_X_REAL_IP'
+# (proxy_set_header X-Real-IP $remote_addr). Only set it behind such a proxy;
+# clients can send the header themselves.
+LOGIN_CLIENT_IP_HEADER = os.environ.get('DJANGO_CLIENT_IP_HEADER', '')
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',},
@@ -73,11 +155,30 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored once per distinct content and reference counted; run
+# `manage.py collect_blobs` periodically to remove files nothing uses.
+# Static files are compressed and named by content at `collectstatic` time;
+# the test run renders templates without collecting them first.
+STORAGES = {
+    'default': {'BACKEND': 'accounts.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# Media downloads are authorised in Django, then either handed to the front
+# proxy ('x-accel-redirect' for nginx, 'x-sendfile' for Apache/lighttpd) or
+# streamed by Django itself when this is empty. For nginx, map
+# MEDIA_OFFLOAD_PREFIX to MEDIA_ROOT in an `internal` location.
+MEDIA_OFFLOAD = os.environ.get('DJANGO_MEDIA_OFFLOAD', '')
+MEDIA_OFFLOAD_PREFIX = '/protected-media/'
+
+# Part files of in-progress chunked uploads (not served publicly)
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'chunked_uploads'
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = '/student/login/'